@@ -8,29 +8,40 @@
 
 import os
 import sys
-import re
-from typing import List, Dict, Any, Tuple
+import json
+import hashlib
+from contextlib import nullcontext
+from typing import List, Dict, Any, Tuple, Iterator
 from datetime import datetime
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
 from utils.file_handler import read_markdown, write_markdown
+from utils.chapter_index import ChapterIndex
+from utils.feature_store import FeatureStore
 
 logger = get_logger(__name__)
 
+# 章节清单格式版本，渲染格式变化时递增以废弃旧清单
+MANIFEST_VERSION = 1
+
 class CourseEngineer:
     """课程更新工程师，负责生成更新后的课程内容"""
     
-    def __init__(self, template_path):
+    def __init__(self, template_path, feature_store=None):
         """初始化课程更新工程师
         
         Args:
             template_path: 课程模板文件路径
+            feature_store: 各智能体共享的特征缓存，默认使用独立的缓存
         """
         self.template_path = template_path
         self.template = self._load_template(template_path)
-        self.chapter_mapping = self._build_chapter_mapping()
+        # 从模板解析章节索引，关键词到小节编号的映射供归类使用
+        self.chapter_index = ChapterIndex(template_path)
+        self.chapter_mapping = self.chapter_index.keyword_sections
+        self.feature_store = feature_store or FeatureStore()
         logger.info(f"课程更新工程师初始化完成，使用模板: {template_path}")
     
     def _load_template(self, template_path):
@@ -50,101 +61,11 @@ class CourseEngineer:
             # 返回空字符串作为默认值
             return ""
     
-    def _build_chapter_mapping(self):
-        """构建知识点到章节的映射关系
-        
-        Returns:
-            知识点关键词到章节的映射字典
-        """
-        # 基于数据结构课程内容构建映射
-        return {
-            # 第1章 绪论
-            "算法": "1.2",
-            "数据结构基本概念": "1.1",
-            "时间复杂度": "1.2",
-            "空间复杂度": "1.2",
-            
-            # 第2章 线性表
-            "线性表": "2.1",
-            "顺序表": "2.2",
-            "链表": "2.3",
-            "单链表": "2.3",
-            "双链表": "2.3",
-            "循环链表": "2.3",
-            "静态链表": "2.3",
-            
-            # 第3章 栈、队列和数组
-            "栈": "3.1",
-            "队列": "3.2",
-            "双端队列": "3.2",
-            "数组": "3.4",
-            "矩阵": "3.4",
-            "特殊矩阵": "3.4",
-            "稀疏矩阵": "3.4",
-            "表达式求值": "3.3",
-            "递归": "3.3",
-            
-            # 第4章 串
-            "串": "4.1",
-            "字符串": "4.1",
-            "模式匹配": "4.2",
-            "KMP算法": "4.2",
-            
-            # 第5章 树与二叉树
-            "树": "5.1",
-            "二叉树": "5.2",
-            "遍历": "5.3",
-            "线索二叉树": "5.3",
-            "森林": "5.4",
-            "哈夫曼树": "5.5",
-            "哈夫曼编码": "5.5",
-            "并查集": "5.5",
-            
-            # 第6章 图
-            "图": "6.1",
-            "邻接矩阵": "6.2",
-            "邻接表": "6.2",
-            "十字链表": "6.2",
-            "邻接多重表": "6.2",
-            "广度优先搜索": "6.3",
-            "深度优先搜索": "6.3",
-            "最小生成树": "6.4",
-            "最短路径": "6.4",
-            "拓扑排序": "6.4",
-            "关键路径": "6.4",
-            
-            # 第7章 查找
-            "查找": "7.1",
-            "顺序查找": "7.2",
-            "折半查找": "7.2",
-            "分块查找": "7.2",
-            "二叉排序树": "7.3",
-            "平衡二叉树": "7.3",
-            "红黑树": "7.3",
-            "B树": "7.4",
-            "B+树": "7.4",
-            "散列表": "7.5",
-            "哈希表": "7.5",
-            
-            # 第8章 排序
-            "排序": "8.1",
-            "插入排序": "8.2",
-            "希尔排序": "8.2",
-            "冒泡排序": "8.3",
-            "快速排序": "8.3",
-            "选择排序": "8.4",
-            "堆排序": "8.4",
-            "归并排序": "8.5",
-            "基数排序": "8.5",
-            "计数排序": "8.5",
-            "外部排序": "8.7"
-        }
-    
     def update(self, weighted_topics: List[Dict[str, Any]]) -> str:
         """根据权重化的知识点更新课程内容
         
         Args:
-            weighted_topics: 权重化的知识点列表
+            weighted_topics: 权重化的知识点列表，元素可以是字典或KnowledgeItem，也可以是KnowledgeBatch
             
         Returns:
             更新后的课程内容文本
@@ -160,6 +81,156 @@ class CourseEngineer:
         logger.info("课程内容更新完成")
         return updated_content
     
+    def update_stream(self, weighted_topics: List[Dict[str, Any]]) -> Iterator[str]:
+        """根据权重化的知识点逐章节生成更新后的课程内容
+        
+        与update生成的内容相同，但不在内存中拼接完整文本，适合知识点很多时直接写入文件
+        
+        Args:
+            weighted_topics: 权重化的知识点列表，元素可以是字典或KnowledgeItem，也可以是KnowledgeBatch
+            
+        Returns:
+            课程内容文本块的生成器
+        """
+        logger.info(f"开始流式更新课程内容，共有{len(weighted_topics)}个知识点")
+        
+        chapter_content = self._organize_by_chapter(weighted_topics)
+        yield from self._render_content(chapter_content)
+        
+        logger.info("课程内容更新完成")
+    
+    def update_to_file(self, weighted_topics: List[Dict[str, Any]], output_path: str, incremental: bool = True) -> bool:
+        """根据权重化的知识点更新课程内容，并边生成边写入文件
+        
+        每个章节的内容哈希和在文件中的字节位置记录在输出文件旁的清单文件中。
+        增量模式下，知识点未变化的章节直接从上次的输出文件中拷贝，只重新生成有变化的章节。
+        新内容先写入临时文件，完成后再替换输出文件。
+        
+        Args:
+            weighted_topics: 权重化的知识点列表，元素可以是字典或KnowledgeItem，也可以是KnowledgeBatch
+            output_path: 输出文件路径
+            incremental: 是否复用上次输出中未变化的章节
+            
+        Returns:
+            是否写入成功
+        """
+        logger.info(f"开始更新课程内容，共有{len(weighted_topics)}个知识点")
+        chapter_content = self._organize_by_chapter(weighted_topics)
+        
+        manifest_path = f"{output_path}.manifest.json"
+        previous = self._load_manifest(manifest_path, output_path) if incremental else {}
+        temp_path = f"{output_path}.tmp"
+        chapters = {}
+        reused = 0
+        
+        try:
+            # 确保目录存在
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            
+            with open(temp_path, 'wb') as out, (open(output_path, 'rb') if previous else nullcontext()) as old:
+                out.write(self._render_head(chapter_content).encode('utf-8'))
+                
+                for chapter in sorted(chapter_content.keys()):
+                    topics = chapter_content[chapter]
+                    if not topics:
+                        continue
+                    
+                    digest = self._chapter_hash(chapter, topics)
+                    entry = previous.get(chapter)
+                    block = None
+                    if entry and entry["hash"] == digest:
+                        old.seek(entry["offset"])
+                        block = old.read(entry["length"])
+                        if len(block) == entry["length"]:
+                            reused += 1
+                        else:
+                            block = None
+                    if block is None:
+                        block = self._render_chapter_block(chapter, topics).encode('utf-8')
+                    
+                    chapters[chapter] = {"hash": digest, "offset": out.tell(), "length": len(block)}
+                    out.write(block)
+                    out.flush()
+            
+            os.replace(temp_path, output_path)
+        except Exception as e:
+            logger.error(f"写入课程内容失败: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+        
+        self._save_manifest(manifest_path, output_path, chapters)
+        logger.info(f"课程内容更新完成，共{len(chapters)}个章节，其中{reused}个未变化的章节复用了上次的输出")
+        return True
+    
+    def _chapter_hash(self, chapter: str, topics: List[Dict[str, Any]]) -> str:
+        """计算章节内容的哈希，覆盖渲染章节所用的全部字段
+        
+        Args:
+            chapter: 章节编号
+            topics: 该章节按权重排序的知识点
+            
+        Returns:
+            十六进制哈希值
+        """
+        chapter_parts = chapter.split('.')
+        chapter_name = self._find_chapter_name(chapter_parts[0], '.'.join(chapter_parts[1:])) if len(chapter_parts) >= 2 else ""
+        
+        raw = json.dumps([
+            MANIFEST_VERSION,
+            bool(self.template),
+            chapter,
+            chapter_name,
+            [[topic.get("title"), topic.get("content"), topic.get("source"), topic.get("weight")] for topic in topics]
+        ], ensure_ascii=False, default=str)
+        return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _load_manifest(self, manifest_path: str, output_path: str) -> Dict[str, Dict[str, Any]]:
+        """加载上次输出的章节清单，输出文件在此之后被修改过时清单作废
+        
+        Args:
+            manifest_path: 清单文件路径
+            output_path: 输出文件路径
+            
+        Returns:
+            章节编号到哈希和字节位置的映射，清单不可用时返回空字典
+        """
+        if not os.path.exists(manifest_path) or not os.path.exists(output_path):
+            return {}
+        
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            
+            stat = os.stat(output_path)
+            if (manifest.get("version") != MANIFEST_VERSION
+                    or manifest.get("output") != [stat.st_size, stat.st_mtime_ns]):
+                logger.info("输出文件已变化，重新生成全部章节")
+                return {}
+            return manifest["chapters"]
+        except Exception as e:
+            logger.error(f"加载章节清单失败: {e}")
+            return {}
+    
+    def _save_manifest(self, manifest_path: str, output_path: str, chapters: Dict[str, Dict[str, Any]]):
+        """保存本次输出的章节清单
+        
+        Args:
+            manifest_path: 清单文件路径
+            output_path: 输出文件路径
+            chapters: 章节编号到哈希和字节位置的映射
+        """
+        try:
+            stat = os.stat(output_path)
+            with open(manifest_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": MANIFEST_VERSION,
+                    "output": [stat.st_size, stat.st_mtime_ns],
+                    "chapters": chapters
+                }, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"保存章节清单失败: {e}")
+    
     def _organize_by_chapter(self, topics: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """将知识点按章节组织
         
@@ -189,6 +260,20 @@ class CourseEngineer:
         
         return chapter_content
     
+    def classify(self, topic: Dict[str, Any]) -> str:
+        """确定知识点所属章节，不写入特征缓存，供流式分析时逐条归类
+        
+        Args:
+            topic: 知识点字典
+            
+        Returns:
+            章节编号，如"1.1"
+        """
+        section = self.chapter_index.find_topic_section(
+            topic.get('title', ''), f"{topic.get('title', '')} {topic.get('content', '')}"
+        )
+        return section or next(iter(self.chapter_index.sections), "1.1")
+    
     def _determine_chapter(self, topic: Dict[str, Any]) -> str:
         """确定知识点应该属于哪个章节
         
@@ -198,23 +283,15 @@ class CourseEngineer:
         Returns:
             章节编号，如"1.1"
         """
-        # 默认章节
-        default_chapter = "1.1"
-        
-        # 合并标题和内容用于匹配
-        text = f"{topic.get('title', '')} {topic.get('content', '')}"
+        # 默认章节为模板中的第一个小节
+        default_chapter = next(iter(self.chapter_index.sections), "1.1")
         
-        # 尝试匹配最具体的关键词
-        best_match = None
-        best_match_len = 0
-        
-        for keyword, chapter in self.chapter_mapping.items():
-            if re.search(rf'\b{re.escape(keyword)}\b', text, re.IGNORECASE):
-                if len(keyword) > best_match_len:
-                    best_match = chapter
-                    best_match_len = len(keyword)
-        
-        return best_match or default_chapter
+        # 先在标题中、再在全文中找出命中的关键词，取最具体（最长）的关键词对应的小节
+        section = self.feature_store.get(
+            topic, f"chapter_section:{self.template_path}",
+            lambda item: self.chapter_index.find_topic_section(item.get('title', ''), self.feature_store.text(item))
+        )
+        return section or default_chapter
     
     def _generate_content(self, chapter_content: Dict[str, List[Dict[str, Any]]]) -> str:
         """生成更新后的课程内容
@@ -225,107 +302,169 @@ class CourseEngineer:
         Returns:
             更新后的课程内容文本
         """
-        # 如果模板为空，创建一个基本结构
+        return "".join(self._render_content(chapter_content))
+    
+    def _render_content(self, chapter_content: Dict[str, List[Dict[str, Any]]]) -> Iterator[str]:
+        """逐块生成更新后的课程内容，每个章节为一块
+        
+        Args:
+            chapter_content: 按章节组织的知识点字典
+            
+        Returns:
+            课程内容文本块的生成器
+        """
+        yield self._render_head(chapter_content)
+        
+        # 按章节顺序添加内容
+        for chapter in sorted(chapter_content.keys()):
+            topics = chapter_content[chapter]
+            if topics:
+                yield self._render_chapter_block(chapter, topics)
+    
+    def _render_head(self, chapter_content: Dict[str, List[Dict[str, Any]]]) -> str:
+        """生成章节内容之前的标题、更新时间和更新摘要
+        
+        Args:
+            chapter_content: 按章节组织的知识点字典
+            
+        Returns:
+            文档开头的文本
+        """
+        header = "# 数据结构课程更新内容\n\n"
+        header += f"更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        
+        # 如果模板为空，只有标题和更新时间
         if not self.template:
-            output = "# 数据结构课程更新内容\n\n"
-            output += f"更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            return header
+        
+        # 基于现有模板生成更新摘要
+        return header + self._render_summary(chapter_content) + "\n## 详细更新内容\n\n"
+    
+    def _render_chapter_block(self, chapter: str, topics: List[Dict[str, Any]]) -> str:
+        """生成单个章节的内容
+        
+        Args:
+            chapter: 章节编号
+            topics: 该章节按权重排序的知识点
             
-            # 按章节顺序添加内容
-            for chapter in sorted(chapter_content.keys()):
-                topics = chapter_content[chapter]
-                if not topics:
-                    continue
-                
-                # 添加章节标题
-                chapter_parts = chapter.split('.')
-                if len(chapter_parts) >= 2:
-                    main_chapter = chapter_parts[0]
-                    sub_chapter = '.'.join(chapter_parts[1:])
-                    
-                    # 查找章节名称
-                    chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
-                    output += f"## {chapter} {chapter_name}\n\n"
-                else:
-                    output += f"## 章节 {chapter}\n\n"
-                
-                # 添加知识点内容
-                for topic in topics:
-                    weight = topic.get("weight", 0)
-                    title = topic.get("title", "未命名知识点")
-                    content = topic.get("content", "")
-                    source = topic.get("source", "未知来源")
-                    
-                    output += f"### {title} [权重:{weight:.2f}]\n\n"
-                    output += f"{content}\n\n"
-                    output += f"*来源: {source}*\n\n"
+        Returns:
+            章节内容文本
+        """
+        if not self.template:
+            return self._render_basic_chapter(chapter, topics)
+        return self._render_chapter(chapter, topics)
+    
+    def _render_basic_chapter(self, chapter: str, topics: List[Dict[str, Any]]) -> str:
+        """生成无模板时单个章节的内容
+        
+        Args:
+            chapter: 章节编号
+            topics: 该章节按权重排序的知识点
             
-            return output
+        Returns:
+            章节内容文本
+        """
+        parts = []
+        
+        # 添加章节标题
+        chapter_parts = chapter.split('.')
+        if len(chapter_parts) >= 2:
+            main_chapter = chapter_parts[0]
+            sub_chapter = '.'.join(chapter_parts[1:])
+            
+            # 查找章节名称
+            chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
+            parts.append(f"## {chapter} {chapter_name}\n\n")
         else:
-            # 基于现有模板生成更新内容
-            output = "# 数据结构课程更新内容\n\n"
-            output += f"更新时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            output += "## 更新摘要\n\n"
-            output += "本次更新基于最新教学资源和考研真题，对以下章节进行了内容补充和优化：\n\n"
+            parts.append(f"## 章节 {chapter}\n\n")
+        
+        # 添加知识点内容
+        for topic in topics:
+            weight = topic.get("weight", 0)
+            title = topic.get("title", "未命名知识点")
+            content = topic.get("content", "")
+            source = topic.get("source", "未知来源")
             
-            # 添加更新摘要
-            for chapter in sorted(chapter_content.keys()):
-                topics = chapter_content[chapter]
-                if not topics:
-                    continue
-                
-                # 查找章节名称
-                chapter_parts = chapter.split('.')
-                if len(chapter_parts) >= 2:
-                    main_chapter = chapter_parts[0]
-                    sub_chapter = '.'.join(chapter_parts[1:])
-                    chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
-                    
-                    # 添加章节更新摘要
-                    topic_count = len(topics)
-                    top_topic = topics[0] if topics else None
-                    if top_topic:
-                        output += f"- **{chapter} {chapter_name}**: 新增{topic_count}个知识点，"
-                        output += f"重点包括《{top_topic.get('title', '')}》(权重:{top_topic.get('weight', 0):.2f})\n"
+            parts.append(f"### {title} [权重:{weight:.2f}]\n\n")
+            parts.append(f"{content}\n\n")
+            parts.append(f"*来源: {source}*\n\n")
+        
+        return "".join(parts)
+    
+    def _render_summary(self, chapter_content: Dict[str, List[Dict[str, Any]]]) -> str:
+        """生成更新摘要
+        
+        Args:
+            chapter_content: 按章节组织的知识点字典
             
-            output += "\n## 详细更新内容\n\n"
+        Returns:
+            更新摘要文本
+        """
+        parts = ["## 更新摘要\n\n", "本次更新基于最新教学资源和考研真题，对以下章节进行了内容补充和优化：\n\n"]
+        
+        for chapter in sorted(chapter_content.keys()):
+            topics = chapter_content[chapter]
+            if not topics:
+                continue
             
-            # 按章节添加详细内容
-            for chapter in sorted(chapter_content.keys()):
-                topics = chapter_content[chapter]
-                if not topics:
-                    continue
-                
-                # 添加章节标题
-                chapter_parts = chapter.split('.')
-                if len(chapter_parts) >= 2:
-                    main_chapter = chapter_parts[0]
-                    sub_chapter = '.'.join(chapter_parts[1:])
-                    chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
-                    output += f"### {chapter} {chapter_name}\n\n"
-                else:
-                    output += f"### 章节 {chapter}\n\n"
+            # 查找章节名称
+            chapter_parts = chapter.split('.')
+            if len(chapter_parts) >= 2:
+                main_chapter = chapter_parts[0]
+                sub_chapter = '.'.join(chapter_parts[1:])
+                chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
                 
-                # 添加知识点内容
-                for topic in topics:
-                    weight = topic.get("weight", 0)
-                    title = topic.get("title", "未命名知识点")
-                    content = topic.get("content", "")
-                    source = topic.get("source", "未知来源")
-                    
-                    # 标记高权重知识点
-                    weight_marker = ""
-                    if weight > 0.7:
-                        weight_marker = "⭐⭐⭐ 高频考点"
-                    elif weight > 0.5:
-                        weight_marker = "⭐⭐ 重要知识点"
-                    elif weight > 0.3:
-                        weight_marker = "⭐ 基础知识点"
-                    
-                    output += f"#### {title} {weight_marker}\n\n"
-                    output += f"{content}\n\n"
-                    output += f"*权重: {weight:.2f}, 来源: {source}*\n\n"
+                # 添加章节更新摘要
+                topic_count = len(topics)
+                top_topic = topics[0]
+                parts.append(f"- **{chapter} {chapter_name}**: 新增{topic_count}个知识点，")
+                parts.append(f"重点包括《{top_topic.get('title', '')}》(权重:{top_topic.get('weight', 0):.2f})\n")
+        
+        return "".join(parts)
+    
+    def _render_chapter(self, chapter: str, topics: List[Dict[str, Any]]) -> str:
+        """生成基于模板的单个章节详细内容
+        
+        Args:
+            chapter: 章节编号
+            topics: 该章节按权重排序的知识点
             
-            return output
+        Returns:
+            章节内容文本
+        """
+        parts = []
+        
+        # 添加章节标题
+        chapter_parts = chapter.split('.')
+        if len(chapter_parts) >= 2:
+            main_chapter = chapter_parts[0]
+            sub_chapter = '.'.join(chapter_parts[1:])
+            chapter_name = self._find_chapter_name(main_chapter, sub_chapter)
+            parts.append(f"### {chapter} {chapter_name}\n\n")
+        else:
+            parts.append(f"### 章节 {chapter}\n\n")
+        
+        # 添加知识点内容
+        for topic in topics:
+            weight = topic.get("weight", 0)
+            title = topic.get("title", "未命名知识点")
+            content = topic.get("content", "")
+            source = topic.get("source", "未知来源")
+            
+            # 标记高权重知识点
+            weight_marker = ""
+            if weight > 0.7:
+                weight_marker = "⭐⭐⭐ 高频考点"
+            elif weight > 0.5:
+                weight_marker = "⭐⭐ 重要知识点"
+            elif weight > 0.3:
+                weight_marker = "⭐ 基础知识点"
+            
+            parts.append(f"#### {title} {weight_marker}\n\n")
+            parts.append(f"{content}\n\n")
+            parts.append(f"*权重: {weight:.2f}, 来源: {source}*\n\n")
+        
+        return "".join(parts)
     
     def _find_chapter_name(self, main_chapter: str, sub_chapter: str) -> str:
         """查找章节名称
@@ -337,63 +476,8 @@ class CourseEngineer:
         Returns:
             章节名称
         """
-        # 硬编码章节名称映射
-        chapter_names = {
-            "1": {
-                "1": "数据结构的基本概念",
-                "2": "算法和算法评价"
-            },
-            "2": {
-                "1": "线性表的定义和基本操作",
-                "2": "线性表的顺序表示",
-                "3": "线性表的链式表示"
-            },
-            "3": {
-                "1": "栈",
-                "2": "队列",
-                "3": "栈和队列的应用",
-                "4": "数组和特殊矩阵"
-            },
-            "4": {
-                "1": "串的定义和实现",
-                "2": "串的模式匹配"
-            },
-            "5": {
-                "1": "树的基本概念",
-                "2": "二叉树的概念",
-                "3": "二叉树的遍历和线索二叉树",
-                "4": "树、森林",
-                "5": "树与二叉树的应用"
-            },
-            "6": {
-                "1": "图的基本概念",
-                "2": "图的存储及基本操作",
-                "3": "图的遍历",
-                "4": "图的应用"
-            },
-            "7": {
-                "1": "查找的基本概念",
-                "2": "顺序查找和折半查找",
-                "3": "树形查找",
-                "4": "B树和B+树",
-                "5": "散列表"
-            },
-            "8": {
-                "1": "排序的基本概念",
-                "2": "插入排序",
-                "3": "交换排序",
-                "4": "选择排序",
-                "5": "归并排序、基数排序和计数排序",
-                "6": "各种内部排序算法的比较及应用",
-                "7": "外部排序"
-            }
-        }
-        
-        # 尝试查找章节名称
-        if main_chapter in chapter_names and sub_chapter in chapter_names[main_chapter]:
-            return chapter_names[main_chapter][sub_chapter]
-        
-        return "未知章节"
+        # 从模板解析的章节索引中查找
+        return self.chapter_index.section_name(f"{main_chapter}.{sub_chapter}") or "未知章节"
 
 
 # 测试代码
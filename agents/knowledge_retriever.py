@@ -8,31 +8,50 @@
 
 import os
 import sys
+import time
+import queue
+import threading
 import random
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple, Iterable, Iterator, Union
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from api.search_engine_api import SearchEngineAPI
 from api.llm_api import LLMAPI
 from utils.logger import get_logger
+from utils.knowledge_item import KnowledgeItem, timestamp_us
 
 logger = get_logger(__name__)
 
 class KnowledgeRetriever:
     """知识检索专家，负责从多个来源获取最新的知识内容"""
     
-    def __init__(self, llm_api="GLM-4", search_engine="bing"):
+    def __init__(self, llm_api="GLM-4", search_engine="bing", concurrent=True,
+                 search_timeout: Optional[float] = 10, llm_timeout: Optional[float] = 60,
+                 max_workers: int = 8, compact_items: bool = False):
         """初始化知识检索专家
         
         Args:
             llm_api: 使用的大模型API名称
             search_engine: 使用的搜索引擎名称
+            concurrent: 是否同时调用搜索引擎和大模型
+            search_timeout: 并发模式下搜索引擎的超时时间（秒），None表示不限制
+            llm_timeout: 并发模式下大模型的超时时间（秒），None表示不限制
+            max_workers: 批量检索时的最大并发查询数
+            compact_items: 是否以KnowledgeItem代替字典返回知识点，检索时间记为整数时间戳
         """
         self.llm_api = LLMAPI(model_name=llm_api)
         self.search_engine = SearchEngineAPI(engine=search_engine)
-        logger.info(f"知识检索专家初始化完成，使用模型: {llm_api}, 搜索引擎: {search_engine}")
+        self.concurrent = concurrent
+        self.search_timeout = search_timeout
+        self.llm_timeout = llm_timeout
+        self.max_workers = max_workers
+        self.compact_items = compact_items
+        logger.info(f"知识检索专家初始化完成，使用模型: {llm_api}, 搜索引擎: {search_engine}, "
+                    f"并发检索: {'开启' if concurrent else '关闭'}")
     
     def retrieve(self, query: str, max_results: int = 20) -> List[Dict[str, Any]]:
         """检索与查询相关的知识
@@ -42,34 +61,275 @@ class KnowledgeRetriever:
             max_results: 最大返回结果数量
             
         Returns:
-            包含检索到的知识条目的列表，每个条目为字典格式
+            包含检索到的知识条目的列表，每个条目为字典格式，compact_items为True时为KnowledgeItem
         """
         logger.info(f"开始检索知识: {query}")
         
-        # 从搜索引擎获取结果
+        if self.concurrent:
+            # 同时向搜索引擎和大模型发起请求
+            search_results, knowledge_items = self._retrieve_concurrent(query, max_results)
+        else:
+            # 依次调用搜索引擎和大模型
+            search_results = self._search(query, max_results)
+            knowledge_items = self._query_llm(query)
+        
+        # 合并结果
+        all_results = search_results + knowledge_items
+        
+        # 为每个知识点添加元数据
+        all_results = [self._attach_metadata(item) for item in all_results]
+        
+        logger.info(f"知识检索完成，共获取{len(all_results)}条知识点")
+        return all_results
+    
+    def retrieve_stream(self, query: str, max_results: int = 20) -> Iterator[Dict[str, Any]]:
+        """以流式方式检索知识，每个知识点一旦完整就立即产出
+        
+        搜索引擎和大模型的流式读取各在一个后台线程中执行，通过队列把搜索完成的通知和大模型的文本片段交给当前线程，
+        当前线程按最近的截止时间等待队列，因此大模型长时间没有新内容时也能按时超时并产出已返回的搜索结果。
+        解析出的知识点和搜索结果按完成的先后顺序产出，下游可以边检索边分析。
+        
+        Args:
+            query: 搜索查询关键词
+            max_results: 最大返回结果数量
+            
+        Yields:
+            带有元数据的知识条目
+        """
+        logger.info(f"开始流式检索知识: {query}")
+        
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="retriever")
+        events = queue.Queue()
+        stop = threading.Event()
+        start = time.monotonic()
+        deadlines = {
+            "search": start + self.search_timeout if self.search_timeout is not None else None,
+            "llm": start + self.llm_timeout if self.llm_timeout is not None else None,
+        }
+        count = 0
+        
+        def read_llm():
+            """在后台线程中读取大模型的流式输出，逐段放入队列"""
+            try:
+                for chunk in self.llm_api.generate_stream(self._build_prompt(query)):
+                    if stop.is_set():
+                        break
+                    events.put(("chunk", chunk))
+                events.put(("llm", None))
+            except Exception as e:
+                events.put(("llm", e))
+        
+        search_future = executor.submit(self._search, query, max_results)
+        search_future.add_done_callback(lambda future: events.put(("search", None)))
+        executor.submit(read_llm)
+        
+        parser = KnowledgeItemParser(query)
+        pending = {"search", "llm"}
+        try:
+            while pending:
+                # 放弃已经超时的来源
+                now = time.monotonic()
+                items = []
+                for name in [n for n in pending if deadlines[n] is not None and now >= deadlines[n]]:
+                    pending.discard(name)
+                    if name == "search":
+                        search_future.cancel()
+                        logger.warning(f"search来源超时，已放弃其结果: {query}")
+                    else:
+                        stop.set()
+                        logger.warning(f"llm来源超时，停止读取后续内容: {query}")
+                        items = parser.close()
+                
+                if pending:
+                    # 等待到最近的截止时间或任一来源有新内容
+                    active_deadlines = [deadlines[n] for n in pending if deadlines[n] is not None]
+                    timeout = max(min(active_deadlines) - now, 0) if active_deadlines else None
+                    try:
+                        kind, payload = events.get(timeout=timeout)
+                    except queue.Empty:
+                        kind = None
+                    
+                    if kind == "chunk" and "llm" in pending:
+                        items += parser.feed(payload)
+                    elif kind == "llm" and "llm" in pending:
+                        pending.discard("llm")
+                        if payload is not None:
+                            logger.error(f"llm来源检索失败: {payload}")
+                        items += parser.close()
+                    elif kind == "search" and "search" in pending:
+                        pending.discard("search")
+                        try:
+                            items = search_future.result() + items
+                        except Exception as e:
+                            logger.error(f"search来源检索失败: {e}")
+                
+                for item in items:
+                    count += 1
+                    yield self._attach_metadata(item)
+        finally:
+            # 不等待被放弃的慢来源
+            stop.set()
+            executor.shutdown(wait=False)
+        
+        logger.info(f"流式检索完成，共获取{count}条知识点")
+    
+    def retrieve_many(self, queries: Iterable[str], max_results: int = 20,
+                      max_workers: Optional[int] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """批量检索多个查询，在有界线程池中并发执行
+        
+        查询按需提交，同一时刻最多有max_workers*2个查询在排队或执行，
+        每个查询完成后立即产出结果，因此结果顺序与输入顺序不一定相同。
+        
+        Args:
+            queries: 查询关键词序列，可以是任意可迭代对象
+            max_results: 每个查询的最大返回结果数量
+            max_workers: 最大并发查询数，None表示使用初始化时的配置
+            
+        Yields:
+            (查询关键词, 检索结果列表)元组
+        """
+        max_workers = max(1, max_workers or self.max_workers)
+        query_iter = iter(queries)
+        completed = 0
+        
+        logger.info(f"开始批量检索，最大并发数: {max_workers}")
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="retrieve_many") as executor:
+            pending = {
+                executor.submit(self.retrieve, query, max_results): query
+                for query in itertools.islice(query_iter, max_workers * 2)
+            }
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    query = pending.pop(future)
+                    try:
+                        results = future.result()
+                    except Exception as e:
+                        logger.error(f"检索失败: {query}, 错误: {e}")
+                        results = []
+                    
+                    # 补充一个新查询，保持线程池满载
+                    for next_query in itertools.islice(query_iter, 1):
+                        pending[executor.submit(self.retrieve, next_query, max_results)] = next_query
+                    
+                    completed += 1
+                    yield query, results
+        
+        logger.info(f"批量检索完成，共处理{completed}个查询")
+    
+    def _attach_metadata(self, item: Dict[str, Any]) -> Union[Dict[str, Any], KnowledgeItem]:
+        """为知识点添加检索元数据
+        
+        Args:
+            item: 知识条目
+            
+        Returns:
+            添加了元数据的知识条目（原地修改）；compact_items为True时返回KnowledgeItem
+        """
+        if self.compact_items:
+            return KnowledgeItem.from_dict(item, retrieved_at=timestamp_us())
+        
+        if "metadata" not in item:
+            item["metadata"] = {}
+        item["metadata"]["retrieved_at"] = datetime.now().isoformat()
+        item["metadata"]["source"] = item.get("source", "llm_generated")
+        return item
+    
+    def _build_prompt(self, query: str) -> str:
+        """构建向大模型请求知识补充的提示词
+        
+        Args:
+            query: 搜索查询关键词
+            
+        Returns:
+            提示词
+        """
+        return f"请提供关于'{query}'的最新教学知识，特别是考研考点和重要算法。格式为多个知识点条目，每个条目包含标题和内容。"
+    
+    def _search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """从搜索引擎获取结果
+        
+        Args:
+            query: 搜索查询关键词
+            max_results: 最大返回结果数量
+            
+        Returns:
+            搜索结果列表
+        """
         search_results = self.search_engine.search(query, max_results=max_results//2)
         logger.info(f"从搜索引擎获取了{len(search_results)}条结果")
+        return search_results
+    
+    def _query_llm(self, query: str) -> List[Dict[str, Any]]:
+        """从大模型获取知识补充
         
-        # 从大模型获取知识补充
-        prompt = f"请提供关于'{query}'的最新教学知识，特别是考研考点和重要算法。格式为多个知识点条目，每个条目包含标题和内容。"
-        llm_results = self.llm_api.generate(prompt)
+        Args:
+            query: 搜索查询关键词
+            
+        Returns:
+            解析后的知识点列表
+        """
+        llm_results = self.llm_api.generate(self._build_prompt(query))
         
         # 解析大模型返回的知识点
         knowledge_items = self._parse_llm_results(llm_results, query)
         logger.info(f"从大模型获取了{len(knowledge_items)}条知识点")
+        return knowledge_items
+    
+    def _retrieve_concurrent(self, query: str, max_results: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """并发调用搜索引擎和大模型，按各自的超时时间收集结果
         
-        # 合并结果
-        all_results = search_results + knowledge_items
+        任一来源超时或出错时只放弃该来源的结果，不影响其他来源。
         
-        # 为每个知识点添加元数据
-        for item in all_results:
-            if "metadata" not in item:
-                item["metadata"] = {}
-            item["metadata"]["retrieved_at"] = datetime.now().isoformat()
-            item["metadata"]["source"] = item.get("source", "llm_generated")
+        Args:
+            query: 搜索查询关键词
+            max_results: 最大返回结果数量
+            
+        Returns:
+            (搜索结果列表, 大模型知识点列表)元组
+        """
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="retriever")
+        start = time.monotonic()
+        futures = {
+            executor.submit(self._search, query, max_results): "search",
+            executor.submit(self._query_llm, query): "llm",
+        }
+        deadlines = {
+            "search": start + self.search_timeout if self.search_timeout is not None else None,
+            "llm": start + self.llm_timeout if self.llm_timeout is not None else None,
+        }
+        results = {"search": [], "llm": []}
         
-        logger.info(f"知识检索完成，共获取{len(all_results)}条知识点")
-        return all_results
+        pending = set(futures)
+        try:
+            while pending:
+                # 放弃已经超时的来源
+                now = time.monotonic()
+                for future in [f for f in pending if deadlines[futures[f]] is not None and now >= deadlines[futures[f]]]:
+                    pending.discard(future)
+                    future.cancel()
+                    logger.warning(f"{futures[future]}来源超时，已放弃其结果: {query}")
+                if not pending:
+                    break
+                
+                # 等待到最近的截止时间或任一来源返回
+                active_deadlines = [deadlines[futures[f]] for f in pending if deadlines[futures[f]] is not None]
+                timeout = max(min(active_deadlines) - now, 0) if active_deadlines else None
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    name = futures[future]
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.error(f"{name}来源检索失败: {e}")
+        finally:
+            # 不等待被放弃的慢来源
+            executor.shutdown(wait=False)
+        
+        logger.info(f"并发检索完成，耗时{time.monotonic() - start:.2f}秒")
+        return results["search"], results["llm"]
     
     def _parse_llm_results(self, llm_text: str, query: str) -> List[Dict[str, Any]]:
         """解析大模型返回的文本，提取结构化的知识点
@@ -81,42 +341,98 @@ class KnowledgeRetriever:
         Returns:
             结构化的知识点列表
         """
-        # 这里使用简单的分割方法，实际项目中可能需要更复杂的解析
-        # 模拟解析结果
-        knowledge_items = []
+        parser = KnowledgeItemParser(query)
+        return parser.feed(llm_text) + parser.close()
+
+
+class KnowledgeItemParser:
+    """增量式知识点解析器，逐段接收大模型输出并在知识点完整后立即返回"""
+    
+    def __init__(self, query: str):
+        """初始化解析器
+        
+        Args:
+            query: 原始查询关键词
+        """
+        self.query = query
+        self._buffer = ""
+        self._current_item = {}
+    
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """接收一段新的文本
+        
+        一个知识点在遇到下一个标题行时才算完整，因此返回的是已经结束的知识点。
         
-        # 简单模拟，实际实现需要根据LLM返回格式进行解析
-        lines = llm_text.split('\n')
-        current_item = {}
+        Args:
+            chunk: 大模型新生成的文本片段
+            
+        Returns:
+            本次新完成的知识点列表
+        """
+        # 最后一段可能是不完整的行，留到下次再处理
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split('\n')
         
+        knowledge_items = []
         for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            if line.startswith('#') or line.startswith('标题:') or line.startswith('知识点:'):
-                # 如果已经有一个条目在处理中，先保存它
-                if current_item and 'title' in current_item and 'content' in current_item:
-                    knowledge_items.append(current_item)
-                
-                # 开始一个新条目
-                current_item = {
-                    "title": line.lstrip('#').lstrip(':').strip(),
-                    "content": "",
-                    "source": "llm_generated",
-                    "query": query
-                }
-            elif current_item and 'title' in current_item:
-                # 将这一行添加到当前条目的内容中
-                if current_item["content"]:
-                    current_item["content"] += "\n"
-                current_item["content"] += line
+            item = self._process_line(line)
+            if item:
+                knowledge_items.append(item)
+        return knowledge_items
+    
+    def close(self) -> List[Dict[str, Any]]:
+        """结束解析，返回剩余的知识点
+        
+        Returns:
+            最后完成的知识点列表
+        """
+        knowledge_items = []
+        
+        item = self._process_line(self._buffer)
+        self._buffer = ""
+        if item:
+            knowledge_items.append(item)
         
         # 添加最后一个条目
-        if current_item and 'title' in current_item and 'content' in current_item:
-            knowledge_items.append(current_item)
+        if self._current_item and 'title' in self._current_item and 'content' in self._current_item:
+            knowledge_items.append(self._current_item)
+        self._current_item = {}
         
         return knowledge_items
+    
+    def _process_line(self, line: str) -> Optional[Dict[str, Any]]:
+        """处理一行文本
+        
+        Args:
+            line: 一行文本
+            
+        Returns:
+            如果这一行开始了新条目，返回上一个已完成的条目，否则返回None
+        """
+        line = line.strip()
+        if not line:
+            return None
+        
+        finished_item = None
+        if line.startswith('#') or line.startswith('标题:') or line.startswith('知识点:'):
+            # 如果已经有一个条目在处理中，先保存它
+            if self._current_item and 'title' in self._current_item and 'content' in self._current_item:
+                finished_item = self._current_item
+            
+            # 开始一个新条目
+            self._current_item = {
+                "title": line.lstrip('#').lstrip(':').strip(),
+                "content": "",
+                "source": "llm_generated",
+                "query": self.query
+            }
+        elif self._current_item and 'title' in self._current_item:
+            # 将这一行添加到当前条目的内容中
+            if self._current_item["content"]:
+                self._current_item["content"] += "\n"
+            self._current_item["content"] += line
+        
+        return finished_item
 
 
 # 测试代码
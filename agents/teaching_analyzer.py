@@ -8,59 +8,359 @@
 
 import os
 import sys
-import re
-from typing import List, Dict, Any
+import heapq
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import List, Dict, Any, Tuple, Iterable, Optional, Callable
 from collections import Counter
-import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
+from data_processing.rule_matcher import WeightRuleMatcher
+from utils.feature_store import FeatureStore
+from utils.knowledge_item import KnowledgeBatch, take, with_weight
 
 logger = get_logger(__name__)
 
+# 进程池中每个工作进程各自持有的教学分析师
+_worker_analyzer = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """工作进程初始化，按主进程的配置创建教学分析师
+    
+    Args:
+        config: TeachingAnalyzer的初始化参数
+    """
+    global _worker_analyzer
+    _worker_analyzer = TeachingAnalyzer(**config)
+
+
+def _analyze_shard(topics: List[Dict[str, Any]]) -> Tuple[List[int], List[float]]:
+    """在工作进程中对一个分片去重并计算权重
+    
+    Args:
+        topics: 分片中的知识点列表
+    
+    Returns:
+        (保留的知识点在分片中的下标, 对应的权重)元组，只返回下标以减少进程间传输的数据
+    """
+    kept = _worker_analyzer._duplicate_keep(topics)
+    weights = _worker_analyzer._calculate_weights(take(topics, kept))
+    return kept, weights.tolist()
+
+
 class TeachingAnalyzer:
     """教学分析师，负责对知识进行分析和权重计算"""
     
-    def __init__(self, weight_rules=None):
+    def __init__(self, weight_rules=None, dedup_method="tfidf", lsh_num_perm=128, lsh_bands=32, feature_store=None,
+                 vectorizer=None, similarity_mode="auto", memory_budget_mb=1024, lsh_max_bucket_size=100):
         """初始化教学分析师
         
         Args:
             weight_rules: 预定义的权重规则，如考研分数分布
+            dedup_method: 去重方式，tfidf为全量两两比较，lsh为基于MinHash/LSH的候选检索
+            lsh_num_perm: LSH模式下的MinHash签名长度
+            lsh_bands: LSH模式下的分段数，越大召回率越高，越小精确率越高
+            feature_store: 各智能体共享的特征缓存，默认使用独立的缓存
+            vectorizer: 去重使用的向量化器，如基于参考语料词表的向量化器，默认每批重新拟合TF-IDF
+            similarity_mode: tfidf去重时相似度的计算方式，dense为完整矩阵，blocked为分块稀疏计算，
+                auto在完整矩阵超过内存预算时使用blocked
+            memory_budget_mb: 相似度计算的内存预算（MB）
+            lsh_max_bucket_size: LSH模式下桶内文档数的上限，超过时只在相邻文档间组成候选对
         """
         self.weight_rules = weight_rules or self._load_rules()
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        # 所有权重规则编译为一个自动机，每个知识点只需扫描一次
+        self.rule_matcher = WeightRuleMatcher(self.weight_rules)
+        self.feature_store = feature_store or FeatureStore()
+        # sklearn导入耗时较长，未指定向量化器时在首次去重时才创建
+        self._vectorizer = vectorizer
+        self.dedup_method = dedup_method
+        self.lsh_num_perm = lsh_num_perm
+        self.lsh_bands = lsh_bands
+        self.lsh_max_bucket_size = lsh_max_bucket_size
+        self.lsh = None
+        if dedup_method == "lsh":
+            from data_processing.dedup import MinHashLSH
+            self.lsh = MinHashLSH(num_perm=lsh_num_perm, bands=lsh_bands, max_bucket_size=lsh_max_bucket_size)
+        self.similarity_mode = similarity_mode
+        self.memory_budget_mb = memory_budget_mb
         logger.info(f"教学分析师初始化完成，加载了{len(self.weight_rules)}条权重规则")
     
-    def analyze(self, new_knowledge: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @property
+    def vectorizer(self):
+        """TF-IDF向量化器，首次使用时创建"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        return self._vectorizer
+    
+    def analyze(self, new_knowledge: Iterable[Dict[str, Any]], top_k: Optional[int] = None,
+                per_chapter_k: Optional[int] = None, chapter_key: Optional[Callable[[Dict[str, Any]], str]] = None,
+                chunk_size: int = 5000) -> List[Dict[str, Any]]:
         """分析新知识并计算权重
         
+        指定top_k或per_chapter_k时按流式方式分析，new_knowledge可以是任意迭代器，
+        只保留权重最高的知识点，内存占用与保留数量和分块大小有关，与输入总量无关。
+        
         Args:
-            new_knowledge: 检索到的新知识列表
+            new_knowledge: 检索到的新知识列表，元素可以是字典或KnowledgeItem，也可以是KnowledgeBatch；
+                流式分析时可以是迭代器
+            top_k: 只返回权重最高的top_k条知识点
+            per_chapter_k: 每个章节只保留权重最高的per_chapter_k条知识点，需要指定chapter_key
+            chapter_key: 确定知识点所属章节的函数
+            chunk_size: 流式分析时每次读取并去重的知识点数量
             
         Returns:
-            按权重排序的知识点列表
+            按权重排序的知识点列表，元素与输入的表示方式相同；输入为KnowledgeBatch时返回KnowledgeBatch
         """
+        if top_k is not None or per_chapter_k is not None:
+            # KnowledgeBatch逐条读取，只有保留的知识点重新按列存储
+            if isinstance(new_knowledge, KnowledgeBatch):
+                return KnowledgeBatch.from_records(
+                    self._analyze_stream(iter(new_knowledge), top_k, per_chapter_k, chapter_key, chunk_size)
+                )
+            return self._analyze_stream(new_knowledge, top_k, per_chapter_k, chapter_key, chunk_size)
+        
         logger.info(f"开始分析{len(new_knowledge)}条知识点")
         
         # 1. 文本去重（基于TF-IDF相似度）
         cleaned = self._remove_duplicates(new_knowledge)
         logger.info(f"去重后剩余{len(cleaned)}条知识点")
         
-        # 2. 权重计算（基于规则匹配）
-        weighted = []
-        for topic in cleaned:
-            weight = self._calculate_weight(topic)
-            weighted.append({**topic, "weight": weight})
+        # 2. 权重计算（基于规则匹配），整批一次计算
+        weights = self._calculate_weights(cleaned)
         
         # 3. 按权重排序
-        result = sorted(weighted, key=lambda x: x["weight"], reverse=True)
-        logger.info(f"完成权重计算和排序，权重范围: {result[-1]['weight']:.2f} - {result[0]['weight']:.2f}")
+        result = self._sort_by_weight(cleaned, weights)
+        if result:
+            logger.info(f"完成权重计算和排序，权重范围: {result[-1]['weight']:.2f} - {result[0]['weight']:.2f}")
+        
+        return result
+    
+    def analyze_sharded(self, new_knowledge: List[Dict[str, Any]], workers: Optional[int] = None, shard_by: str = "lsh",
+                        chapter_key: Optional[Callable[[Dict[str, Any]], str]] = None,
+                        min_shard_size: int = 1000, top_k: Optional[int] = None,
+                        per_chapter_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """多进程分片分析新知识并计算权重
+        
+        按分片键将知识点划分为若干分片，每个分片在单独的工作进程中去重并计算权重，
+        再只对各分片保留的知识点做一次跨分片去重。精确去重和batch方式的TF-IDF拟合在当前进程中完成，
+        各分片的向量与单进程相同，最终保留的知识点两两之间的相似度都不超过阈值；
+        但重复链跨越分片时处理顺序与单进程不同，保留的知识点可能与analyze略有差异。
+        
+        Args:
+            new_knowledge: 检索到的新知识列表，元素可以是字典或KnowledgeItem，也可以是KnowledgeBatch
+            workers: 进程数，None表示使用全部CPU核心
+            shard_by: 分片方式，lsh按MinHash值分片，近似重复的知识点大概率在同一分片；
+                chapter按chapter_key返回的章节分片
+            chapter_key: 确定知识点所属章节的函数，shard_by为chapter时需要
+            min_shard_size: 每个分片的最少知识点数量，知识点较少时减少进程数或在当前进程中分析
+            top_k: 排序后只返回权重最高的top_k条知识点
+            per_chapter_k: 排序后每个章节只保留权重最高的per_chapter_k条知识点，需要指定chapter_key
+            
+        Returns:
+            按权重排序的知识点列表；输入为KnowledgeBatch时返回KnowledgeBatch
+        """
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(new_knowledge) // max(1, min_shard_size))
+        if workers <= 1:
+            return self.analyze(new_knowledge, top_k, per_chapter_k, chapter_key)
+        
+        from data_processing.dedup import exact_duplicate_keep, minhash_keys, shard_partition
+        
+        # 精确去重在当前进程中完成，与单进程相同，也减少传给工作进程的数据
+        exact_kept = exact_duplicate_keep(
+            [self.feature_store.normalized_text(topic) for topic in new_knowledge],
+            lambda i: len(new_knowledge[i].get('title', ''))
+        )
+        logger.info(f"精确去重: {len(new_knowledge)}条 -> {len(exact_kept)}条")
+        new_knowledge = take(new_knowledge, exact_kept)
+        
+        # batch方式在全部知识点上拟合一次TF-IDF，各分片使用与单进程相同的词表和IDF
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        vectorizer = self.vectorizer
+        if isinstance(vectorizer, TfidfVectorizer):
+            from data_processing.tfidf_vocabulary import FittedVectorizer
+            try:
+                vectorizer = FittedVectorizer(
+                    self.vectorizer.fit([self.feature_store.text(topic) for topic in new_knowledge])
+                )
+            except Exception as e:
+                logger.error(f"拟合TF-IDF向量化器失败: {e}，各分片分别拟合")
+        
+        if shard_by == "chapter" and chapter_key is not None:
+            keys = [chapter_key(topic) for topic in new_knowledge]
+        else:
+            if shard_by != "lsh":
+                logger.warning(f"不支持的分片方式或未指定章节归类函数: {shard_by}，使用lsh")
+            keys = minhash_keys([self.feature_store.normalized_text(topic) for topic in new_knowledge])
+        shards = shard_partition(keys, workers)
+        logger.info(f"开始分片分析{len(new_knowledge)}条知识点，分片大小: {[len(shard) for shard in shards]}")
+        
+        config = {
+            "weight_rules": self.weight_rules,
+            "dedup_method": self.dedup_method,
+            "lsh_num_perm": self.lsh_num_perm,
+            "lsh_bands": self.lsh_bands,
+            "lsh_max_bucket_size": self.lsh_max_bucket_size,
+            "vectorizer": vectorizer,
+            "similarity_mode": self.similarity_mode,
+            "memory_budget_mb": self.memory_budget_mb
+        }
+        try:
+            with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker, initargs=(config,)) as executor:
+                shard_results = list(executor.map(
+                    _analyze_shard, [take(new_knowledge, shard) for shard in shards]
+                ))
+        except Exception as e:
+            logger.error(f"多进程分片分析失败: {e}，改为在当前进程中分析")
+            return self.analyze(new_knowledge, top_k, per_chapter_k, chapter_key)
+        
+        # 合并各分片保留的知识点，按原顺序排列，权重使用工作进程的计算结果
+        weights = {}
+        for shard, (kept, shard_weights) in zip(shards, shard_results):
+            for i, weight in zip(kept, shard_weights):
+                weights[shard[i]] = weight
+        survivors = sorted(weights)
+        logger.info(f"分片去重后剩余{len(survivors)}条知识点")
+        
+        # 跨分片去重，只在各分片保留的知识点上进行
+        candidates = take(new_knowledge, survivors)
+        kept = self._duplicate_keep(candidates, vectorizer=vectorizer)
+        logger.info(f"跨分片去重后剩余{len(kept)}条知识点")
+        
+        result = self._sort_by_weight(take(candidates, kept), [weights[survivors[i]] for i in kept],
+                                      top_k, per_chapter_k, chapter_key)
+        if result:
+            logger.info(f"完成权重计算和排序，权重范围: {result[-1]['weight']:.2f} - {result[0]['weight']:.2f}")
+        
+        return result
+    
+    def _sort_by_weight(self, topics: List[Dict[str, Any]], weights, top_k: Optional[int] = None,
+                        per_chapter_k: Optional[int] = None,
+                        chapter_key: Optional[Callable[[Dict[str, Any]], str]] = None) -> List[Dict[str, Any]]:
+        """按权重降序排列知识点并加入权重，可选地先按章节保留per_chapter_k条，再保留前top_k条
+        
+        保留规则与流式分析一致，权重相同时保持原顺序。输入为KnowledgeBatch时按下标选取并写入权重列，
+        不逐条复制知识点。
+        
+        Args:
+            topics: 知识点列表或KnowledgeBatch
+            weights: 与topics一一对应的权重
+            top_k: 总共保留的知识点数量，None表示不限制
+            per_chapter_k: 每个章节保留的知识点数量，None表示不分章节
+            chapter_key: 确定知识点所属章节的函数
+            
+        Returns:
+            按权重排序的知识点，与输入类型相同
+        """
+        order = sorted(range(len(topics)), key=lambda i: -weights[i])
+        
+        if per_chapter_k is not None and chapter_key is None:
+            logger.warning("未指定章节归类函数，忽略per_chapter_k")
+            per_chapter_k = None
+        if per_chapter_k is not None:
+            counts = Counter()
+            selected = []
+            for i in order:
+                chapter = chapter_key(topics[i])
+                if counts[chapter] < per_chapter_k:
+                    counts[chapter] += 1
+                    selected.append(i)
+            order = selected
+        if top_k is not None:
+            order = order[:top_k]
+        
+        if isinstance(topics, KnowledgeBatch):
+            result = topics.take(order)
+            result.weights = array('d', (float(weights[i]) for i in order))
+            return result
+        return [with_weight(topics[i], float(weights[i])) for i in order]
+    
+    def _analyze_stream(self, topics: Iterable[Dict[str, Any]], top_k: Optional[int], per_chapter_k: Optional[int],
+                        chapter_key: Optional[Callable[[Dict[str, Any]], str]], chunk_size: int) -> List[Dict[str, Any]]:
+        """流式分析知识点，用有界最小堆只保留权重最高的知识点
+        
+        每次读取chunk_size条知识点，与当前保留的知识点一起去重，再批量计算新知识点的权重并放入堆中。
+        堆中元素为(权重, -序号, 章节, 知识点)，权重相同时先出现的优先保留，与非流式排序的顺序一致；
+        只有最终保留的知识点才复制并加入权重。去重在分块内进行，使用临时的特征缓存，
+        因此只能去除同一分块内或与已保留知识点重复的知识点。
+        
+        Args:
+            topics: 知识点迭代器
+            top_k: 总共保留的知识点数量，None表示不限制
+            per_chapter_k: 每个章节保留的知识点数量，None表示不分章节
+            chapter_key: 确定知识点所属章节的函数
+            chunk_size: 每次读取的知识点数量
+            
+        Returns:
+            按权重排序的知识点列表
+        """
+        if per_chapter_k is not None and chapter_key is None:
+            logger.warning("未指定章节归类函数，忽略per_chapter_k")
+            per_chapter_k = None
+        if per_chapter_k is None and top_k is None:
+            return self.analyze(list(topics))
+        
+        # 章节 -> 最小堆，不分章节时只有一个键为None的堆
+        limit = per_chapter_k if per_chapter_k is not None else top_k
+        heaps = {}
+        iterator = iter(topics)
+        total = 0
+        chunk_size = max(1, chunk_size)
+        
+        while True:
+            chunk = list(islice(iterator, chunk_size))
+            if not chunk:
+                break
+            
+            # 已保留的知识点按出现顺序排在新知识点之前，与非流式去重的比较顺序一致
+            retained = sorted((entry for heap in heaps.values() for entry in heap), key=lambda e: -e[1])
+            candidates = [entry[3] for entry in retained] + chunk
+            kept = self._duplicate_keep(candidates, store=FeatureStore())
+            
+            new_indices = [i - len(retained) for i in kept if i >= len(retained)]
+            new_topics = [chunk[i] for i in new_indices]
+            weights = self._calculate_weights(new_topics)
+            
+            heaps = {}
+            for i in kept:
+                if i < len(retained):
+                    self._push_bounded(heaps.setdefault(retained[i][2], []), retained[i], limit)
+            for index, topic, weight in zip(new_indices, new_topics, weights):
+                chapter = chapter_key(topic) if per_chapter_k is not None else None
+                entry = (float(weight), -(total + index), chapter, topic)
+                self._push_bounded(heaps.setdefault(chapter, []), entry, limit)
+            total += len(chunk)
         
+        # 按权重降序、出现顺序升序合并各堆，再取前top_k条
+        entries = sorted((entry for heap in heaps.values() for entry in heap), key=lambda e: (-e[0], -e[1]))
+        if top_k is not None:
+            entries = entries[:top_k]
+        result = [with_weight(entry[3], entry[0]) for entry in entries]
+        
+        logger.info(f"流式分析完成，共读取{total}条知识点，保留{len(result)}条")
+        if result:
+            logger.info(f"权重范围: {result[-1]['weight']:.2f} - {result[0]['weight']:.2f}")
         return result
     
+    @staticmethod
+    def _push_bounded(heap: List[Tuple], entry: Tuple, limit: int):
+        """将元素放入大小不超过limit的最小堆，堆满时只在新元素更大时替换堆顶
+        
+        Args:
+            heap: 最小堆
+            entry: (权重, -序号, 章节, 知识点)元组
+            limit: 堆的最大大小
+        """
+        if len(heap) < limit:
+            heapq.heappush(heap, entry)
+        elif limit > 0 and entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+    
     def _load_rules(self) -> Dict[str, float]:
         """加载预定义的权重规则
         
@@ -99,82 +399,135 @@ class TeachingAnalyzer:
         Returns:
             去重后的知识点列表
         """
+        return take(topics, self._duplicate_keep(topics, threshold))
+    
+    def _duplicate_keep(self, topics: List[Dict[str, Any]], threshold: float = 0.7,
+                        store: Optional[FeatureStore] = None, vectorizer=None) -> List[int]:
+        """基于TF-IDF相似度去重，返回保留的知识点下标
+        
+        Args:
+            topics: 知识点列表
+            threshold: 相似度阈值，超过此值视为重复
+            store: 特征缓存，默认使用共享的特征缓存
+            vectorizer: 向量化器，默认使用self.vectorizer
+            
+        Returns:
+            保留的知识点下标，按原顺序排列
+        """
         if not topics:
             return []
+        store = store or self.feature_store
+        
+        # 去重工具依赖numpy，导入耗时较长，在首次去重时才导入
+        from data_processing.dedup import exact_duplicate_keep, resolve_duplicates, similar_pairs
         
         # 提取文本内容
-        texts = [f"{topic.get('title', '')} {topic.get('content', '')}" for topic in topics]
+        texts = [store.text(topic) for topic in topics]
         
-        # 计算TF-IDF向量
+        # 先按文本哈希去除完全重复（含仅空白不同）的知识点，保留标题最长的，减少两两比较的规模
+        total = len(topics)
+        exact_kept = exact_duplicate_keep(
+            [store.normalized_text(topic) for topic in topics],
+            lambda i: len(topics[i].get('title', ''))
+        )
+        topics = take(topics, exact_kept)
+        texts = [texts[i] for i in exact_kept]
+        logger.info(f"精确去重: {total}条 -> {len(topics)}条")
+        
+        # 计算TF-IDF向量，找出相似度超过阈值的知识点对
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
-            # 计算余弦相似度
-            cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+            tfidf_matrix = store.tfidf(topics, vectorizer or self.vectorizer)
+            if self.lsh is not None:
+                pairs = self._lsh_duplicate_pairs(texts, tfidf_matrix, threshold)
+            else:
+                # 计算余弦相似度，大批量时分块计算，只保留超过阈值的知识点对
+                pairs = similar_pairs(tfidf_matrix, threshold, self.similarity_mode, self.memory_budget_mb)
         except Exception as e:
             logger.error(f"计算文本相似度时出错: {e}")
-            return topics
-        
-        # 标记要保留的索引
-        to_keep = set(range(len(topics)))
-        
-        # 检查每对文档
-        for i in range(len(topics)):
-            if i not in to_keep:
-                continue
-                
-            for j in range(i+1, len(topics)):
-                if j not in to_keep:
-                    continue
-                    
-                # 如果相似度超过阈值，移除权重较低的
-                if cosine_sim[i, j] > threshold:
-                    # 简单比较标题长度，假设更长的标题包含更多信息
-                    if len(topics[i].get('title', '')) < len(topics[j].get('title', '')):
-                        to_keep.discard(i)
-                    else:
-                        to_keep.discard(j)
+            return exact_kept
+        
+        # 如果相似度超过阈值，移除权重较低的
+        # 简单比较标题长度，假设更长的标题包含更多信息
+        kept = resolve_duplicates(
+            len(topics), pairs,
+            lambda i, j: len(topics[i].get('title', '')) < len(topics[j].get('title', ''))
+        )
+        logger.info(f"相似度去重: {len(topics)}条 -> {len(kept)}条")
         
         # 返回未被移除的主题
-        return [topics[i] for i in sorted(to_keep)]
+        return [exact_kept[i] for i in kept]
     
-    def _calculate_weight(self, topic: Dict[str, Any]) -> float:
-        """计算知识点的权重
+    def _lsh_duplicate_pairs(self, texts: List[str], tfidf_matrix, threshold: float) -> List[Tuple[int, int]]:
+        """通过MinHash/LSH检索候选对，只对候选对计算TF-IDF余弦相似度
         
         Args:
-            topic: 知识点字典
+            texts: 知识点文本列表
+            tfidf_matrix: 知识点的TF-IDF矩阵
+            threshold: 相似度阈值
             
         Returns:
-            计算得到的权重值
+            相似度超过阈值的知识点对，按(i, j)升序排列
         """
-        score = 0.0
-        base_score = 0.2  # 基础分
+        from data_processing.dedup import sparse_pair_similarity
         
-        # 合并标题和内容用于匹配
-        text = f"{topic.get('title', '')} {topic.get('content', '')}"
+        candidates = sorted(self.lsh.candidate_pairs(texts))
+        similarities = sparse_pair_similarity(tfidf_matrix, candidates)
+        return [pair for pair, sim in zip(candidates, similarities) if sim > threshold]
+    
+    def _calculate_weights(self, topics: List[Dict[str, Any]]) -> "np.ndarray":
+        """批量计算知识点的权重
+        
+        权重为基础分0.2加上命中规则的权重之和、来源加分和内容长度加分，截断到0.1至1.0之间。
+        规则得分由知识点×规则的命中矩阵乘以权重向量得到，来源和内容长度加分按列计算，
+        各项依次相加后统一截断。
+        
+        Args:
+            topics: 知识点列表
+            
+        Returns:
+            与topics一一对应的权重数组
+        """
+        import numpy as np
+        
+        if not topics:
+            return np.zeros(0)
+        
+        base_score = 0.2  # 基础分
         
         # 根据规则计算权重
-        for keyword, boost in self.weight_rules.items():
-            if re.search(rf'\b{re.escape(keyword)}\b', text, re.IGNORECASE):
-                score += boost
+        texts = [f"{topic.get('title', '')} {topic.get('content', '')}" for topic in topics]
+        score = self.rule_matcher.score_batch(texts)
         
-        # 考虑来源因素
-        source = topic.get('source', '').lower()
-        if 'textbook' in source or '教材' in source:
-            score += 0.3
-        elif 'paper' in source or '论文' in source:
-            score += 0.4
-        elif 'exam' in source or '考试' in source or '真题' in source:
-            score += 0.5
+        # 考虑来源因素，相同来源只判断一次；加0不改变得分
+        sources = [topic.get('source', '') for topic in topics]
+        bonus = {source: self._source_bonus(source) for source in set(sources)}
+        score = score + np.array([bonus[source] for source in sources])
         
-        # 考虑内容长度，假设更长的内容可能包含更多信息
-        content_length = len(topic.get('content', ''))
-        if content_length > 1000:
-            score += 0.2
-        elif content_length > 500:
-            score += 0.1
+        # 考虑内容长度
+        content_length = np.array([len(topic.get('content', '')) for topic in topics])
+        score = score + np.where(content_length > 1000, 0.2, np.where(content_length > 500, 0.1, 0.0))
         
         # 确保最终分数在合理范围内
-        return min(max(base_score + score, 0.1), 1.0)
+        return np.minimum(np.maximum(base_score + score, 0.1), 1.0)
+    
+    @staticmethod
+    def _source_bonus(source: str) -> float:
+        """计算来源加分
+        
+        Args:
+            source: 知识点来源
+            
+        Returns:
+            教材0.3，论文0.4，考试真题0.5，其他为0
+        """
+        source = source.lower()
+        if 'textbook' in source or '教材' in source:
+            return 0.3
+        elif 'paper' in source or '论文' in source:
+            return 0.4
+        elif 'exam' in source or '考试' in source or '真题' in source:
+            return 0.5
+        return 0.0
 
 
 # 测试代码
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+HTTP连接池模块
+为所有外部API接口提供共享的、支持长连接的HTTP会话
+"""
+
+import os
+import sys
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from config.settings import load_config
+
+logger = get_logger(__name__)
+
+# 进程内共享的会话，所有API接口复用同一个连接池
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(config: Optional[Dict[str, Any]] = None) -> requests.Session:
+    """根据配置创建带连接池的HTTP会话
+    
+    Args:
+        config: 配置字典，如果为None则加载默认配置
+    
+    Returns:
+        配置好的HTTP会话
+    """
+    config = config or load_config()
+    
+    pool_connections = config.get("http_pool_connections", 10)
+    pool_maxsize = config.get("http_pool_maxsize", 20)
+    pool_block = config.get("http_pool_block", True)
+    
+    # pool_connections为缓存的主机连接池数量，pool_maxsize为每个主机的最大连接数，
+    # pool_block为True时连接数达到上限后等待空闲连接，而不是临时新建连接
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    if not config.get("http_keep_alive", True):
+        session.headers["Connection"] = "close"
+    
+    logger.info(f"HTTP连接池初始化完成，主机连接池数: {pool_connections}，"
+                f"每主机最大连接数: {pool_maxsize}，长连接: {'开启' if config.get('http_keep_alive', True) else '关闭'}")
+    return session
+
+
+def get_session() -> requests.Session:
+    """获取进程内共享的HTTP会话，首次调用时创建
+    
+    Returns:
+        共享的HTTP会话
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def get_timeout(config: Optional[Dict[str, Any]] = None) -> Tuple[float, float]:
+    """获取HTTP请求的超时设置
+    
+    Args:
+        config: 配置字典，如果为None则加载默认配置
+    
+    Returns:
+        (连接超时, 读取超时)元组，单位为秒
+    """
+    config = config or load_config()
+    return config.get("http_connect_timeout", 5), config.get("http_read_timeout", 60)
+
+
+def close_session():
+    """关闭共享的HTTP会话，释放连接池中的连接"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# 测试代码
+if __name__ == "__main__":
+    session = get_session()
+    print(f"共享会话: {session is get_session()}")
+    print(f"超时设置: {get_timeout()}")
+    close_session()
@@ -9,12 +9,14 @@
 import os
 import sys
 import json
-import requests
-from typing import Dict, Any, List, Optional
+import threading
+from typing import Dict, Any, Optional, Iterator
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
+from api.http_client import get_session, get_timeout
+from utils.cache import SQLiteCache, LRUCache, make_cache_key
 from config.settings import load_config
 
 logger = get_logger(__name__)
@@ -22,11 +24,12 @@ logger = get_logger(__name__)
 class LLMAPI:
     """大模型API接口，用于获取知识补充"""
     
-    def __init__(self, model_name="GLM-4"):
+    def __init__(self, model_name="GLM-4", use_cache=None):
         """初始化大模型API接口
         
         Args:
             model_name: 模型名称，支持GLM-4、GPT-4等
+            use_cache: 是否启用响应缓存，None表示读取配置
         """
         self.model_name = model_name
         self.config = load_config()
@@ -37,38 +40,182 @@ class LLMAPI:
             "glm": self.config.get("glm_api_key", "")
         }
         
+        # 请求超时设置，连接复用共享的HTTP连接池
+        self.timeout = get_timeout(self.config)
+        
+        # 初始化两级响应缓存：内存LRU在前，磁盘SQLite在后
+        if use_cache is None:
+            use_cache = self.config.get("llm_cache_enabled", True)
+        self.memory_cache = None
+        self.disk_cache = None
+        if use_cache:
+            self.memory_cache = LRUCache(max_entries=self.config.get("llm_cache_memory_entries", 256))
+            try:
+                self.disk_cache = SQLiteCache(
+                    self.config.get("llm_cache_path", "cache/llm_cache.sqlite"),
+                    ttl=self.config.get("llm_cache_ttl", 604800),
+                    max_entries=self.config.get("llm_cache_max_entries", 5000)
+                )
+            except Exception as e:
+                logger.error(f"初始化大模型磁盘缓存失败: {e}，将只使用内存缓存")
+        
+        # 缓存统计
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "bytes_saved": 0}
+        self._stats_lock = threading.Lock()
+        
+        # 记录当前线程的调用是否退回了模拟数据，模拟数据不写入缓存
+        self._local = threading.local()
+        
         logger.info(f"大模型API接口初始化完成，使用模型: {model_name}")
     
-    def generate(self, prompt: str, max_tokens: int = 1000) -> str:
+    def generate(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7, use_cache: bool = True) -> str:
         """生成文本
         
         Args:
             prompt: 提示词
             max_tokens: 最大生成token数
+            temperature: 采样温度
+            use_cache: 本次调用是否使用响应缓存
             
         Returns:
             生成的文本
         """
         logger.info(f"开始生成文本，使用模型: {self.model_name}，提示词长度: {len(prompt)}")
         
+        # 优先读取缓存
+        cache_key = make_cache_key(self.model_name, prompt, max_tokens, temperature)
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                logger.info(f"命中大模型响应缓存，生成长度: {len(cached)}")
+                return cached
+        
+        self._local.mocked = False
+        
         # 根据不同模型调用不同的方法
         if "gpt" in self.model_name.lower():
-            response = self._call_openai(prompt, max_tokens)
+            response = self._call_openai(prompt, max_tokens, temperature)
         elif "glm" in self.model_name.lower():
-            response = self._call_glm(prompt, max_tokens)
+            response = self._call_glm(prompt, max_tokens, temperature)
         else:
             logger.warning(f"不支持的模型: {self.model_name}，将使用模拟数据")
             response = self._mock_response(prompt)
         
+        if use_cache and not self._local.mocked:
+            self._set_cached(cache_key, response)
+        
         logger.info(f"文本生成完成，生成长度: {len(response)}")
         return response
     
-    def _call_openai(self, prompt: str, max_tokens: int) -> str:
+    def generate_stream(self, prompt: str, max_tokens: int = 1000, temperature: float = 0.7,
+                        use_cache: bool = True) -> Iterator[str]:
+        """以流式方式生成文本，边生成边返回文本片段
+        
+        Args:
+            prompt: 提示词
+            max_tokens: 最大生成token数
+            temperature: 采样温度
+            use_cache: 本次调用是否使用响应缓存
+            
+        Yields:
+            生成的文本片段，拼接后与generate的返回值一致
+        """
+        logger.info(f"开始流式生成文本，使用模型: {self.model_name}，提示词长度: {len(prompt)}")
+        
+        # 命中缓存时一次性返回完整响应
+        cache_key = make_cache_key(self.model_name, prompt, max_tokens, temperature)
+        if use_cache:
+            cached = self._get_cached(cache_key)
+            if cached is not None:
+                logger.info(f"命中大模型响应缓存，生成长度: {len(cached)}")
+                yield cached
+                return
+        
+        self._local.mocked = False
+        
+        # 根据不同模型调用不同的方法
+        if "gpt" in self.model_name.lower():
+            chunks = self._stream_openai(prompt, max_tokens, temperature)
+        elif "glm" in self.model_name.lower():
+            chunks = self._stream_text(self._call_glm(prompt, max_tokens, temperature))
+        else:
+            logger.warning(f"不支持的模型: {self.model_name}，将使用模拟数据")
+            chunks = self._stream_text(self._mock_response(prompt))
+        
+        parts = []
+        for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+        
+        response = "".join(parts)
+        if use_cache and not self._local.mocked:
+            self._set_cached(cache_key, response)
+        
+        logger.info(f"流式文本生成完成，生成长度: {len(response)}")
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """获取响应缓存的统计信息
+        
+        Returns:
+            包含各级命中次数、未命中次数、命中率和节省字节数的字典
+        """
+        with self._stats_lock:
+            stats = dict(self._stats)
+        
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = hits / lookups if lookups else 0.0
+        stats["memory_entries"] = len(self.memory_cache) if self.memory_cache is not None else 0
+        return stats
+    
+    def _get_cached(self, cache_key: str) -> Optional[str]:
+        """依次查询内存缓存和磁盘缓存
+        
+        Args:
+            cache_key: 缓存键
+            
+        Returns:
+            缓存的响应文本，未命中时返回None
+        """
+        if self.memory_cache is None:
+            return None
+        
+        tier = "memory_hits"
+        response = self.memory_cache.get(cache_key)
+        if response is None and self.disk_cache is not None:
+            tier = "disk_hits"
+            response = self.disk_cache.get(cache_key)
+            if response is not None:
+                # 回填内存缓存
+                self.memory_cache.set(cache_key, response)
+        
+        with self._stats_lock:
+            if response is None:
+                self._stats["misses"] += 1
+            else:
+                self._stats[tier] += 1
+                self._stats["bytes_saved"] += len(response.encode('utf-8'))
+        return response
+    
+    def _set_cached(self, cache_key: str, response: str):
+        """将响应写入内存缓存和磁盘缓存
+        
+        Args:
+            cache_key: 缓存键
+            response: 响应文本
+        """
+        if self.memory_cache is not None:
+            self.memory_cache.set(cache_key, response)
+        if self.disk_cache is not None:
+            self.disk_cache.set(cache_key, response)
+    
+    def _call_openai(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> str:
         """调用OpenAI API
         
         Args:
             prompt: 提示词
             max_tokens: 最大生成token数
+            temperature: 采样温度
             
         Returns:
             生成的文本
@@ -96,11 +243,11 @@ class LLMAPI:
                     {"role": "user", "content": prompt}
                 ],
                 "max_tokens": max_tokens,
-                "temperature": 0.7
+                "temperature": temperature
             }
             
             # 发送请求
-            response = requests.post(api_url, headers=headers, json=data)
+            response = get_session().post(api_url, headers=headers, json=data, timeout=self.timeout)
             response.raise_for_status()
             result = response.json()
             
@@ -114,12 +261,91 @@ class LLMAPI:
             logger.error(f"调用OpenAI API失败: {e}")
             return self._mock_response(prompt)
     
-    def _call_glm(self, prompt: str, max_tokens: int) -> str:
+    def _stream_openai(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> Iterator[str]:
+        """以流式方式调用OpenAI API，逐条解析服务器推送事件(SSE)
+        
+        Args:
+            prompt: 提示词
+            max_tokens: 最大生成token数
+            temperature: 采样温度
+            
+        Yields:
+            生成的文本片段
+        """
+        api_key = self.api_keys.get("openai")
+        if not api_key:
+            logger.warning("未配置OpenAI API密钥，将使用模拟数据")
+            yield from self._stream_text(self._mock_response(prompt))
+            return
+        
+        received = False
+        try:
+            # OpenAI API的URL
+            api_url = "https://api.openai.com/v1/chat/completions"
+            
+            # 设置请求头和参数
+            headers = {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json"
+            }
+            
+            # 构建请求体
+            data = {
+                "model": "gpt-4" if "4" in self.model_name else "gpt-3.5-turbo",
+                "messages": [
+                    {"role": "system", "content": "你是一个专业的教育内容生成助手，擅长生成结构化的教学知识点。"},
+                    {"role": "user", "content": prompt}
+                ],
+                "max_tokens": max_tokens,
+                "temperature": temperature,
+                "stream": True
+            }
+            
+            # 发送请求
+            with get_session().post(api_url, headers=headers, json=data, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                response.encoding = "utf-8"
+                
+                for line in response.iter_lines(decode_unicode=True):
+                    # 只处理数据行，忽略注释和空行
+                    if not line or not line.startswith("data:"):
+                        continue
+                    
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    
+                    event = json.loads(payload)
+                    choices = event.get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        received = True
+                        yield delta
+        except Exception as e:
+            logger.error(f"流式调用OpenAI API失败: {e}")
+            # 不完整的响应不写入缓存
+            self._local.mocked = True
+            if not received:
+                yield from self._stream_text(self._mock_response(prompt))
+    
+    def _stream_text(self, text: str) -> Iterator[str]:
+        """将完整文本按行切分为流式片段，用于不支持流式输出的模型
+        
+        Args:
+            text: 完整文本
+            
+        Yields:
+            按行切分的文本片段
+        """
+        yield from text.splitlines(keepends=True)
+    
+    def _call_glm(self, prompt: str, max_tokens: int, temperature: float = 0.7) -> str:
         """调用智谱GLM API
         
         Args:
             prompt: 提示词
             max_tokens: 最大生成token数
+            temperature: 采样温度
             
         Returns:
             生成的文本
@@ -139,6 +365,7 @@ class LLMAPI:
             模拟的响应文本
         """
         logger.info("生成模拟响应")
+        self._local.mocked = True
         
         # 根据提示词中的关键词生成不同的模拟响应
         if "数据结构" in prompt:
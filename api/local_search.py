@@ -0,0 +1,190 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地搜索引擎模块
+基于倒排索引和BM25评分，在本地知识语料上离线检索
+"""
+
+import os
+import sys
+import json
+import math
+import heapq
+from collections import Counter
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.cache import resolve_cache_path
+from data_processing.local_dataset import DEFAULT_SOURCES, tokenize, load_dataset_documents
+
+logger = get_logger(__name__)
+
+# 索引格式版本，格式变化时递增以废弃旧索引
+INDEX_VERSION = 1
+
+
+class LocalSearchIndex:
+    """本地BM25搜索索引"""
+    
+    def __init__(self, index_path: str = "cache/local_search_index.json", sources: Optional[List[str]] = None,
+                 k1: float = 1.5, b: float = 0.75):
+        """初始化本地搜索索引，已保存的索引与语料一致时直接加载，否则重新构建
+        
+        Args:
+            index_path: 索引文件路径，相对路径以项目根目录为基准
+            sources: 语料文件路径列表
+            k1: BM25词频饱和参数
+            b: BM25文档长度归一化参数
+        """
+        self.index_path = resolve_cache_path(index_path)
+        self.sources = sources or DEFAULT_SOURCES
+        self.k1 = k1
+        self.b = b
+        
+        self.documents = []
+        self.postings = {}
+        self.doc_lengths = []
+        self.avg_doc_length = 0.0
+        self.idf = {}
+        
+        if not self._load():
+            self.build()
+            self.save()
+    
+    def build(self):
+        """从语料文件构建倒排索引"""
+        self.documents = load_dataset_documents(self.sources)
+        self.postings = {}
+        self.doc_lengths = []
+        
+        for doc_id, doc in enumerate(self.documents):
+            terms = Counter(tokenize(f"{doc['title']} {doc['content']}"))
+            self.doc_lengths.append(sum(terms.values()))
+            for term, tf in terms.items():
+                self.postings.setdefault(term, []).append([doc_id, tf])
+        
+        self._compute_statistics()
+        logger.info(f"本地搜索索引构建完成，共{len(self.documents)}篇文档，{len(self.postings)}个词项")
+    
+    def save(self) -> bool:
+        """保存索引到文件
+        
+        Returns:
+            是否保存成功
+        """
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "version": INDEX_VERSION,
+                    "signature": self._source_signature(),
+                    "documents": self.documents,
+                    "postings": self.postings,
+                    "doc_lengths": self.doc_lengths
+                }, f, ensure_ascii=False)
+            return True
+        except Exception as e:
+            logger.error(f"保存本地搜索索引失败: {e}")
+            return False
+    
+    def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
+        """检索与查询最相关的文档
+        
+        Args:
+            query: 搜索查询关键词
+            max_results: 最大返回结果数量
+        
+        Returns:
+            按BM25得分从高到低排列的搜索结果列表
+        """
+        scores = {}
+        for term in set(tokenize(query)):
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            
+            for doc_id, tf in self.postings[term]:
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / self.avg_doc_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        top = heapq.nlargest(max_results, scores.items(), key=lambda x: (x[1], -x[0]))
+        
+        results = []
+        for doc_id, score in top:
+            doc = self.documents[doc_id]
+            results.append({
+                "title": doc["title"],
+                "content": doc["content"],
+                "url": "",
+                "source": doc["source"],
+                "metadata": {
+                    "search_engine": "local",
+                    "query": query,
+                    "score": round(score, 4)
+                }
+            })
+        return results
+    
+    def _load(self) -> bool:
+        """加载已保存的索引，索引不存在、版本不符或语料已变化时返回False
+        
+        Returns:
+            是否加载成功
+        """
+        if not os.path.exists(self.index_path):
+            return False
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get("version") != INDEX_VERSION or data.get("signature") != self._source_signature():
+                logger.info("语料已变化，重新构建本地搜索索引")
+                return False
+            
+            self.documents = data["documents"]
+            self.postings = data["postings"]
+            self.doc_lengths = data["doc_lengths"]
+            self._compute_statistics()
+            logger.info(f"加载本地搜索索引: {self.index_path}，共{len(self.documents)}篇文档")
+            return True
+        except Exception as e:
+            logger.error(f"加载本地搜索索引失败: {e}")
+            return False
+    
+    def _compute_statistics(self):
+        """计算平均文档长度和各词项的IDF"""
+        total = len(self.doc_lengths)
+        self.avg_doc_length = (sum(self.doc_lengths) / total) if total else 0.0
+        self.idf = {
+            term: math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self.postings.items()
+        }
+    
+    def _source_signature(self) -> List[List[Any]]:
+        """根据语料文件的路径、大小和修改时间生成签名
+        
+        Returns:
+            签名列表
+        """
+        signature = []
+        for source in self.sources:
+            path = resolve_cache_path(source)
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature.append([source, stat.st_size, int(stat.st_mtime)])
+            else:
+                signature.append([source, None, None])
+        return signature
+
+
+# 测试代码
+if __name__ == "__main__":
+    index = LocalSearchIndex()
+    for result in index.search("最短路径 Dijkstra", max_results=3):
+        print(f"\n{result['title']} (得分: {result['metadata']['score']})")
+        print(f"来源: {result['source']}")
+        print(f"内容: {result['content'][:100]}...")
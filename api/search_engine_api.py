@@ -9,12 +9,15 @@
 import os
 import sys
 import json
-import requests
+import threading
 from typing import List, Dict, Any
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
+from api.http_client import get_session, get_timeout
+from api.local_search import LocalSearchIndex
+from utils.cache import SQLiteCache, make_cache_key
 from config.settings import load_config
 
 logger = get_logger(__name__)
@@ -22,11 +25,12 @@ logger = get_logger(__name__)
 class SearchEngineAPI:
     """搜索引擎API接口，用于获取最新的知识内容"""
     
-    def __init__(self, engine="bing"):
+    def __init__(self, engine="bing", use_cache=None):
         """初始化搜索引擎API接口
         
         Args:
-            engine: 搜索引擎名称，支持bing、google等
+            engine: 搜索引擎名称，支持bing、google以及离线的local等
+            use_cache: 是否启用持久化搜索缓存，None表示读取配置
         """
         self.engine = engine
         self.config = load_config()
@@ -37,6 +41,28 @@ class SearchEngineAPI:
             "google": self.config.get("google_search_key", "")
         }
         
+        # 本地搜索索引在首次使用时加载
+        self._local_index = None
+        # 批量检索时多个线程可能同时首次使用本地索引，只允许一个线程构建
+        self._local_index_lock = threading.Lock()
+        
+        # 请求超时设置，连接复用共享的HTTP连接池
+        self.timeout = get_timeout(self.config)
+        
+        # 初始化搜索结果缓存
+        if use_cache is None:
+            use_cache = self.config.get("search_cache_enabled", True)
+        self.cache = None
+        if use_cache:
+            try:
+                self.cache = SQLiteCache(
+                    self.config.get("search_cache_path", "cache/search_cache.sqlite"),
+                    ttl=self.config.get("search_cache_ttl", 86400),
+                    max_entries=self.config.get("search_cache_max_entries", 10000)
+                )
+            except Exception as e:
+                logger.error(f"初始化搜索缓存失败: {e}，将不使用缓存")
+        
         logger.info(f"搜索引擎API接口初始化完成，使用引擎: {engine}")
     
     def search(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
@@ -51,6 +77,20 @@ class SearchEngineAPI:
         """
         logger.info(f"开始搜索: {query}，最大结果数: {max_results}")
         
+        # 本地索引检索足够快，不经过缓存
+        if self.engine.lower() == "local":
+            results = self._search_local(query, max_results)
+            logger.info(f"搜索完成，获取到{len(results)}条结果")
+            return results
+        
+        # 优先读取缓存
+        cache_key = make_cache_key(self.engine.lower(), query, max_results)
+        if self.cache is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"命中搜索缓存，获取到{len(cached)}条结果")
+                return cached
+        
         # 根据不同搜索引擎调用不同的方法
         if self.engine.lower() == "bing":
             results = self._search_bing(query, max_results)
@@ -60,9 +100,29 @@ class SearchEngineAPI:
             logger.warning(f"不支持的搜索引擎: {self.engine}，将使用模拟数据")
             results = self._mock_search_results(query, max_results)
         
+        # 只缓存真实的搜索结果，模拟数据不写入缓存
+        if self.cache is not None and results and not any(r.get("source") == "mock_search" for r in results):
+            self.cache.set(cache_key, results)
+        
         logger.info(f"搜索完成，获取到{len(results)}条结果")
         return results
     
+    def cache_stats(self) -> Dict[str, Any]:
+        """获取搜索结果缓存的统计信息，与LLMAPI.cache_stats对应
+        
+        Returns:
+            包含命中次数、未命中次数、命中率、条目数和占用字节数的字典，未启用缓存时各项为0
+        """
+        empty = {"hits": 0, "misses": 0, "hit_rate": 0.0, "entries": 0, "bytes": 0}
+        if self.cache is None:
+            return empty
+        
+        try:
+            return self.cache.stats()
+        except Exception as e:
+            logger.error(f"读取搜索缓存统计失败: {e}")
+            return empty
+    
     def _search_bing(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """使用Bing搜索引擎搜索
         
@@ -87,7 +147,7 @@ class SearchEngineAPI:
             params = {"q": query, "count": max_results, "textDecorations": True, "textFormat": "HTML"}
             
             # 发送请求
-            response = requests.get(search_url, headers=headers, params=params)
+            response = get_session().get(search_url, headers=headers, params=params, timeout=self.timeout)
             response.raise_for_status()
             search_results = response.json()
             
@@ -111,6 +171,30 @@ class SearchEngineAPI:
             logger.error(f"Bing搜索失败: {e}")
             return self._mock_search_results(query, max_results)
     
+    def _search_local(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """使用本地BM25索引搜索，无需网络
+        
+        Args:
+            query: 搜索查询关键词
+            max_results: 最大返回结果数量
+            
+        Returns:
+            搜索结果列表
+        """
+        try:
+            if self._local_index is None:
+                with self._local_index_lock:
+                    # 等待锁期间其他线程可能已构建完成
+                    if self._local_index is None:
+                        self._local_index = LocalSearchIndex(
+                            index_path=self.config.get("local_search_index_path", "cache/local_search_index.json"),
+                            sources=self.config.get("local_search_sources")
+                        )
+            return self._local_index.search(query, max_results)
+        except Exception as e:
+            logger.error(f"本地搜索失败: {e}")
+            return self._mock_search_results(query, max_results)
+    
     def _search_google(self, query: str, max_results: int) -> List[Dict[str, Any]]:
         """使用Google搜索引擎搜索
         
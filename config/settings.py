@@ -18,7 +18,42 @@ load_dotenv()
 DEFAULT_CONFIG = {
     # API配置
     "llm_api": "GLM-4",  # 默认使用的大模型
-    "search_engine": "bing",  # 默认搜索引擎
+    "search_engine": "bing",  # 默认搜索引擎，可选bing、google、local（离线本地索引）
+    
+    # 检索配置
+    "concurrent_retrieval": True,  # 是否并发调用搜索引擎和大模型
+    "search_timeout": 10,  # 搜索引擎调用超时时间（秒）
+    "llm_timeout": 60,  # 大模型调用超时时间（秒）
+    "retrieval_concurrency": 8,  # 批量检索时的最大并发查询数
+    "compact_items": False,  # 是否以紧凑的KnowledgeItem/KnowledgeBatch代替字典在各智能体间传递知识点
+    
+    # HTTP连接池配置
+    "http_pool_connections": 10,  # 缓存的主机连接池数量
+    "http_pool_maxsize": 20,  # 每个主机的最大连接数
+    "http_pool_block": True,  # 连接数达到上限时是否等待空闲连接
+    "http_keep_alive": True,  # 是否使用长连接
+    "http_connect_timeout": 5,  # 连接超时时间（秒）
+    "http_read_timeout": 60,  # 读取超时时间（秒）
+    
+    # 搜索结果缓存配置
+    "search_cache_enabled": True,  # 是否启用搜索结果缓存
+    "search_cache_path": "cache/search_cache.sqlite",  # 缓存文件路径（相对项目根目录）
+    "search_cache_ttl": 86400,  # 缓存有效期（秒）
+    "search_cache_max_entries": 10000,  # 最大缓存条目数
+    
+    # 本地搜索引擎配置
+    "local_search_index_path": "cache/local_search_index.json",  # 索引文件路径（相对项目根目录）
+    "local_search_sources": [  # 建立索引的语料文件
+        "data/new_knowledge.json",
+        "实验数据集（数据结构知识点）.zip"
+    ],
+    
+    # 大模型响应缓存配置
+    "llm_cache_enabled": True,  # 是否启用大模型响应缓存
+    "llm_cache_path": "cache/llm_cache.sqlite",  # 磁盘缓存文件路径（相对项目根目录）
+    "llm_cache_ttl": 604800,  # 磁盘缓存有效期（秒）
+    "llm_cache_max_entries": 5000,  # 磁盘缓存最大条目数
+    "llm_cache_memory_entries": 256,  # 内存缓存最大条目数
     
     # 权重规则配置
     "weight_rules": {
@@ -45,7 +80,24 @@ DEFAULT_CONFIG = {
     # 系统配置
     "max_results": 20,  # 最大检索结果数
     "similarity_threshold": 0.7,  # 相似度阈值
+    "dedup_method": "tfidf",  # 知识点去重方式，tfidf为全量两两比较，lsh适用于大规模数据
+    "lsh_num_perm": 128,  # LSH去重的MinHash签名长度
+    "lsh_bands": 32,  # LSH去重的分段数，越大召回率越高
+    "lsh_max_bucket_size": 100,  # LSH桶内文档数上限，超过时只在相邻文档间组成候选对
+    "dedup_similarity": "auto",  # 相似度计算方式，dense为完整矩阵，blocked为分块稀疏计算（float32），auto按内存预算自动选择
+    "dedup_memory_budget_mb": 1024,  # 去重相似度计算的内存预算（MB）
+    "tfidf_mode": "batch",  # 去重的向量化方式，batch为每批重新拟合，reference为基于参考语料的固定词表，hashing为无状态哈希
+    "tfidf_vocabulary_path": "cache/tfidf_vocabulary.json",  # 参考语料词表文件路径（相对项目根目录）
+    "tfidf_vocabulary_max_features": 20000,  # 参考语料词表的最大词数
+    "hashing_n_features": 1048576,  # 哈希向量化的特征维数
+    "analyze_top_k": None,  # 只保留权重最高的知识点数量，None表示全部保留
+    "analyze_per_chapter_k": None,  # 每个章节只保留权重最高的知识点数量，None表示不限制
+    "analyze_chunk_size": 5000,  # 限制保留数量时流式分析每次读取的知识点数量
+    "analysis_workers": 1,  # 知识分析的进程数，大于1时按分片多进程分析，None表示使用全部CPU核心
+    "shard_by": "lsh",  # 多进程分析的分片方式，lsh按MinHash值分片，chapter按课程章节分片
+    "shard_min_items": 1000,  # 每个分片的最少知识点数量
     "output_dir": "output",  # 输出目录
+    "incremental_update": True,  # 是否只重新生成知识点有变化的章节
     
     # 模板配置
     "template_path": "data/data_struct.md"  # 课程模板路径
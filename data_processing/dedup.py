@@ -0,0 +1,397 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+去重工具模块
+提供精确重复检测、近似重复检测（MinHash/LSH）以及统一的去重保留策略
+"""
+
+import os
+import sys
+import heapq
+import hashlib
+from typing import List, Iterable, Tuple, Callable, Set, Any
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# k-gram哈希值的位数
+MAX_HASH = (1 << 32) - 1
+
+# 分块计算相似度时，每个相似度元素按此字节数估算内存（稀疏乘积的数据、索引和筛选时的临时数组）
+BLOCK_BYTES_PER_ENTRY = 32
+
+
+def resolve_duplicates(n: int, pairs: Iterable[Tuple[int, int]], drop_first: Callable[[int, int], bool]) -> List[int]:
+    """按照逐对比较的保留策略处理重复对
+    
+    与逐对遍历相似度矩阵的双重循环等价：pairs必须按(i, j)升序排列且满足i < j，
+    只需包含相似度超过阈值的对。外层文档i在开始比较时已被移除则跳过，
+    否则对仍保留的j调用drop_first决定移除i还是j。
+    
+    Args:
+        n: 文档总数
+        pairs: 相似度超过阈值的文档对
+        drop_first: 判断函数，返回True表示移除i，否则移除j
+    
+    Returns:
+        保留的文档索引列表，按原顺序排列
+    """
+    to_keep = [True] * n
+    current_i = -1
+    skip_i = False
+    
+    for i, j in pairs:
+        # 外层文档是否跳过只取决于它开始比较时的状态
+        if i != current_i:
+            current_i = i
+            skip_i = not to_keep[i]
+        if skip_i or not to_keep[j]:
+            continue
+        
+        if drop_first(i, j):
+            to_keep[i] = False
+        else:
+            to_keep[j] = False
+    
+    return [i for i in range(n) if to_keep[i]]
+
+
+def exact_duplicate_keep(texts: List[str], priority: Callable[[int], Any]) -> List[int]:
+    """按空白归一化后的文本哈希去除完全重复的文档
+    
+    文本去掉首尾空白并将连续空白合并为一个空格后计算blake2b摘要，摘要相同视为重复。
+    每组重复文档只保留priority最大的一个，相同时保留最靠前的。
+    
+    Args:
+        texts: 文档文本列表
+        priority: 根据文档索引返回保留优先级的函数
+    
+    Returns:
+        保留的文档索引列表，按原顺序排列
+    """
+    best = {}
+    for i, text in enumerate(texts):
+        digest = hashlib.blake2b(' '.join(text.split()).encode('utf-8'), digest_size=16).digest()
+        kept = best.get(digest)
+        if kept is None or priority(i) > priority(kept):
+            best[digest] = i
+    return sorted(best.values())
+
+
+def pairs_above_threshold(similarity, threshold: float) -> List[Tuple[int, int]]:
+    """从稠密相似度矩阵中取出上三角超过阈值的文档对
+    
+    Args:
+        similarity: n×n相似度矩阵
+        threshold: 相似度阈值
+    
+    Returns:
+        按(i, j)升序排列的文档对列表
+    """
+    mask = np.triu(np.asarray(similarity) > threshold, k=1)
+    return [(int(i), int(j)) for i, j in np.argwhere(mask)]
+
+
+def thresholded_similarity(matrix, threshold: float, memory_budget_mb: float = 1024, dtype=np.float32):
+    """分块计算余弦相似度，只保留上三角中超过阈值的元素
+    
+    每次取若干行与其后所有行做稀疏矩阵乘法，块的行数按内存预算确定，
+    块内结果筛选后即释放，不生成n×n的稠密矩阵。
+    
+    Args:
+        matrix: 行已L2归一化的稀疏矩阵（如TF-IDF矩阵）
+        threshold: 相似度阈值
+        memory_budget_mb: 单个块的内存预算（MB）
+        dtype: 计算使用的数据类型，默认float32以减少内存
+    
+    Returns:
+        n×n的稀疏矩阵（CSR格式），只包含i < j且相似度超过阈值的元素
+    """
+    from scipy.sparse import csr_matrix
+    
+    matrix = csr_matrix(matrix, dtype=dtype)
+    n = matrix.shape[0]
+    block_rows = max(1, int(memory_budget_mb * 1024 * 1024 // (max(n, 1) * BLOCK_BYTES_PER_ENTRY)))
+    
+    rows, cols, values = [], [], []
+    for start in range(0, n, block_rows):
+        # 只需计算当前块与其后各行的相似度
+        block = (matrix[start:start + block_rows] @ matrix[start:].T).tocoo()
+        mask = (block.col > block.row) & (block.data > threshold)
+        rows.append(block.row[mask] + start)
+        cols.append(block.col[mask] + start)
+        values.append(block.data[mask])
+        del block, mask
+    
+    if not rows:
+        return csr_matrix((n, n), dtype=dtype)
+    
+    result = csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))), shape=(n, n))
+    result.sort_indices()
+    return result
+
+
+def similar_pairs(matrix, threshold: float, mode: str = "auto", memory_budget_mb: float = 1024) -> List[Tuple[int, int]]:
+    """找出余弦相似度超过阈值的文档对
+    
+    Args:
+        matrix: 行已L2归一化的稀疏矩阵（如TF-IDF矩阵）
+        threshold: 相似度阈值
+        mode: dense为计算完整的float64相似度矩阵，blocked为分块计算float32相似度，
+            auto在完整矩阵不超过内存预算时使用dense，否则使用blocked
+        memory_budget_mb: 内存预算（MB）
+    
+    Returns:
+        按(i, j)升序排列的文档对列表
+    """
+    n = matrix.shape[0]
+    if mode == "dense" or (mode == "auto" and n * n * 8 <= memory_budget_mb * 1024 * 1024):
+        from sklearn.metrics.pairwise import cosine_similarity
+        return pairs_above_threshold(cosine_similarity(matrix, matrix), threshold)
+    
+    logger.info(f"分块计算{n}条文档的相似度，内存预算: {memory_budget_mb}MB")
+    similarity = thresholded_similarity(matrix, threshold, memory_budget_mb).tocoo()
+    return list(zip(similarity.row.tolist(), similarity.col.tolist()))
+
+
+def sparse_pair_similarity(matrix, pairs: List[Tuple[int, int]], batch_size: int = 100000) -> np.ndarray:
+    """计算指定文档对之间的余弦相似度
+    
+    Args:
+        matrix: 行已L2归一化的稀疏矩阵（如TF-IDF矩阵）
+        pairs: 文档对列表
+        batch_size: 每批计算的文档对数量
+    
+    Returns:
+        与pairs对应的相似度数组
+    """
+    if not pairs:
+        return np.zeros(0)
+    
+    index = np.asarray(pairs, dtype=np.int64)
+    result = np.empty(len(index))
+    for start in range(0, len(index), batch_size):
+        batch = index[start:start + batch_size]
+        rows = matrix[batch[:, 0]].multiply(matrix[batch[:, 1]])
+        result[start:start + batch_size] = np.asarray(rows.sum(axis=1)).ravel()
+    return result
+
+
+class MinHashLSH:
+    """基于MinHash签名和分段局部敏感哈希的近似重复候选检索
+    
+    签名采用单次排列MinHash（one permutation hashing）：每个k-gram只哈希一次，
+    按哈希值分到num_perm个桶中各取最小值，空桶从右侧最近的非空桶借值（旋转致密化），
+    计算量与文本总长度成线性关系，而不是与num_perm成倍数关系。
+    """
+    
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 3, seed: int = 42,
+                 max_bucket_size: int = 100):
+        """初始化MinHash/LSH
+        
+        签名被分为bands段，每段rows=num_perm/bands行，两篇文档在任一段完全一致即成为候选对。
+        Jaccard相似度约为(1/bands)^(1/rows)时被召回的概率为50%，
+        增加bands提高召回率，增加rows提高精确率。
+        
+        Args:
+            num_perm: MinHash签名长度
+            bands: LSH分段数，必须整除num_perm
+            shingle_size: 字符k-gram的长度，中文文本按字符切分更稳定
+            seed: 随机种子，保证签名可复现
+            max_bucket_size: 桶内文档数超过该值时，每篇文档只与桶内排在其后的max_bucket_size-1篇组成候选对，
+                避免大量模板化文本落入同一个桶时候选对数量按平方增长
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"num_perm({num_perm})必须能被bands({bands})整除")
+        
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.max_bucket_size = max(2, max_bucket_size)
+        
+        # 乘移位哈希 h(x) = (a*x + b) >> 32 的随机参数，a为奇数
+        rng = np.random.RandomState(seed)
+        self._a = np.uint64(rng.randint(0, np.iinfo(np.int64).max, dtype=np.int64)) | np.uint64(1)
+        self._b = np.uint64(rng.randint(0, np.iinfo(np.int64).max, dtype=np.int64))
+        # 各段签名合并为桶键时使用的随机系数
+        self._band_coef = rng.randint(0, np.iinfo(np.int64).max, size=self.rows, dtype=np.int64).astype(np.uint64) | np.uint64(1)
+    
+    def signatures(self, texts: List[str]) -> np.ndarray:
+        """计算一批文本的MinHash签名
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            形状为(len(texts), num_perm)的uint64签名矩阵
+        """
+        n, m = len(texts), self.num_perm
+        if not n:
+            return np.zeros((0, m), dtype=np.uint64)
+        
+        shingles, counts = self._shingle_hashes(texts)
+        
+        # uint64运算按2^64自然回绕，取高32位作为哈希值
+        hashed = (self._a * shingles + self._b) >> np.uint64(32)
+        bins = (hashed % np.uint64(m)).astype(np.int64)
+        values = hashed // np.uint64(m)
+        
+        # 每篇文档每个桶内的最小哈希值
+        empty = np.iinfo(np.uint64).max
+        signature = np.full(n * m, empty, dtype=np.uint64)
+        doc_ids = np.repeat(np.arange(n, dtype=np.int64), counts)
+        np.minimum.at(signature, doc_ids * m + bins, values)
+        signature = signature.reshape(n, m)
+        
+        # 旋转致密化：空桶取右侧（循环）最近非空桶的值，并按距离加上偏移以区分借来的值
+        filled = signature != empty
+        if not filled.all():
+            doubled = np.concatenate([signature, signature], axis=1)
+            positions = np.where(np.concatenate([filled, filled], axis=1), np.arange(2 * m), 2 * m)
+            nearest = np.minimum.accumulate(positions[:, ::-1], axis=1)[:, ::-1][:, :m]
+            distance = (nearest - np.arange(m)).astype(np.uint64)
+            offset = np.uint64(((1 << 32) // m) + 1)
+            borrowed = np.take_along_axis(doubled, nearest, axis=1) + distance * offset
+            signature = np.where(filled, signature, borrowed)
+        
+        return signature
+    
+    def band_keys(self, signature: np.ndarray) -> np.ndarray:
+        """将签名按段合并为桶键
+        
+        Args:
+            signature: MinHash签名矩阵
+        
+        Returns:
+            形状为(文档数, bands)的uint64桶键矩阵
+        """
+        # 每段取间隔为bands的列，避免致密化产生的相邻相同值集中在同一段内
+        segments = signature.reshape(len(signature), self.rows, self.bands)
+        return (segments * self._band_coef[:, None]).sum(axis=1, dtype=np.uint64)
+    
+    def candidate_pairs(self, texts: List[str]) -> Set[Tuple[int, int]]:
+        """找出可能为近似重复的文档对
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            满足i < j的候选文档对集合
+        """
+        keys = self.band_keys(self.signatures(texts))
+        candidates = set()
+        oversized = 0
+        window = self.max_bucket_size
+        
+        for band in range(self.bands):
+            # 按桶键排序后，相同键的文档相邻，只展开包含多篇文档的桶
+            order = np.argsort(keys[:, band], kind="stable")
+            sorted_keys = keys[order, band]
+            same = sorted_keys[1:] == sorted_keys[:-1]
+            if not same.any():
+                continue
+            
+            boundaries = np.flatnonzero(np.diff(np.concatenate(([False], same, [False])).astype(np.int8)))
+            for start, end in zip(boundaries[::2], boundaries[1::2]):
+                members = sorted(int(i) for i in order[start:end + 1])
+                # 过大的桶只在相邻的window篇文档内组成候选对，候选对数量与桶大小成线性关系
+                if len(members) > window:
+                    oversized += 1
+                for x in range(len(members)):
+                    for y in range(x + 1, min(x + window, len(members))):
+                        candidates.add((members[x], members[y]))
+        
+        if oversized:
+            logger.warning(f"{oversized}个LSH桶超过{window}篇文档，只在相邻文档间组成候选对")
+        logger.info(f"LSH候选检索完成，{len(texts)}篇文档产生{len(candidates)}个候选对")
+        return candidates
+    
+    def _shingle_hashes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """计算所有文本的字符k-gram哈希值
+        
+        所有文本的k-gram哈希拼接为一个数组，每篇文本对应其中连续的一段。
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            (k-gram哈希数组, 每篇文本的k-gram数量)元组
+        """
+        k = self.shingle_size
+        # 不足k个字符的文本补齐空格，保证每篇文本至少有一个k-gram
+        codes = [np.frombuffer(text.ljust(k).encode('utf-32-le'), dtype=np.uint32) for text in texts]
+        lengths = np.array([len(c) for c in codes], dtype=np.int64)
+        joined = np.concatenate(codes).astype(np.uint64)
+        
+        # 多项式滚动哈希，结果保留低32位
+        count = len(joined) - k + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(k):
+            hashes = (hashes * np.uint64(1000003) + joined[offset:offset + count]) & np.uint64(MAX_HASH)
+        
+        # 去掉跨越两篇文本边界的k-gram
+        text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        valid = np.ones(count, dtype=bool)
+        for shift in range(1, k):
+            boundary = text_starts[1:] - shift
+            valid[boundary[boundary >= 0]] = False
+        return hashes[valid], lengths - k + 1
+
+
+def minhash_keys(texts: List[str], shingle_size: int = 3, seed: int = 42) -> np.ndarray:
+    """计算每篇文本的单个MinHash值，用作分片键
+    
+    两篇文本的键相同的概率等于它们字符k-gram集合的Jaccard相似度，完全相同的文本键一定相同。
+    
+    Args:
+        texts: 文本列表
+        shingle_size: 字符k-gram的长度
+        seed: 随机种子
+    
+    Returns:
+        uint64键数组
+    """
+    return MinHashLSH(num_perm=1, bands=1, shingle_size=shingle_size, seed=seed).signatures(texts)[:, 0]
+
+
+def shard_partition(keys: Iterable[Any], num_shards: int) -> List[List[int]]:
+    """按键将文档划分为若干分片，键相同的文档在同一分片
+    
+    各组按文档数从多到少依次分给当前文档数最少的分片，使各分片大小接近。
+    
+    Args:
+        keys: 每篇文档的分片键
+        num_shards: 分片数
+    
+    Returns:
+        分片列表，每个分片为按原顺序排列的文档索引，不含空分片
+    """
+    groups = {}
+    for i, key in enumerate(keys):
+        groups.setdefault(key, []).append(i)
+    
+    shards = [[] for _ in range(max(1, num_shards))]
+    loads = [(0, s) for s in range(len(shards))]
+    for members in sorted(groups.values(), key=len, reverse=True):
+        load, s = heapq.heappop(loads)
+        shards[s].extend(members)
+        heapq.heappush(loads, (load + len(members), s))
+    return [sorted(shard) for shard in shards if shard]
+
+
+# 测试代码
+if __name__ == "__main__":
+    texts = [
+        "最小生成树是连通加权无向图中一棵权值最小的生成树。",
+        "最小生成树是连通加权无向图中一棵权值最小的生成树",
+        "快速排序是一种分治策略的排序算法。",
+    ]
+    lsh = MinHashLSH()
+    print(f"候选对: {sorted(lsh.candidate_pairs(texts))}")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+jieba词典缓存模块
+将jieba默认词典与领域自定义词汇合并后的前缀词典缓存到本地，启动时一次性加载
+"""
+
+import os
+import sys
+import marshal
+import tempfile
+from typing import List, Tuple, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.cache import make_cache_key, resolve_cache_path
+
+logger = get_logger(__name__)
+
+# 缓存格式版本，缓存内容的构建方式变化时递增
+CACHE_VERSION = 1
+
+# 当前进程中已加载的词典缓存键，避免重复加载或重复添加自定义词汇
+_loaded_key = None
+
+
+def _dictionary_signature(tokenizer) -> List:
+    """根据jieba主词典文件的路径、大小和修改时间生成签名
+    
+    Args:
+        tokenizer: jieba分词器
+    
+    Returns:
+        签名列表
+    """
+    import jieba
+    
+    path = tokenizer.dictionary or os.path.join(os.path.dirname(jieba.__file__), jieba.DEFAULT_DICT_NAME)
+    try:
+        stat = os.stat(path)
+        return [path, stat.st_size, stat.st_mtime_ns]
+    except OSError:
+        return [path, None, None]
+
+
+def load_jieba_dictionary(custom_words: List[Tuple[str, int]], cache_dir: str = "cache") -> Optional[str]:
+    """加载包含自定义词汇的jieba词典
+    
+    缓存键由缓存版本、jieba版本、主词典签名和自定义词汇共同决定，任一变化都会重新构建。
+    缓存命中时直接载入前缀词典，不再构建默认词典和逐个添加词汇；
+    未命中时按jieba.add_word的方式添加词汇并写入缓存。同一进程中重复调用不会重复添加词汇。
+    
+    Args:
+        custom_words: (词汇, 词频)列表
+        cache_dir: 缓存目录，相对路径以项目根目录为基准
+    
+    Returns:
+        缓存文件路径，未使用缓存时返回None
+    """
+    global _loaded_key
+    import jieba
+    
+    tokenizer = jieba.dt
+    key = make_cache_key(CACHE_VERSION, jieba.__version__, _dictionary_signature(tokenizer), custom_words)
+    if _loaded_key == key:
+        return None
+    
+    cache_path = resolve_cache_path(os.path.join(cache_dir, f"jieba_dict_{key[:16]}.marshal"))
+    
+    # 分词器已初始化时（如已被其他模块使用），前缀词典可能已变化，只能逐个添加词汇
+    pristine = not tokenizer.initialized
+    if pristine and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                tokenizer.FREQ, tokenizer.total = marshal.load(f)
+            tokenizer.initialized = True
+            _loaded_key = key
+            logger.info(f"从缓存加载jieba词典: {cache_path}")
+            return cache_path
+        except Exception as e:
+            logger.error(f"加载jieba词典缓存失败: {e}，将重新构建")
+    
+    for word, freq in custom_words:
+        jieba.add_word(word, freq=freq)
+    _loaded_key = key
+    
+    if not pristine:
+        return None
+    
+    # 写入临时文件后替换，避免其他进程读到不完整的缓存
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+        with os.fdopen(fd, 'wb') as f:
+            marshal.dump((tokenizer.FREQ, tokenizer.total), f)
+        os.replace(temp_path, cache_path)
+        logger.info(f"jieba词典缓存已保存: {cache_path}")
+        return cache_path
+    except Exception as e:
+        logger.error(f"保存jieba词典缓存失败: {e}")
+        return None
+
+
+# 测试代码
+if __name__ == "__main__":
+    import time
+    
+    start = time.perf_counter()
+    path = load_jieba_dictionary([("最小生成树", 100), ("考研真题", 200)])
+    print(f"加载耗时: {time.perf_counter() - start:.3f}秒，缓存文件: {path}")
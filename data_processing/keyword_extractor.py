@@ -8,30 +8,64 @@
 
 import os
 import sys
-import re
-import jieba
-import jieba.analyse
-from typing import List, Dict, Any, Tuple
-from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from typing import List, Dict, Any, Tuple, Optional
+from collections import defaultdict
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
+from data_processing.jieba_dict import load_jieba_dictionary
+from utils.feature_store import FeatureStore
 
 logger = get_logger(__name__)
 
+# _score_tfidf和_score_textrank按该版本jieba的extract_tags和textrank实现，依赖其内部属性；
+# 其他版本的jieba不复用分词结果，直接调用公开接口
+JIEBA_TESTED_VERSION = "0.42.1"
+
+# 进程池中每个工作进程各自持有的关键词提取器
+_worker_extractor = None
+
+
+def _init_worker(topk: int, allow_pos: Tuple[str, ...]):
+    """工作进程初始化，加载停用词和自定义词典
+    
+    Args:
+        topk: 提取的关键词数量
+        allow_pos: 允许的词性
+    """
+    global _worker_extractor
+    _worker_extractor = KeywordExtractor(topk=topk, allow_pos=allow_pos)
+
+
+def _extract_in_worker(text: str) -> List[Tuple[str, float]]:
+    """在工作进程中提取单条文本的关键词
+    
+    Args:
+        text: 待提取关键词的文本
+    
+    Returns:
+        关键词列表
+    """
+    return _worker_extractor._extract_text(text)
+
+
 class KeywordExtractor:
     """关键词提取器，负责从文本中提取重要关键词"""
     
-    def __init__(self, topk=20, allow_pos=('n', 'vn', 'v', 'nr', 'ns')):
+    def __init__(self, topk=20, allow_pos=('n', 'vn', 'v', 'nr', 'ns'), feature_store=None):
         """初始化关键词提取器
         
         Args:
             topk: 提取的关键词数量
             allow_pos: 允许的词性，默认为名词、动名词、动词、人名、地名
+            feature_store: 各智能体共享的特征缓存，默认使用独立的缓存
         """
         self.topk = topk
         self.allow_pos = allow_pos
+        self.feature_store = feature_store or FeatureStore()
         
         # 加载停用词
         self.stopwords = self._load_stopwords()
@@ -55,57 +89,140 @@ class KeywordExtractor:
         
         logger.info(f"开始提取关键词，文本长度: {len(text)}")
         
-        # 使用TF-IDF算法提取关键词
-        tfidf_keywords = self._extract_by_tfidf(text)
-        
-        # 使用TextRank算法提取关键词
-        textrank_keywords = self._extract_by_textrank(text)
-        
-        # 合并结果并去重
-        merged_keywords = self._merge_keywords(tfidf_keywords, textrank_keywords)
+        merged_keywords = self._extract_text(text)
         
         logger.info(f"关键词提取完成，共提取{len(merged_keywords)}个关键词")
         return merged_keywords
     
-    def extract_from_items(self, items: List[Dict[str, Any]], key="content") -> Dict[str, List[Tuple[str, float]]]:
+    def extract_from_items(self, items: List[Dict[str, Any]], key="content",
+                           workers: Optional[int] = 1, chunksize: int = 64) -> Dict[str, List[Tuple[str, float]]]:
         """从多个文本项中提取关键词
         
         Args:
             items: 文本项列表，每个元素为字典格式
             key: 字典中文本内容的键名
+            workers: 进程数，1表示在当前进程中逐条提取，None表示使用全部CPU核心
+            chunksize: 多进程时每次分发给工作进程的文本数量
             
         Returns:
             文本ID到关键词列表的映射
         """
-        results = {}
-        
+        ids = []
+        texts = []
+        text_items = []
         for i, item in enumerate(items):
-            item_id = item.get("id", str(i))
             text = item.get(key, "")
-            
             if text:
-                keywords = self.extract(text)
-                results[item_id] = keywords
+                ids.append(item.get("id", str(i)))
+                texts.append(text)
+                text_items.append(item)
         
+        # 在当前进程中提取标题或内容时，分词结果存入特征缓存，同一知识点只分词一次
+        if workers == 1 and key in ("title", "content") and self.allow_pos:
+            import jieba.posseg
+            
+            results = []
+            for item, text in zip(text_items, texts):
+                if len(text) < 10:
+                    results.append([])
+                    continue
+                words = self.feature_store.get(item, f"pos_tokens:{key}", lambda x: tuple(jieba.posseg.dt.cut(text)))
+                results.append(self._extract_text(text, words))
+            return dict(zip(ids, results))
+        
+        return dict(zip(ids, self.extract_batch(texts, workers=workers, chunksize=chunksize)))
+    
+    def extract_batch(self, texts: List[str], workers: Optional[int] = 1, chunksize: int = 64) -> List[List[Tuple[str, float]]]:
+        """批量提取关键词，每条文本的结果与extract相同
+        
+        jieba分词受GIL限制，多进程时每个工作进程各自加载词典，按块分发文本。
+        
+        Args:
+            texts: 待提取关键词的文本列表
+            workers: 进程数，1表示在当前进程中逐条提取，None表示使用全部CPU核心
+            chunksize: 多进程时每次分发给工作进程的文本数量
+        
+        Returns:
+            与texts一一对应的关键词列表
+        """
+        # 过短的文本不提取，与extract保持一致
+        pending = [i for i, text in enumerate(texts) if text and len(text) >= 10]
+        results = [[] for _ in texts]
+        
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, max(1, len(pending) // chunksize))
+        logger.info(f"开始批量提取关键词，共{len(pending)}条文本，进程数: {workers}")
+        
+        if workers <= 1:
+            for i in pending:
+                results[i] = self._extract_text(texts[i])
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                         initargs=(self.topk, self.allow_pos)) as executor:
+                    extracted = executor.map(_extract_in_worker, [texts[i] for i in pending], chunksize=chunksize)
+                    for i, keywords in zip(pending, extracted):
+                        results[i] = keywords
+            except Exception as e:
+                logger.error(f"多进程提取关键词失败: {e}，改为在当前进程中提取")
+                for i in pending:
+                    results[i] = self._extract_text(texts[i])
+        
+        logger.info("批量关键词提取完成")
         return results
     
-    def _extract_by_tfidf(self, text: str) -> List[Tuple[str, float]]:
+    def _extract_text(self, text: str, words: Optional[Tuple] = None) -> List[Tuple[str, float]]:
+        """对文本分词一次，TF-IDF和TextRank两种算法共享分词结果
+        
+        Args:
+            text: 待提取关键词的文本
+            words: 已有的词性标注分词结果，为None时对文本分词
+            
+        Returns:
+            合并后的关键词列表
+        """
+        # jieba的分析模块导入时需要加载IDF词典，延迟到首次提取时导入
+        import jieba
+        import jieba.posseg
+        
+        # 两种算法在指定词性时都使用jieba.posseg分词，结果相同，只需分词一次
+        if jieba.__version__ != JIEBA_TESTED_VERSION:
+            words = None
+        elif words is None and self.allow_pos:
+            words = tuple(jieba.posseg.dt.cut(text))
+        
+        # 使用TF-IDF算法提取关键词
+        tfidf_keywords = self._extract_by_tfidf(text, words)
+        
+        # 使用TextRank算法提取关键词
+        textrank_keywords = self._extract_by_textrank(text, words)
+        
+        # 合并结果并去重
+        return self._merge_keywords(tfidf_keywords, textrank_keywords)
+    
+    def _extract_by_tfidf(self, text: str, words: Optional[Tuple] = None) -> List[Tuple[str, float]]:
         """使用TF-IDF算法提取关键词
         
         Args:
             text: 待提取关键词的文本
+            words: 已有的词性标注分词结果，为None时由jieba重新分词
             
         Returns:
             关键词列表，每个元素为(关键词, 权重)元组
         """
+        import jieba.analyse
+        
         try:
-            # 使用jieba的TF-IDF算法提取关键词
-            keywords = jieba.analyse.extract_tags(
-                text,
-                topK=self.topk,
-                withWeight=True,
-                allowPOS=self.allow_pos
-            )
+            if words is None:
+                # 使用jieba的TF-IDF算法提取关键词
+                keywords = jieba.analyse.extract_tags(
+                    text,
+                    topK=self.topk,
+                    withWeight=True,
+                    allowPOS=self.allow_pos
+                )
+            else:
+                keywords = self._score_tfidf(words)
             
             # 过滤停用词
             filtered_keywords = [(word, weight) for word, weight in keywords if word not in self.stopwords]
@@ -115,23 +232,29 @@ class KeywordExtractor:
             logger.error(f"TF-IDF提取关键词失败: {e}")
             return []
     
-    def _extract_by_textrank(self, text: str) -> List[Tuple[str, float]]:
+    def _extract_by_textrank(self, text: str, words: Optional[Tuple] = None) -> List[Tuple[str, float]]:
         """使用TextRank算法提取关键词
         
         Args:
             text: 待提取关键词的文本
+            words: 已有的词性标注分词结果，为None时由jieba重新分词
             
         Returns:
             关键词列表，每个元素为(关键词, 权重)元组
         """
+        import jieba.analyse
+        
         try:
-            # 使用jieba的TextRank算法提取关键词
-            keywords = jieba.analyse.textrank(
-                text,
-                topK=self.topk,
-                withWeight=True,
-                allowPOS=self.allow_pos
-            )
+            if words is None:
+                # 使用jieba的TextRank算法提取关键词
+                keywords = jieba.analyse.textrank(
+                    text,
+                    topK=self.topk,
+                    withWeight=True,
+                    allowPOS=self.allow_pos
+                )
+            else:
+                keywords = self._score_textrank(words)
             
             # 过滤停用词
             filtered_keywords = [(word, weight) for word, weight in keywords if word not in self.stopwords]
@@ -141,6 +264,72 @@ class KeywordExtractor:
             logger.error(f"TextRank提取关键词失败: {e}")
             return []
     
+    def _score_tfidf(self, words: Tuple) -> List[Tuple[str, float]]:
+        """在已有分词结果上计算TF-IDF关键词，与jieba.analyse.extract_tags的计算过程一致
+        
+        Args:
+            words: 词性标注分词结果
+        
+        Returns:
+            按权重降序排列的(关键词, 权重)列表
+        """
+        import jieba.analyse
+        
+        tfidf = jieba.analyse.default_tfidf
+        allow_pos = frozenset(self.allow_pos)
+        
+        freq = {}
+        for w in words:
+            if w.flag not in allow_pos:
+                continue
+            word = w.word
+            if len(word.strip()) < 2 or word.lower() in tfidf.stop_words:
+                continue
+            freq[word] = freq.get(word, 0.0) + 1.0
+        
+        total = sum(freq.values())
+        for word in freq:
+            freq[word] *= tfidf.idf_freq.get(word, tfidf.median_idf) / total
+        
+        tags = sorted(freq.items(), key=itemgetter(1), reverse=True)
+        return tags[:self.topk] if self.topk else tags
+    
+    def _score_textrank(self, words: Tuple) -> List[Tuple[str, float]]:
+        """在已有分词结果上计算TextRank关键词，与jieba.analyse.textrank的计算过程一致
+        
+        Args:
+            words: 词性标注分词结果
+        
+        Returns:
+            按权重降序排列的(关键词, 权重)列表
+        """
+        import jieba.analyse
+        from jieba.analyse.textrank import UndirectWeightedGraph
+        
+        textrank = jieba.analyse.default_textrank
+        allow_pos = frozenset(self.allow_pos)
+        
+        def pair_filter(wp):
+            return wp.flag in allow_pos and len(wp.word.strip()) >= 2 and wp.word.lower() not in textrank.stop_words
+        
+        # 窗口内共现的词语之间连边
+        cooccurrence = defaultdict(int)
+        for i, wp in enumerate(words):
+            if pair_filter(wp):
+                for j in range(i + 1, i + textrank.span):
+                    if j >= len(words):
+                        break
+                    if not pair_filter(words[j]):
+                        continue
+                    cooccurrence[(wp.word, words[j].word)] += 1
+        
+        graph = UndirectWeightedGraph()
+        for terms, weight in cooccurrence.items():
+            graph.addEdge(terms[0], terms[1], weight)
+        
+        tags = sorted(graph.rank().items(), key=itemgetter(1), reverse=True)
+        return tags[:self.topk] if self.topk else tags
+    
     def _merge_keywords(self, keywords1: List[Tuple[str, float]], keywords2: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
         """合并两组关键词并去重
         
@@ -270,9 +459,8 @@ class KeywordExtractor:
             ("高频考点", 200)
         ]
         
-        # 添加自定义词汇到jieba词典
-        for word, weight in custom_words:
-            jieba.add_word(word, freq=weight)
+        # 添加自定义词汇到jieba词典，合并后的词典有缓存时直接加载
+        load_jieba_dictionary(custom_words)
         
         logger.info(f"加载了{len(custom_words)}个自定义词汇")
 
@@ -293,4 +481,18 @@ if __name__ == "__main__":
     
     print("\n提取的关键词:")
     for word, weight in keywords:
-        print(f"{word}: {weight:.4f}")
\ No newline at end of file
+        print(f"{word}: {weight:.4f}")
+    
+    # 复用分词结果的计算应与jieba公开接口的结果完全相同，升级jieba后需重新检查
+    import jieba
+    import jieba.analyse
+    import jieba.posseg
+    
+    words = tuple(jieba.posseg.dt.cut(test_text))
+    tfidf_same = extractor._score_tfidf(words) == jieba.analyse.extract_tags(
+        test_text, topK=extractor.topk, withWeight=True, allowPOS=extractor.allow_pos
+    )
+    textrank_same = extractor._score_textrank(words) == jieba.analyse.textrank(
+        test_text, topK=extractor.topk, withWeight=True, allowPOS=extractor.allow_pos
+    )
+    print(f"\njieba {jieba.__version__} 结果一致性: TF-IDF {tfidf_same}，TextRank {textrank_same}")
\ No newline at end of file
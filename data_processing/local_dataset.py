@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+本地数据集模块
+从本地语料文件中加载知识点文档，并提供建立检索索引和TF-IDF词表共用的分词函数
+"""
+
+import os
+import re
+import sys
+import json
+import zipfile
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.cache import resolve_cache_path
+from utils.file_handler import read_xlsx_rows
+
+logger = get_logger(__name__)
+
+# 默认索引的语料
+DEFAULT_SOURCES = [
+    "data/new_knowledge.json",
+    "实验数据集（数据结构知识点）.zip"
+]
+
+
+def tokenize(text: str) -> List[str]:
+    """对文本进行分词，用于建立索引和解析查询
+    
+    Args:
+        text: 待分词的文本
+    
+    Returns:
+        词语列表，已去除空白和标点
+    """
+    import jieba
+    
+    return [token for token in jieba.lcut_for_search(text.lower()) if re.search(r'\w', token)]
+
+
+def load_dataset_documents(sources: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """从本地语料文件中加载文档
+    
+    支持JSON格式的知识点列表，以及包含xlsx表格的zip数据集或单独的xlsx文件。
+    
+    Args:
+        sources: 语料文件路径列表，相对路径以项目根目录为基准
+    
+    Returns:
+        文档列表，每个文档包含title、content和source字段
+    """
+    documents = []
+    
+    for source in sources or DEFAULT_SOURCES:
+        path = resolve_cache_path(source)
+        if not os.path.exists(path):
+            logger.warning(f"语料文件不存在: {path}")
+            continue
+        
+        try:
+            if path.endswith(".json"):
+                with open(path, 'r', encoding='utf-8') as f:
+                    for item in json.load(f):
+                        documents.append({
+                            "title": item.get("title", ""),
+                            "content": item.get("content", ""),
+                            "source": item.get("source", "local_search")
+                        })
+            elif path.endswith(".zip"):
+                with zipfile.ZipFile(path) as archive:
+                    for info in archive.infolist():
+                        if info.filename.endswith(".xlsx"):
+                            documents.extend(_spreadsheet_documents(read_xlsx_rows(archive.read(info))))
+            elif path.endswith(".xlsx"):
+                documents.extend(_spreadsheet_documents(read_xlsx_rows(path)))
+            else:
+                logger.warning(f"不支持的语料文件格式: {path}")
+        except Exception as e:
+            logger.error(f"加载语料文件失败: {path}, 错误: {e}")
+    
+    return documents
+
+
+def _spreadsheet_documents(sheets: Dict[str, List[List[Optional[str]]]]) -> List[Dict[str, Any]]:
+    """将表格中的每一行转换为一个文档
+    
+    第一行视为表头。层级目录类表格中上级标题只在首行出现，
+    因此一行中第一个非空单元格左侧的空单元格沿用上一行的值。
+    
+    Args:
+        sheets: 工作表到行列表的映射
+    
+    Returns:
+        文档列表
+    """
+    documents = []
+    
+    for rows in sheets.values():
+        if len(rows) < 2:
+            continue
+        
+        header = rows[0]
+        previous = []
+        for row in rows[1:]:
+            first = next(i for i, value in enumerate(row) if value is not None)
+            filled = [previous[i] if i < first and i < len(previous) else value for i, value in enumerate(row)]
+            previous = filled
+            
+            texts = [value for value in filled if value and not re.fullmatch(r'[\d.]+', value)]
+            if not texts:
+                continue
+            
+            fields = []
+            for i, value in enumerate(filled):
+                if value:
+                    name = header[i] if i < len(header) and header[i] else ""
+                    fields.append(f"{name}: {value}" if name else value)
+            
+            documents.append({
+                "title": texts[-1],
+                "content": "；".join(fields),
+                "source": "local_dataset"
+            })
+    
+    return documents
+
+
+# 测试代码
+if __name__ == "__main__":
+    documents = load_dataset_documents()
+    print(f"共加载{len(documents)}个文档")
+    for doc in documents[:3]:
+        print(f"{doc['title']}: {doc['content'][:50]}")
+    print(f"分词结果: {tokenize('最小生成树的Prim算法')}")
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+规则匹配模块
+基于Aho-Corasick自动机，一次扫描文本即可找出所有命中的关键词规则
+"""
+
+import os
+import re
+import sys
+from collections import deque
+from typing import List, Dict, Tuple, Iterable, Set
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 批量匹配时规则数不超过该值则逐条规则扫描全部文本，否则逐条文本运行自动机
+BATCH_SCAN_MAX_RULES = 200
+
+# 中文汉字以外的单词字符，只有这类字符相邻时才不构成单词边界
+NON_CJK_WORD = r'[^\W\u3400-\u4dbf\u4e00-\u9fff]'
+
+
+def _is_cjk(char: str) -> bool:
+    """判断字符是否为中文汉字
+    
+    Args:
+        char: 单个字符
+    
+    Returns:
+        是否为中文汉字
+    """
+    return '\u4e00' <= char <= '\u9fff' or '\u3400' <= char <= '\u4dbf'
+
+
+def _is_case_stable(char: str) -> bool:
+    """判断字符是否不受转小写影响：自身不变，也不会由其他字符转小写得到
+    
+    由这类字符组成的关键词在原文和转小写后的文本中命中情况相同，批量匹配时无需转小写
+    
+    Args:
+        char: 单个字符
+    
+    Returns:
+        是否为中文汉字或ASCII非字母字符
+    """
+    return _is_cjk(char) or (char.isascii() and not char.isalpha())
+
+
+def _needs_boundary(char: str) -> bool:
+    """判断字符是否为中文汉字以外的单词字符（正则表达式中的\\w去掉中文汉字）
+    
+    关键词首尾为这类字符时要求单词边界；边界只被同类字符破坏，
+    因此"AVL"不命中"AVLtree"，但能命中"AVL树"，中文关键词则不要求边界
+    
+    Args:
+        char: 单个字符
+    
+    Returns:
+        是否为中文汉字以外的单词字符
+    """
+    return (char.isalnum() or char == '_') and not _is_cjk(char)
+
+
+class RuleMatcher:
+    """多关键词规则匹配器
+    
+    所有关键词在初始化时编译为一个Aho-Corasick自动机，匹配耗时只与文本长度和命中数有关，
+    与规则数量无关。匹配不区分大小写；关键词首尾为英文字母、数字等单词字符时要求该侧是单词边界，
+    相邻的中文汉字视为边界，避免"tree"命中"street"，同时"AVL"、"KMP"能命中"AVL树"、"串的KMP算法"，
+    中文关键词则不要求边界。
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """编译关键词
+        
+        Args:
+            keywords: 关键词列表，匹配结果中的规则序号即关键词在列表中的位置
+        """
+        self.keywords = list(keywords)
+        
+        # goto[state]为状态转移表，fail[state]为失配指针，
+        # output[state]为到达该状态时命中的(规则序号, 关键词长度)，已合并失配链上的输出
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        
+        for index, keyword in enumerate(self.keywords):
+            pattern = keyword.lower()
+            if not pattern:
+                continue
+            
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((index, len(pattern)))
+        
+        self._build_fail_links()
+        
+        # 各规则首尾是否需要检查单词边界
+        self._boundary = [
+            (_needs_boundary(keyword[0]), _needs_boundary(keyword[-1])) if keyword else (False, False)
+            for keyword in self.keywords
+        ]
+        
+        logger.info(f"规则匹配器编译完成，共{len(self.keywords)}条规则，{len(self._goto)}个状态")
+    
+    def _build_fail_links(self):
+        """按广度优先顺序构建失配指针，并沿失配链合并输出"""
+        queue = deque(self._goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+    
+    def find_all(self, text: str) -> List[Tuple[int, int, int]]:
+        """找出文本中所有命中的关键词
+        
+        Args:
+            text: 待匹配的文本
+        
+        Returns:
+            (规则序号, 起始位置, 结束位置)列表，按结束位置排列，位置为半开区间
+        """
+        lowered = text.lower()
+        # 少数字符转小写后长度会变化，此时边界判断以转换后的文本为准
+        if len(lowered) != len(text):
+            text = lowered
+        
+        goto, fail, output, boundary = self._goto, self._fail, self._output, self._boundary
+        length = len(text)
+        matches = []
+        state = 0
+        
+        for position, char in enumerate(lowered):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            
+            for index, size in output[state]:
+                start, end = position - size + 1, position + 1
+                check_start, check_end = boundary[index]
+                if check_start and start > 0 and _needs_boundary(text[start - 1]):
+                    continue
+                if check_end and end < length and _needs_boundary(text[end]):
+                    continue
+                matches.append((index, start, end))
+        
+        return matches
+    
+    def matched_rules(self, text: str) -> Set[int]:
+        """找出文本命中的规则序号，每条规则只计一次
+        
+        Args:
+            text: 待匹配的文本
+        
+        Returns:
+            命中的规则序号集合
+        """
+        return {index for index, _, _ in self.find_all(text)}
+    
+    def match_matrix(self, texts: List[str]):
+        """批量匹配，结果与逐条调用matched_rules相同
+        
+        规则较少时对每条规则在全部文本上做子串查找，循环在C实现的字符串操作中完成；
+        需要检查单词边界的规则先用子串查找筛选，再用正则表达式确认边界。
+        
+        Args:
+            texts: 待匹配的文本列表
+        
+        Returns:
+            文本数×规则数的稀疏矩阵（CSR格式），命中为1，每行的列序号升序排列
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        
+        rows = []
+        cols = []
+        
+        if len(self.keywords) > BATCH_SCAN_MAX_RULES:
+            for i, text in enumerate(texts):
+                matched = sorted(self.matched_rules(text))
+                rows.append(np.full(len(matched), i, dtype=np.int64))
+                cols.append(np.asarray(matched, dtype=np.int64))
+        else:
+            # 转小写不改变字符是否为单词字符，边界可以在转小写后的文本中判断
+            lowered = None
+            
+            for index, keyword in enumerate(self.keywords):
+                pattern = keyword.lower()
+                if not pattern:
+                    continue
+                
+                check_start, check_end = self._boundary[index]
+                if not (check_start or check_end) and all(_is_case_stable(char) for char in pattern):
+                    # 如中文关键词，直接在原文中查找
+                    hits = np.flatnonzero(np.frombuffer(bytes([pattern in text for text in texts]), dtype=bool))
+                    rows.append(hits)
+                    cols.append(np.full(len(hits), index, dtype=np.int64))
+                    continue
+                
+                if lowered is None:
+                    lowered = [text.lower() for text in texts]
+                
+                hits = np.flatnonzero(np.frombuffer(bytes([pattern in text for text in lowered]), dtype=bool))
+                if len(hits) and (check_start or check_end):
+                    boundary = re.compile(
+                        (f'(?<!{NON_CJK_WORD})' if check_start else '') + re.escape(pattern) +
+                        (f'(?!{NON_CJK_WORD})' if check_end else '')
+                    )
+                    hits = hits[[boundary.search(lowered[i]) is not None for i in hits]]
+                rows.append(hits)
+                cols.append(np.full(len(hits), index, dtype=np.int64))
+        
+        row = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+        col = np.concatenate(cols) if cols else np.zeros(0, dtype=np.int64)
+        matrix = csr_matrix((np.ones(len(row)), (row, col)), shape=(len(texts), len(self.keywords)))
+        matrix.sort_indices()
+        return matrix
+
+
+class WeightRuleMatcher(RuleMatcher):
+    """带权重的关键词规则匹配器，用于计算知识点的规则得分"""
+    
+    def __init__(self, weight_rules: Dict[str, float]):
+        """编译权重规则
+        
+        Args:
+            weight_rules: 关键词到权重的映射
+        """
+        super().__init__(weight_rules.keys())
+        self.weights = list(weight_rules.values())
+    
+    def score(self, text: str) -> float:
+        """计算文本命中的规则权重之和，每条规则只计一次
+        
+        Args:
+            text: 待匹配的文本
+        
+        Returns:
+            权重之和，按规则定义的顺序累加
+        """
+        score = 0.0
+        for index in sorted(self.matched_rules(text)):
+            score += self.weights[index]
+        return score
+    
+    def score_batch(self, texts: List[str]):
+        """批量计算规则得分，结果与逐条调用score完全相同
+        
+        命中矩阵每行的列按规则顺序排列，稀疏矩阵乘法逐行按列顺序从0累加，与score的累加顺序一致。
+        
+        Args:
+            texts: 待匹配的文本列表
+        
+        Returns:
+            与texts一一对应的得分数组
+        """
+        import numpy as np
+        
+        return self.match_matrix(texts) @ np.asarray(self.weights, dtype=np.float64)
+
+
+# 测试代码
+if __name__ == "__main__":
+    matcher = WeightRuleMatcher({"图论": 0.65, "最小生成树": 0.6, "生成树": 0.3, "AVL": 0.5, "tree": 0.2})
+    text = "图论中的最小生成树问题，以及AVL树与B-Tree、street的区别"
+    for index, start, end in matcher.find_all(text):
+        print(f"命中规则: {matcher.keywords[index]}，位置: {start}-{end}")
+    print(f"规则得分: {matcher.score(text):.2f}")
+    
+    # 回归检查：英文和数字关键词与中文汉字相邻时也能命中，与英文字母相邻时不命中
+    matcher = WeightRuleMatcher({"AVL": 1, "B树": 1, "KMP": 1, "O(n)": 1, "tree": 1})
+    cases = {"平衡树如AVL树和B树，串的KMP": {"AVL", "B树", "KMP"}, "复杂度为O(n)的AVLtree": {"O(n)"},
+             "street与subtree": set(), "使用KMP算法": {"KMP"}}
+    for text, expected in cases.items():
+        matched = {matcher.keywords[index] for index in matcher.matched_rules(text)}
+        batch = {matcher.keywords[index] for index in matcher.match_matrix([text]).indices}
+        print(f"{text}: {'正确' if matched == batch == expected else '错误'} {sorted(matched)}")
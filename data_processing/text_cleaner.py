@@ -9,34 +9,99 @@
 import os
 import sys
 import re
-from typing import List, Dict, Any
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.logger import get_logger
+from data_processing.dedup import (
+    exact_duplicate_keep, resolve_duplicates, similar_pairs, minhash_keys, shard_partition
+)
+from utils.feature_store import FeatureStore
 
 logger = get_logger(__name__)
 
+# HTML标签
+HTML_TAG_PATTERN = re.compile(r'<[^>]+>')
+
+# 需要去除的特殊字符，保留字母数字、空白、中文和常用中英文标点
+SPECIAL_CHAR_PATTERN = re.compile(r'[^\w\s\u4e00-\u9fff,.，。?？!！:：;；()（）\[\]【】\-]')
+
+# 进程池中每个工作进程各自持有的文本清洗器
+_worker_cleaner = None
+
+
+def _init_worker(config: Dict[str, Any]):
+    """工作进程初始化，按主进程的配置创建文本清洗器
+    
+    Args:
+        config: TextCleaner的初始化参数
+    """
+    global _worker_cleaner
+    _worker_cleaner = TextCleaner(**config)
+
+
+def _clean_shard(texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """在工作进程中对一个分片做基本清洗
+    
+    Args:
+        texts: 分片中的文本列表，已是主进程数据的副本，直接修改
+    
+    Returns:
+        清洗后的文本列表
+    """
+    return _worker_cleaner.clean_batch(texts, in_place=True)
+
+
+def _dedup_shard(args: Tuple[List[Dict[str, Any]], Any]) -> List[int]:
+    """在工作进程中对一个分片去重
+    
+    Args:
+        args: (分片中的文本列表, 已拟合的向量化器)元组
+    
+    Returns:
+        保留的文本在分片中的下标
+    """
+    texts, vectorizer = args
+    return _worker_cleaner._duplicate_keep(texts, vectorizer=vectorizer)
+
+
 class TextCleaner:
     """文本清洗器，负责对检索到的文本进行清洗和去重"""
     
-    def __init__(self, similarity_threshold=0.7):
+    def __init__(self, similarity_threshold=0.7, feature_store=None, similarity_mode="auto", memory_budget_mb=1024):
         """初始化文本清洗器
         
         Args:
             similarity_threshold: 相似度阈值，超过此值视为重复
+            feature_store: 各智能体共享的特征缓存，默认使用独立的缓存
+            similarity_mode: 相似度的计算方式，dense为完整矩阵，blocked为分块稀疏计算，
+                auto在完整矩阵超过内存预算时使用blocked
+            memory_budget_mb: 相似度计算的内存预算（MB）
         """
         self.similarity_threshold = similarity_threshold
-        self.vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        self.similarity_mode = similarity_mode
+        self.memory_budget_mb = memory_budget_mb
+        self.feature_store = feature_store or FeatureStore()
+        # sklearn导入耗时较长，向量化器在首次去重时才创建
+        self._vectorizer = None
         logger.info(f"文本清洗器初始化完成，相似度阈值: {similarity_threshold}")
     
-    def clean(self, texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    @property
+    def vectorizer(self):
+        """TF-IDF向量化器，首次使用时创建"""
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import TfidfVectorizer
+            self._vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
+        return self._vectorizer
+    
+    def clean(self, texts: List[Dict[str, Any]], in_place: bool = False) -> List[Dict[str, Any]]:
         """清洗文本
         
         Args:
             texts: 待清洗的文本列表，每个元素为字典格式
+            in_place: 是否直接修改传入的字典，不复制
             
         Returns:
             清洗后的文本列表
@@ -44,7 +109,7 @@ class TextCleaner:
         logger.info(f"开始清洗{len(texts)}条文本")
         
         # 1. 基本清洗（去除HTML标签、多余空格等）
-        cleaned_texts = [self._basic_clean(text) for text in texts]
+        cleaned_texts = self.clean_batch(texts, in_place=in_place)
         logger.info("基本清洗完成")
         
         # 2. 去重
@@ -53,6 +118,29 @@ class TextCleaner:
         
         return unique_texts
     
+    def clean_batch(self, texts: List[Dict[str, Any]], in_place: bool = False) -> List[Dict[str, Any]]:
+        """批量基本清洗，结果与逐条调用_basic_clean相同
+        
+        Args:
+            texts: 待清洗的文本列表，每个元素为字典格式
+            in_place: 是否直接修改传入的字典，为True时返回原列表
+            
+        Returns:
+            清洗后的文本列表
+        """
+        clean_text = self._clean_text
+        results = texts if in_place else [None] * len(texts)
+        
+        for i, text_item in enumerate(texts):
+            result = text_item if in_place else text_item.copy()
+            if "title" in result:
+                result["title"] = clean_text(result["title"])
+            if "content" in result:
+                result["content"] = clean_text(result["content"])
+            results[i] = result
+        
+        return results
+    
     def _basic_clean(self, text_item: Dict[str, Any]) -> Dict[str, Any]:
         """基本清洗，去除HTML标签、多余空格等
         
@@ -62,17 +150,7 @@ class TextCleaner:
         Returns:
             清洗后的文本字典
         """
-        result = text_item.copy()
-        
-        # 清洗标题
-        if "title" in result:
-            result["title"] = self._clean_text(result["title"])
-        
-        # 清洗内容
-        if "content" in result:
-            result["content"] = self._clean_text(result["content"])
-        
-        return result
+        return self.clean_batch([text_item])[0]
     
     def _clean_text(self, text: str) -> str:
         """清洗文本字符串
@@ -86,17 +164,84 @@ class TextCleaner:
         if not text:
             return ""
         
-        # 去除HTML标签
-        text = re.sub(r'<[^>]+>', '', text)
+        # 去除HTML标签，不含"<"时跳过
+        if '<' in text:
+            text = HTML_TAG_PATTERN.sub('', text)
         
-        # 去除多余空格
-        text = re.sub(r'\s+', ' ', text)
+        # 去除多余空格，split按与\s相同的空白字符拆分
+        text = ' '.join(text.split())
         
-        # 去除特殊字符
-        text = re.sub(r'[^\w\s\u4e00-\u9fff,.，。?？!！:：;；()（）\[\]【】\-]', '', text)
+        # 去除特殊字符，特殊字符两侧的空格会保留，因此最后还需去除首尾空格
+        text = SPECIAL_CHAR_PATTERN.sub('', text)
         
         return text.strip()
     
+    def clean_sharded(self, texts: List[Dict[str, Any]], workers: Optional[int] = None,
+                      min_shard_size: int = 1000) -> List[Dict[str, Any]]:
+        """多进程分片清洗文本
+        
+        先在工作进程中并行做基本清洗，再在当前进程中精确去重并拟合一次TF-IDF，
+        然后按MinHash值将文本划分为若干分片，在工作进程中用同一向量化器分别去重，
+        最后只对各分片保留的文本做一次跨分片去重。
+        
+        Args:
+            texts: 待清洗的文本列表，每个元素为字典格式，不会被修改
+            workers: 进程数，None表示使用全部CPU核心
+            min_shard_size: 每个分片的最少文本数量，文本较少时减少进程数或在当前进程中清洗
+            
+        Returns:
+            清洗后的文本列表
+        """
+        workers = workers or os.cpu_count() or 1
+        workers = min(workers, len(texts) // max(1, min_shard_size))
+        if workers <= 1:
+            return self.clean(texts)
+        
+        logger.info(f"开始分片清洗{len(texts)}条文本，进程数: {workers}")
+        config = {
+            "similarity_threshold": self.similarity_threshold,
+            "similarity_mode": self.similarity_mode,
+            "memory_budget_mb": self.memory_budget_mb
+        }
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config,)) as executor:
+                # 1. 基本清洗，按顺序切分为连续的块
+                size = -(-len(texts) // workers)
+                cleaned = []
+                for chunk in executor.map(_clean_shard, [texts[i:i + size] for i in range(0, len(texts), size)]):
+                    cleaned.extend(chunk)
+                
+                # 2. 精确去重，与单进程相同，保留内容最长的
+                exact_kept = exact_duplicate_keep(
+                    [self.feature_store.normalized_text(item) for item in cleaned],
+                    lambda i: len(cleaned[i].get("content", ""))
+                )
+                logger.info(f"精确去重: {len(cleaned)}条 -> {len(exact_kept)}条")
+                cleaned = [cleaned[i] for i in exact_kept]
+                
+                # 3. 在全部文本上拟合一次TF-IDF，按MinHash值分片去重，近似重复的文本大概率在同一分片
+                from data_processing.tfidf_vocabulary import FittedVectorizer
+                vectorizer = FittedVectorizer(self.vectorizer.fit([self.feature_store.text(item) for item in cleaned]))
+                shards = shard_partition(
+                    minhash_keys([self.feature_store.normalized_text(item) for item in cleaned]), workers
+                )
+                logger.info(f"分片大小: {[len(shard) for shard in shards]}")
+                shard_kept = list(executor.map(
+                    _dedup_shard, [([cleaned[i] for i in shard], vectorizer) for shard in shards]
+                ))
+        except Exception as e:
+            logger.error(f"多进程分片清洗失败: {e}，改为在当前进程中清洗")
+            return self.clean(texts)
+        
+        # 4. 合并各分片保留的文本，按原顺序排列后跨分片去重
+        survivors = sorted(shard[i] for shard, kept in zip(shards, shard_kept) for i in kept)
+        candidates = [cleaned[i] for i in survivors]
+        logger.info(f"分片去重后剩余{len(candidates)}条文本")
+        
+        unique_texts = [candidates[i] for i in self._duplicate_keep(candidates, vectorizer=vectorizer)]
+        logger.info(f"跨分片去重完成，剩余{len(unique_texts)}条文本")
+        return unique_texts
+    
     def _remove_duplicates(self, texts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """去除重复文本
         
@@ -106,50 +251,48 @@ class TextCleaner:
         Returns:
             去重后的文本列表
         """
+        return [texts[i] for i in self._duplicate_keep(texts)]
+    
+    def _duplicate_keep(self, texts: List[Dict[str, Any]], vectorizer=None) -> List[int]:
+        """去除重复文本，返回保留的文本下标
+        
+        Args:
+            texts: 待去重的文本列表
+            vectorizer: 向量化器，默认使用self.vectorizer
+            
+        Returns:
+            保留的文本下标，按原顺序排列
+        """
         if not texts:
             return []
         
-        # 提取文本内容
-        content_texts = []
-        for item in texts:
-            title = item.get("title", "")
-            content = item.get("content", "")
-            content_texts.append(f"{title} {content}")
+        # 先按文本哈希去除完全重复（含仅空白不同）的文本，保留内容最长的，减少两两比较的规模
+        total = len(texts)
+        exact_kept = exact_duplicate_keep(
+            [self.feature_store.normalized_text(item) for item in texts],
+            lambda i: len(texts[i].get("content", ""))
+        )
+        texts = [texts[i] for i in exact_kept]
+        logger.info(f"精确去重: {total}条 -> {len(texts)}条")
         
         # 计算TF-IDF向量
         try:
-            tfidf_matrix = self.vectorizer.fit_transform(content_texts)
-            # 计算余弦相似度
-            cosine_sim = cosine_similarity(tfidf_matrix, tfidf_matrix)
+            tfidf_matrix = self.feature_store.tfidf(texts, vectorizer or self.vectorizer)
+            # 计算余弦相似度，大批量时分块计算，只保留超过阈值的文本对
+            pairs = similar_pairs(tfidf_matrix, self.similarity_threshold, self.similarity_mode, self.memory_budget_mb)
         except Exception as e:
             logger.error(f"计算文本相似度时出错: {e}")
-            return texts
+            return exact_kept
         
-        # 标记要保留的索引
-        to_keep = set(range(len(texts)))
-        
-        # 检查每对文档
-        for i in range(len(texts)):
-            if i not in to_keep:
-                continue
-                
-            for j in range(i+1, len(texts)):
-                if j not in to_keep:
-                    continue
-                    
-                # 如果相似度超过阈值，移除较短的文本
-                if cosine_sim[i, j] > self.similarity_threshold:
-                    i_content = texts[i].get("content", "")
-                    j_content = texts[j].get("content", "")
-                    
-                    if len(i_content) < len(j_content):
-                        to_keep.discard(i)
-                    else:
-                        to_keep.discard(j)
+        # 按顺序检查每对相似文本，移除较短的文本
+        kept = resolve_duplicates(
+            len(texts), pairs,
+            lambda i, j: len(texts[i].get("content", "")) < len(texts[j].get("content", ""))
+        )
+        logger.info(f"相似度去重: {len(texts)}条 -> {len(kept)}条")
         
         # 返回未被移除的文本
-        return [texts[i] for i in sorted(to_keep)]
-
+        return [exact_kept[i] for i in kept]
 
 # 测试代码
 if __name__ == "__main__":
@@ -166,4 +309,32 @@ if __name__ == "__main__":
     print(f"\n清洗结果 ({len(results)} 条):")
     for i, result in enumerate(results):
         print(f"\n{i+1}. {result['title']}")
-        print(f"内容: {result['content']}")
\ No newline at end of file
+        print(f"内容: {result['content']}")
+    
+    # 性能测试：在本地数据集上对比逐条正则替换与批量清洗
+    import time
+    from data_processing.local_dataset import load_dataset_documents
+    
+    def legacy_clean_text(text):
+        if not text:
+            return ""
+        text = re.sub(r'<[^>]+>', '', text)
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'[^\w\s\u4e00-\u9fff,.，。?？!！:：;；()（）\[\]【】\-]', '', text)
+        return text.strip()
+    
+    documents = load_dataset_documents() * 20
+    snippets = [dict(item, content=f"<p>{item['content']}</p>\n  <br/>") for item in documents]
+    for name, dataset in [("本地数据集", documents), ("HTML片段", snippets)]:
+        start = time.perf_counter()
+        legacy = [dict(item, title=legacy_clean_text(item["title"]), content=legacy_clean_text(item["content"]))
+                  for item in dataset]
+        legacy_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        batch = cleaner.clean_batch(dataset)
+        batch_time = time.perf_counter() - start
+        
+        assert batch == legacy
+        print(f"\n{name} {len(dataset)}条: 逐条正则 {legacy_time:.3f}秒，批量清洗 {batch_time:.3f}秒，"
+              f"加速 {legacy_time / batch_time:.1f}倍")
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+TF-IDF词表模块
+在课程模板和本地数据集组成的参考语料上拟合一次词表并保存，之后各批知识点只做transform，
+使相似度不随每批数据变化；另提供无状态的哈希向量化方式，适用于无界的数据流
+"""
+
+import os
+import sys
+import json
+import hashlib
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.cache import make_cache_key, resolve_cache_path
+from data_processing.local_dataset import tokenize, load_dataset_documents, DEFAULT_SOURCES
+
+logger = get_logger(__name__)
+
+# 词表格式版本，分词或拟合方式变化时递增以废弃旧词表
+VOCABULARY_VERSION = 1
+
+# 支持的向量化方式
+TFIDF_MODES = ("batch", "reference", "hashing")
+
+
+def load_reference_corpus(template_path: str, sources: Optional[List[str]] = None) -> List[str]:
+    """加载参考语料：课程模板的每个标题及其正文，以及本地数据集中的每个知识点
+    
+    Args:
+        template_path: 课程模板文件路径
+        sources: 本地数据集文件路径列表
+    
+    Returns:
+        文本列表
+    """
+    from utils.markdown_index import MarkdownIndex
+    
+    texts = []
+    try:
+        index = MarkdownIndex(template_path)
+        for i, node in enumerate(index.nodes):
+            texts.append(f"{node['title']} {index.read_section(i, include_subsections=False)}")
+    except Exception as e:
+        logger.error(f"加载课程模板失败: {e}")
+    
+    for doc in load_dataset_documents(sources):
+        texts.append(f"{doc['title']} {doc['content']}")
+    return texts
+
+
+class ReferenceVectorizer:
+    """基于参考语料词表的TF-IDF向量化器
+    
+    词表和IDF在首次使用时加载，参考语料未变化时直接读取保存的词表，否则重新拟合。
+    fit_transform只做transform，可直接替换每批重新拟合的TfidfVectorizer。
+    """
+    
+    # 每行只取决于对应的文本，特征缓存可以按知识点缓存TF-IDF行
+    batch_independent = True
+    
+    def __init__(self, template_path: str, vocabulary_path: str = "cache/tfidf_vocabulary.json",
+                 sources: Optional[List[str]] = None, max_features: int = 20000):
+        """初始化向量化器
+        
+        Args:
+            template_path: 课程模板文件路径
+            vocabulary_path: 词表文件路径，相对路径以项目根目录为基准
+            sources: 本地数据集文件路径列表
+            max_features: 词表的最大词数
+        """
+        self.template_path = template_path
+        self.vocabulary_path = resolve_cache_path(vocabulary_path)
+        self.sources = sources or DEFAULT_SOURCES
+        self.max_features = max_features
+        self._vectorizer = None
+    
+    def fit_transform(self, texts: List[str]):
+        """将文本转换为TF-IDF矩阵，不重新拟合词表
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            行已L2归一化的稀疏矩阵
+        """
+        return self.transform(texts)
+    
+    def transform(self, texts: List[str]):
+        """将文本转换为TF-IDF矩阵
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            行已L2归一化的稀疏矩阵
+        """
+        if self._vectorizer is None:
+            self._vectorizer = self._load_or_fit()
+        return self._vectorizer.transform(texts)
+    
+    def get_params(self, deep: bool = True) -> Dict[str, Any]:
+        """获取参数，用于区分不同的词表
+        
+        Returns:
+            参数字典
+        """
+        return {
+            "mode": "reference",
+            "vocabulary_path": self.vocabulary_path,
+            "signature": self._signature()
+        }
+    
+    def _load_or_fit(self):
+        """加载保存的词表，参考语料变化时重新拟合并保存
+        
+        Returns:
+            已设置词表和IDF的TfidfVectorizer
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        import numpy as np
+        
+        signature = self._signature()
+        data = None
+        if os.path.exists(self.vocabulary_path):
+            try:
+                with open(self.vocabulary_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("signature") != signature:
+                    logger.info("参考语料已变化，重新拟合TF-IDF词表")
+                    data = None
+            except Exception as e:
+                logger.error(f"加载TF-IDF词表失败: {e}")
+                data = None
+        
+        if data is None:
+            fitted = TfidfVectorizer(analyzer=tokenize, max_features=self.max_features)
+            fitted.fit(load_reference_corpus(self.template_path, self.sources))
+            data = {
+                "signature": signature,
+                "vocabulary": {term: int(index) for term, index in fitted.vocabulary_.items()},
+                "idf": fitted.idf_.tolist()
+            }
+            self._save(data)
+            logger.info(f"TF-IDF词表拟合完成，共{len(data['vocabulary'])}个词")
+        else:
+            logger.info(f"从文件加载TF-IDF词表: {self.vocabulary_path}，共{len(data['vocabulary'])}个词")
+        
+        vectorizer = TfidfVectorizer(analyzer=tokenize, vocabulary=data["vocabulary"])
+        vectorizer.idf_ = np.asarray(data["idf"])
+        return vectorizer
+    
+    def _save(self, data: Dict[str, Any]):
+        """保存词表
+        
+        Args:
+            data: 包含签名、词表和IDF的字典
+        """
+        try:
+            os.makedirs(os.path.dirname(self.vocabulary_path), exist_ok=True)
+            with open(self.vocabulary_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"保存TF-IDF词表失败: {e}")
+    
+    def _signature(self) -> List[Any]:
+        """根据词表参数和参考语料文件的大小、修改时间生成签名
+        
+        Returns:
+            签名列表
+        """
+        signature = [VOCABULARY_VERSION, self.max_features]
+        for path in [self.template_path] + [resolve_cache_path(source) for source in self.sources]:
+            if os.path.exists(path):
+                stat = os.stat(path)
+                signature.append([path, stat.st_size, stat.st_mtime_ns])
+            else:
+                signature.append([path, None, None])
+        return signature
+
+
+class FittedVectorizer:
+    """已拟合的向量化器，fit_transform只做transform
+    
+    分片处理时在全部数据上拟合一次，各分片和跨分片去重共用同一词表和IDF。
+    """
+    
+    batch_independent = True
+    
+    def __init__(self, vectorizer):
+        """初始化
+        
+        Args:
+            vectorizer: 已拟合的TfidfVectorizer
+        """
+        import numpy as np
+        
+        self.vectorizer = vectorizer
+        # 特征缓存按参数区分TF-IDF矩阵，词表或IDF不同的拟合结果互不影响
+        idf = getattr(vectorizer, "idf_", None)
+        self._params = {
+            "mode": "fitted",
+            "params": vectorizer.get_params(),
+            "vocabulary": make_cache_key(sorted((term, int(index)) for term, index in vectorizer.vocabulary_.items())),
+            "idf": hashlib.sha256(np.asarray(idf, dtype=np.float64).tobytes()).hexdigest() if idf is not None else None
+        }
+    
+    def fit_transform(self, texts: List[str]):
+        """将文本转换为TF-IDF矩阵，不重新拟合
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            行已L2归一化的稀疏矩阵
+        """
+        return self.vectorizer.transform(texts)
+    
+    def transform(self, texts: List[str]):
+        """将文本转换为TF-IDF矩阵
+        
+        Args:
+            texts: 文本列表
+        
+        Returns:
+            行已L2归一化的稀疏矩阵
+        """
+        return self.vectorizer.transform(texts)
+    
+    def get_params(self, deep: bool = True) -> Dict[str, Any]:
+        """获取参数，用于区分不同的拟合结果
+        
+        Returns:
+            参数字典
+        """
+        return self._params
+
+
+def create_vectorizer(mode: str = "batch", template_path: Optional[str] = None, **kwargs):
+    """根据向量化方式创建向量化器
+    
+    Args:
+        mode: batch为每批重新拟合（返回None，由调用方使用默认向量化器），
+            reference为基于参考语料词表，hashing为无状态的哈希向量化
+        template_path: 课程模板文件路径，reference方式需要
+        kwargs: reference方式为ReferenceVectorizer的其他参数，hashing方式可指定n_features
+    
+    Returns:
+        向量化器，batch方式返回None
+    """
+    if mode not in TFIDF_MODES:
+        logger.warning(f"不支持的向量化方式: {mode}，使用batch")
+        return None
+    
+    if mode == "reference":
+        return ReferenceVectorizer(template_path, **kwargs)
+    if mode == "hashing":
+        from sklearn.feature_extraction.text import HashingVectorizer
+        # 不使用IDF，每行为L2归一化的词频，与批次无关
+        return HashingVectorizer(analyzer=tokenize, n_features=kwargs.get("n_features", 2 ** 20),
+                                 alternate_sign=False, norm='l2')
+    return None
+
+
+# 测试代码
+if __name__ == "__main__":
+    vectorizer = create_vectorizer("reference", template_path="data/data_struct.md")
+    texts = ["最小生成树的Prim算法", "Prim算法求最小生成树", "快速排序的时间复杂度"]
+    matrix = vectorizer.fit_transform(texts)
+    print(f"相似度矩阵:\n{(matrix @ matrix.T).toarray().round(3)}")
@@ -7,56 +7,177 @@
 """
 
 import os
+import re
 import sys
+import argparse
+
+# 需要在导入其他项目模块之前启用，才能记录它们的导入耗时
+from utils.startup_profile import enable_if_requested
+startup_profiler = enable_if_requested()
+
 from agents.knowledge_retriever import KnowledgeRetriever
 from agents.teaching_analyzer import TeachingAnalyzer
 from agents.course_engineer import CourseEngineer
 from utils.logger import setup_logger
+from utils.markdown_index import MarkdownIndex
+from utils.feature_store import FeatureStore
+from utils.knowledge_item import KnowledgeBatch
+from data_processing.tfidf_vocabulary import create_vectorizer
 from config.settings import load_config
 
 # 设置日志
 logger = setup_logger()
 
+def parse_args():
+    """解析命令行参数
+    
+    Returns:
+        命令行参数对象
+    """
+    parser = argparse.ArgumentParser(description="动态课程内容更新系统")
+    parser.add_argument("--batch", action="store_true",
+                        help="以课程模板中的所有小节标题作为关键词批量检索")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="批量检索的最大并发查询数，默认读取配置")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="输出各模块的导入耗时和各组件的初始化耗时后退出")
+    return parser.parse_args()
+
+def load_template_queries(template_path):
+    """从课程模板中提取小节标题作为检索关键词
+    
+    Args:
+        template_path: 课程模板文件路径
+        
+    Returns:
+        检索关键词列表
+    """
+    # 只需要标题，使用标题索引而不读取整个模板
+    try:
+        headers = MarkdownIndex(template_path).headers()
+    except Exception as e:
+        logger.error(f"解析课程模板标题失败: {e}")
+        return []
+    
+    queries = []
+    for header in headers:
+        match = re.match(r'^###\s+[\d.]+\s+(.+)$', header)
+        if match:
+            queries.append(match.group(1).strip())
+    return queries
+
 def main():
+    args = parse_args()
+    
     # 加载配置
-    config = load_config()
+    with startup_profiler.stage("加载配置"):
+        config = load_config()
     logger.info("系统初始化完成，开始课程更新流程")
     
     # 初始化模块
-    retriever = KnowledgeRetriever(llm_api=config.get("llm_api", "GLM-4"))
-    analyzer = TeachingAnalyzer(weight_rules=config.get("weight_rules", {
-        "考研真题": 0.7, 
-        "高频考点": 0.5,
-        "算法复杂度": 0.6,
-        "数据结构基础": 0.4
-    }))
-    engineer = CourseEngineer(template_path="data/data_struct.md")
-    
-    # 执行流程
-    search_query = input("请输入需要更新的课程内容关键词(如'数据结构 图论'): ")
-    logger.info(f"开始检索知识: {search_query}")
+    with startup_profiler.stage("初始化KnowledgeRetriever"):
+        retriever = KnowledgeRetriever(
+            llm_api=config.get("llm_api", "GLM-4"),
+            search_engine=config.get("search_engine", "bing"),
+            concurrent=config.get("concurrent_retrieval", True),
+            search_timeout=config.get("search_timeout", 10),
+            llm_timeout=config.get("llm_timeout", 60),
+            max_workers=config.get("retrieval_concurrency", 8),
+            compact_items=config.get("compact_items", False)
+        )
+    
+    # 本次运行中各智能体共享的知识点特征缓存
+    feature_store = FeatureStore()
+    
+    template_path = config.get("template_path", "data/data_struct.md")
+    tfidf_mode = config.get("tfidf_mode", "batch")
+    with startup_profiler.stage("初始化TeachingAnalyzer"):
+        if tfidf_mode == "reference":
+            vectorizer = create_vectorizer(
+                tfidf_mode,
+                template_path=template_path,
+                vocabulary_path=config.get("tfidf_vocabulary_path", "cache/tfidf_vocabulary.json"),
+                sources=config.get("local_search_sources"),
+                max_features=config.get("tfidf_vocabulary_max_features", 20000)
+            )
+        else:
+            vectorizer = create_vectorizer(tfidf_mode, n_features=config.get("hashing_n_features", 2 ** 20))
+        analyzer = TeachingAnalyzer(
+            weight_rules=config.get("weight_rules", {
+                "考研真题": 0.7, 
+                "高频考点": 0.5,
+                "算法复杂度": 0.6,
+                "数据结构基础": 0.4
+            }),
+            dedup_method=config.get("dedup_method", "tfidf"),
+            lsh_num_perm=config.get("lsh_num_perm", 128),
+            lsh_bands=config.get("lsh_bands", 32),
+            lsh_max_bucket_size=config.get("lsh_max_bucket_size", 100),
+            feature_store=feature_store,
+            vectorizer=vectorizer,
+            similarity_mode=config.get("dedup_similarity", "auto"),
+            memory_budget_mb=config.get("dedup_memory_budget_mb", 1024)
+        )
+    with startup_profiler.stage("初始化CourseEngineer"):
+        engineer = CourseEngineer(template_path=template_path, feature_store=feature_store)
+    
+    # 只测量启动耗时，输出报告后退出，不进入检索流程
+    if args.startup_profile:
+        startup_profiler.disable()
+        print(startup_profiler.report())
+        return
     
     # 知识检索
-    raw_knowledge = retriever.retrieve(search_query)
+    if args.batch:
+        queries = load_template_queries(template_path)
+        logger.info(f"开始批量检索，共{len(queries)}个关键词")
+        
+        # 紧凑模式下按列存储全部检索结果
+        raw_knowledge = KnowledgeBatch() if config.get("compact_items", False) else []
+        for query, results in retriever.retrieve_many(queries, max_workers=args.concurrency):
+            logger.info(f"关键词检索完成: {query}，获取{len(results)}条知识")
+            raw_knowledge.extend(results)
+    else:
+        search_query = input("请输入需要更新的课程内容关键词(如'数据结构 图论'): ")
+        logger.info(f"开始检索知识: {search_query}")
+        raw_knowledge = retriever.retrieve(search_query)
     logger.info(f"检索到{len(raw_knowledge)}条相关知识")
+    logger.info(f"大模型响应缓存统计: {retriever.llm_api.cache_stats()}")
+    logger.info(f"搜索结果缓存统计: {retriever.search_engine.cache_stats()}")
     
     # 知识分析与权重计算
-    weighted_topics = analyzer.analyze(raw_knowledge)
+    # 配置了多个进程时按分片多进程分析，分析完成后再按保留数量筛选；否则配置了保留数量时按流式方式分析，只保留权重最高的知识点
+    analysis_workers = config.get("analysis_workers", 1)
+    if analysis_workers != 1:
+        weighted_topics = analyzer.analyze_sharded(
+            raw_knowledge,
+            workers=analysis_workers,
+            shard_by=config.get("shard_by", "lsh"),
+            chapter_key=engineer.classify,
+            min_shard_size=config.get("shard_min_items", 1000),
+            top_k=config.get("analyze_top_k"),
+            per_chapter_k=config.get("analyze_per_chapter_k")
+        )
+    else:
+        weighted_topics = analyzer.analyze(
+            raw_knowledge,
+            top_k=config.get("analyze_top_k"),
+            per_chapter_k=config.get("analyze_per_chapter_k"),
+            chapter_key=engineer.classify,
+            chunk_size=config.get("analyze_chunk_size", 5000)
+        )
     logger.info(f"完成知识分析，共有{len(weighted_topics)}个权重化主题")
     
-    # 课程内容更新
-    updated_text = engineer.update(weighted_topics)
-    logger.info("课程内容更新完成")
-    
-    # 保存结果
+    # 课程内容更新，逐章节生成并写入结果，未变化的章节复用上次的输出
     output_dir = "output"
-    os.makedirs(output_dir, exist_ok=True)
     output_path = os.path.join(output_dir, "course_update.md")
     
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(updated_text)
+    if not engineer.update_to_file(weighted_topics, output_path, incremental=config.get("incremental_update", True)):
+        logger.error(f"保存课程内容失败: {output_path}")
+        return
     
     logger.info(f"更新后的课程内容已保存至: {output_path}")
+    logger.info(f"特征缓存统计: {feature_store.stats()}")
     print(f"\n更新完成! 文件已保存至: {output_path}")
 
 if __name__ == "__main__":
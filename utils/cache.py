@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+缓存工具模块
+提供基于SQLite的持久化缓存，用于减少重复的外部API调用
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 项目根目录，相对路径的缓存文件都放在这里
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_cache_key(*parts: Any) -> str:
+    """根据任意可JSON序列化的字段生成缓存键
+    
+    Args:
+        parts: 参与生成缓存键的字段
+    
+    Returns:
+        十六进制的SHA-256摘要
+    """
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def resolve_cache_path(path: str) -> str:
+    """将缓存文件路径解析为绝对路径，相对路径以项目根目录为基准
+    
+    Args:
+        path: 缓存文件路径
+    
+    Returns:
+        绝对路径
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(PROJECT_ROOT, path)
+
+
+class SQLiteCache:
+    """基于SQLite的持久化键值缓存，支持过期时间和按容量淘汰"""
+    
+    def __init__(self, db_path: str, ttl: Optional[float] = 86400, max_entries: Optional[int] = 10000,
+                 max_bytes: Optional[int] = None):
+        """初始化缓存
+        
+        Args:
+            db_path: SQLite数据库文件路径，相对路径以项目根目录为基准
+            ttl: 缓存有效期（秒），None表示永不过期
+            max_entries: 最大缓存条目数，超出后淘汰最久未访问的条目，None表示不限制
+            max_bytes: 缓存值的最大总字节数，超出后淘汰最久未访问的条目，None表示不限制
+        """
+        self.db_path = resolve_cache_path(db_path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        
+        # 确保目录存在
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        
+        # 多个检索线程共享同一个连接，由锁保证串行访问
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache (accessed_at)")
+        self._conn.commit()
+        
+        logger.info(f"缓存初始化完成: {self.db_path}，有效期: {ttl}秒，最大条目数: {max_entries}")
+    
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存的值，未命中或已过期时返回None
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+                ).fetchone()
+                
+                if row is None:
+                    self.misses += 1
+                    return None
+                
+                value, created_at = row
+                if self.ttl is not None and now - created_at > self.ttl:
+                    # 已过期，删除并视为未命中
+                    self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    self.misses += 1
+                    return None
+                
+                self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+                self._conn.commit()
+                self.hits += 1
+                return json.loads(value)
+            except Exception as e:
+                logger.error(f"读取缓存失败: {e}")
+                self.misses += 1
+                return None
+    
+    def set(self, key: str, value: Any) -> bool:
+        """写入缓存
+        
+        Args:
+            key: 缓存键
+            value: 可JSON序列化的值
+        
+        Returns:
+            是否写入成功
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                data = json.dumps(value, ensure_ascii=False)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, data, len(data.encode('utf-8')), now, now)
+                )
+                self._evict()
+                self._conn.commit()
+                return True
+            except Exception as e:
+                logger.error(f"写入缓存失败: {e}")
+                return False
+    
+    def _evict(self):
+        """淘汰过期条目以及超出容量限制的最久未访问条目"""
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM cache WHERE created_at < ?", (time.time() - self.ttl,))
+        
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        
+        count, total_bytes = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        over_entries = self.max_entries is not None and count > self.max_entries
+        over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+        if not over_entries and not over_bytes:
+            return
+        
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at ASC"):
+            if not over_entries and not over_bytes:
+                break
+            evicted.append((key,))
+            count -= 1
+            total_bytes -= size
+            over_entries = self.max_entries is not None and count > self.max_entries
+            over_bytes = self.max_bytes is not None and total_bytes > self.max_bytes
+        
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", evicted)
+        logger.info(f"缓存容量超限，淘汰了{len(evicted)}个条目")
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+            self._conn.commit()
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+        
+        Returns:
+            包含命中次数、未命中次数、命中率和条目数的字典
+        """
+        with self._lock:
+            count, total_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache"
+            ).fetchone()
+        
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": count,
+            "bytes": total_bytes
+        }
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class LRUCache:
+    """线程安全的内存LRU缓存"""
+    
+    def __init__(self, max_entries: int = 256):
+        """初始化缓存
+        
+        Args:
+            max_entries: 最大缓存条目数，超出后淘汰最久未访问的条目
+        """
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """读取缓存
+        
+        Args:
+            key: 缓存键
+        
+        Returns:
+            缓存的值，未命中时返回None
+        """
+        with self._lock:
+            if key not in self._data:
+                return None
+            self._data.move_to_end(key)
+            return self._data[key]
+    
+    def set(self, key: str, value: Any):
+        """写入缓存
+        
+        Args:
+            key: 缓存键
+            value: 缓存的值
+        """
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+
+
+# 测试代码
+if __name__ == "__main__":
+    cache = SQLiteCache("cache/test_cache.sqlite", ttl=60, max_entries=2)
+    cache.set(make_cache_key("bing", "数据结构", 10), [{"title": "测试"}])
+    print(f"读取缓存: {cache.get(make_cache_key('bing', '数据结构', 10))}")
+    print(f"未命中: {cache.get(make_cache_key('bing', '图论', 10))}")
+    print(f"统计信息: {cache.stats()}")
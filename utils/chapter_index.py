@@ -0,0 +1,256 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+章节索引模块
+从课程模板中解析章节结构，结合模板旁的关键词文件建立关键词到小节的倒排索引，用于知识点归类
+"""
+
+import os
+import re
+import sys
+import json
+from collections import defaultdict
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.file_handler import read_markdown
+from data_processing.rule_matcher import RuleMatcher
+
+logger = get_logger(__name__)
+
+# 索引格式版本，解析规则变化时递增以废弃旧索引
+INDEX_VERSION = 2
+
+# 各章节通用的栏目标题，不作为关键词
+BOILERPLATE_TITLES = {"本节试题精选", "答案与解析", "归纳总结", "思维拓展", "参考文献"}
+
+# 拆分标题为关键词的分隔符
+KEYWORD_SEPARATOR = re.compile(r'及其|[的和与及、，,()（）\s]')
+
+# 从标题拆分出的片段至少包含这么多个字符才作为关键词，"方法"、"实现"等短片段过于通用
+MIN_FRAGMENT_LENGTH = 3
+
+
+def load_keywords(path: str) -> Dict[str, List[str]]:
+    """加载人工维护的关键词文件
+    
+    文件为小节编号到关键词列表的JSON对象，用于补充模板标题中没有的别名，如"哈希表"、"时间复杂度"。
+    
+    Args:
+        path: 关键词文件路径
+    
+    Returns:
+        小节编号到关键词列表的字典，文件不存在或读取失败时返回空字典
+    """
+    if not os.path.exists(path):
+        return {}
+    
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"加载关键词文件失败: {e}")
+        return {}
+
+
+def parse_template(content: str, aliases: Optional[Dict[str, List[str]]] = None) -> Dict[str, Any]:
+    """解析课程模板的章节结构
+    
+    模板中"## 第N章"为章，"### N.M"为小节，"#### N.M.K"为小节下的知识点。
+    关键词包括人工维护的别名、完整的小节和知识点标题，以及标题拆分出的、只属于一个小节的较长片段。
+    
+    Args:
+        content: 模板Markdown文本
+        aliases: 小节编号到别名列表的字典，别名优先于从模板解析的关键词
+    
+    Returns:
+        包含chapters（章编号到章名）、sections（小节编号到小节名）和
+        keywords（别名在前、其余按模板顺序排列的[关键词, 小节编号]列表）的字典
+    """
+    chapters = {}
+    sections = {}
+    candidates = [(keyword, section) for section, keywords in (aliases or {}).items() for keyword in keywords]
+    fragments = []
+    keyword_sections = defaultdict(set)
+    
+    for line in content.split('\n'):
+        match = re.match(r'^##\s+第(\d+)章\s+(.+)$', line)
+        if match:
+            chapters[match.group(1)] = match.group(2).strip()
+            continue
+        
+        match = re.match(r'^###\s+(\d+\.\d+)\s+(.+)$', line)
+        if match:
+            section, title = match.group(1), match.group(2).strip()
+        else:
+            match = re.match(r'^####\s+(\d+\.\d+)\.\d+\s+(.+)$', line)
+            if not match:
+                continue
+            section, title = match.group(1), match.group(2).strip()
+        
+        if title in BOILERPLATE_TITLES:
+            continue
+        if section not in sections and line.startswith('### '):
+            sections[section] = title
+        
+        # 完整标题都作为关键词，拆分出的片段记录所在小节，稍后筛选
+        candidates.append((title, section))
+        keyword_sections[title].add(section)
+        for keyword in KEYWORD_SEPARATOR.split(title):
+            keyword = keyword.strip()
+            if keyword == title or len(keyword) < MIN_FRAGMENT_LENGTH or re.fullmatch(r'[\W\d_]+', keyword):
+                continue
+            fragments.append((keyword, section))
+            keyword_sections[keyword].add(section)
+    
+    # 只保留出现在一个小节中的片段；同一关键词以首次出现的为准
+    candidates += [(keyword, section) for keyword, section in fragments if len(keyword_sections[keyword]) == 1]
+    keywords = []
+    seen = set()
+    for keyword, section in candidates:
+        if keyword in seen:
+            continue
+        seen.add(keyword)
+        keywords.append([keyword, section])
+    
+    return {"chapters": chapters, "sections": sections, "keywords": keywords}
+
+
+class ChapterIndex:
+    """课程章节索引，提供小节名称查询和知识点到小节的归类"""
+    
+    def __init__(self, template_path: str, cache_path: Optional[str] = None, keywords_path: Optional[str] = None):
+        """初始化章节索引，模板和关键词文件未修改时直接加载缓存的索引
+        
+        Args:
+            template_path: 课程模板文件路径
+            cache_path: 索引缓存文件路径，默认与模板放在同一目录
+            keywords_path: 人工维护的关键词文件路径，默认为与模板同名的.keywords.json文件
+        """
+        self.template_path = template_path
+        self.cache_path = cache_path or os.path.splitext(template_path)[0] + ".index.json"
+        self.keywords_path = keywords_path or os.path.splitext(template_path)[0] + ".keywords.json"
+        
+        index = self._load()
+        if index is None:
+            index = parse_template(read_markdown(template_path), load_keywords(self.keywords_path))
+            self._save(index)
+        
+        self.chapters = index["chapters"]
+        self.sections = index["sections"]
+        self.keyword_sections = {keyword: section for keyword, section in index["keywords"]}
+        self.matcher = RuleMatcher(keyword for keyword, _ in index["keywords"])
+        self._matched_sections = [section for _, section in index["keywords"]]
+        
+        logger.info(f"章节索引加载完成，共{len(self.sections)}个小节，{len(self.keyword_sections)}个关键词")
+    
+    def section_name(self, section: str) -> Optional[str]:
+        """查询小节名称
+        
+        Args:
+            section: 小节编号，如"1.1"
+        
+        Returns:
+            小节名称，不存在时返回None
+        """
+        return self.sections.get(section)
+    
+    def find_section(self, text: str) -> Optional[str]:
+        """根据文本中最长的命中关键词确定所属小节
+        
+        Args:
+            text: 待归类的文本
+        
+        Returns:
+            小节编号，没有命中任何关键词时返回None
+        """
+        best_index = None
+        best_length = 0
+        for index, start, end in self.matcher.find_all(text):
+            # 长度相同时取模板中靠前的关键词
+            length = end - start
+            if length > best_length or (length == best_length and index < best_index):
+                best_index = index
+                best_length = length
+        
+        if best_index is None:
+            return None
+        return self._matched_sections[best_index]
+    
+    def find_topic_section(self, title: str, text: str) -> Optional[str]:
+        """确定知识点所属小节，先在标题中查找，标题没有命中关键词时再查找全文
+        
+        内容中顺带提到的"时间复杂度"等关键词不会覆盖标题中的主题。
+        
+        Args:
+            title: 知识点标题
+            text: 知识点的标题和内容
+        
+        Returns:
+            小节编号，没有命中任何关键词时返回None
+        """
+        return self.find_section(title) or self.find_section(text)
+    
+    def _template_signature(self) -> List[Any]:
+        """根据模板和关键词文件的修改时间和大小生成签名
+        
+        Returns:
+            签名列表，模板不存在时返回None
+        """
+        if not os.path.exists(self.template_path):
+            return None
+        stat = os.stat(self.template_path)
+        signature = [INDEX_VERSION, stat.st_mtime_ns, stat.st_size]
+        if os.path.exists(self.keywords_path):
+            stat = os.stat(self.keywords_path)
+            signature += [stat.st_mtime_ns, stat.st_size]
+        return signature
+    
+    def _load(self) -> Optional[Dict[str, Any]]:
+        """加载缓存的索引，缓存不存在或模板已修改时返回None
+        
+        Returns:
+            索引字典
+        """
+        if not os.path.exists(self.cache_path):
+            return None
+        
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get("signature") != self._template_signature():
+                logger.info("课程模板已修改，重新解析章节索引")
+                return None
+            return data["index"]
+        except Exception as e:
+            logger.error(f"加载章节索引缓存失败: {e}")
+            return None
+    
+    def _save(self, index: Dict[str, Any]):
+        """保存索引缓存，模板不存在时不保存
+        
+        Args:
+            index: 索引字典
+        """
+        signature = self._template_signature()
+        if signature is None:
+            return
+        
+        try:
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump({"signature": signature, "index": index}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"保存章节索引缓存失败: {e}")
+
+
+# 测试代码
+if __name__ == "__main__":
+    index = ChapterIndex("data/data_struct.md")
+    for text in ["最小生成树的Prim算法", "KMP算法的next数组", "快速排序的时间复杂度", "红黑树的插入", "常见排序方法", "表达式求值",
+                 "串的KMP算法", "什么是B树", "使用Dijkstra算法"]:
+        section = index.find_section(text)
+        print(f"{text} -> {section} {index.section_name(section) if section else '未归类'}")
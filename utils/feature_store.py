@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+特征缓存模块
+在一次运行中缓存每个知识点的文本特征，各智能体共享，避免重复分词、向量化和规则匹配
+"""
+
+import os
+import sys
+import json
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class FeatureStore:
+    """单次运行内的知识点特征缓存
+    
+    知识点以标题和内容组成的元组作为ID，因此加权、排序等产生的副本共享同一组特征，
+    清洗后内容改变的知识点则视为新的知识点。特征在首次读取时计算并缓存，
+    如归一化文本、分词结果和关键词命中结果；合并文本的计算比查找缓存更快，不缓存。
+    与批次无关的向量化器按知识点缓存TF-IDF行，每批重新拟合的向量化器按整个语料缓存矩阵。
+    """
+    
+    def __init__(self):
+        """初始化空的特征缓存"""
+        self._features = {}
+        self._rows = {}
+        self._tfidf = {}
+        self._stats = {"hits": 0, "misses": 0}
+    
+    @staticmethod
+    def item_id(item: Dict[str, Any]) -> Tuple[str, str]:
+        """获取知识点ID
+        
+        副本与原知识点共享同一标题和内容字符串，字符串的哈希值由Python缓存，查找时不需要重新计算摘要，
+        也不额外保存文本副本。
+        
+        Args:
+            item: 知识点字典
+        
+        Returns:
+            (标题, 内容)元组
+        """
+        return item.get('title', ''), item.get('content', '')
+    
+    def get(self, item: Dict[str, Any], name: str, compute: Callable[[Dict[str, Any]], Any]) -> Any:
+        """读取知识点的特征，不存在时计算并缓存
+        
+        Args:
+            item: 知识点字典
+            name: 特征名称
+            compute: 根据知识点计算特征的函数
+        
+        Returns:
+            特征值
+        """
+        features = self._features.setdefault(self.item_id(item), {})
+        if name in features:
+            self._stats["hits"] += 1
+            return features[name]
+        
+        self._stats["misses"] += 1
+        value = compute(item)
+        features[name] = value
+        return value
+    
+    def text(self, item: Dict[str, Any]) -> str:
+        """生成合并的标题和内容，直接拼接，不缓存
+        
+        Args:
+            item: 知识点字典
+        
+        Returns:
+            "标题 内容"形式的文本
+        """
+        return f"{item.get('title', '')} {item.get('content', '')}"
+    
+    def normalized_text(self, item: Dict[str, Any]) -> str:
+        """读取空白归一化后的合并文本
+        
+        Args:
+            item: 知识点字典
+        
+        Returns:
+            去掉首尾空白、连续空白合并为一个空格的文本
+        """
+        return self.get(item, "normalized_text", lambda x: ' '.join(self.text(x).split()))
+    
+    def tfidf(self, items: List[Dict[str, Any]], vectorizer):
+        """读取语料的TF-IDF矩阵
+        
+        参考词表、已拟合和哈希方式的向量化器中每行只取决于对应的知识点，按知识点缓存稀疏行，
+        只转换未缓存的知识点；每批重新拟合的向量化器中IDF取决于整个语料，同一知识点在不同语料中的行不同，
+        因此按语料中的全部知识点ID缓存整个矩阵，同一参数的向量化器对同一语料只拟合一次。
+        
+        Args:
+            items: 知识点列表
+            vectorizer: 向量化器
+        
+        Returns:
+            稀疏矩阵，第i行对应items[i]
+        """
+        params = json.dumps(vectorizer.get_params(), sort_keys=True, default=str)
+        if _is_batch_independent(vectorizer):
+            return self._tfidf_rows(items, vectorizer, params)
+        
+        key = (params, tuple(self.item_id(item) for item in items))
+        matrix = self._tfidf.get(key)
+        if matrix is not None:
+            self._stats["hits"] += 1
+            return matrix
+        
+        self._stats["misses"] += 1
+        matrix = vectorizer.fit_transform([self.text(item) for item in items])
+        self._tfidf[key] = matrix
+        return matrix
+    
+    def _tfidf_rows(self, items: List[Dict[str, Any]], vectorizer, params: str):
+        """按知识点读取TF-IDF行，未缓存的知识点一次批量转换
+        
+        Args:
+            items: 知识点列表
+            vectorizer: 与批次无关的向量化器
+            params: 向量化器参数的JSON字符串
+        
+        Returns:
+            稀疏矩阵，第i行对应items[i]
+        """
+        from scipy.sparse import vstack
+        
+        if not items:
+            return vectorizer.fit_transform([])
+        
+        rows = self._rows.setdefault(params, {})
+        keys = [self.item_id(item) for item in items]
+        missing = {}
+        for key, item in zip(keys, items):
+            if key not in rows and key not in missing:
+                missing[key] = item
+        
+        self._stats["hits"] += len(keys) - len(missing)
+        self._stats["misses"] += len(missing)
+        if missing:
+            matrix = vectorizer.fit_transform([self.text(item) for item in missing.values()]).tocsr()
+            for i, key in enumerate(missing):
+                rows[key] = matrix[i]
+        return vstack([rows[key] for key in keys], format='csr')
+    
+    def clear(self):
+        """清空缓存，开始新一次运行时调用"""
+        self._features.clear()
+        self._rows.clear()
+        self._tfidf.clear()
+        self._stats = {"hits": 0, "misses": 0}
+    
+    def stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息
+        
+        Returns:
+            包含知识点数量、命中次数、未命中次数和命中率的字典
+        """
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "items": len(self._features),
+            **self._stats,
+            "hit_rate": self._stats["hits"] / lookups if lookups else 0.0
+        }
+
+
+def _is_batch_independent(vectorizer) -> bool:
+    """判断向量化器的每一行是否只取决于对应的文本，与同批其他文本无关
+    
+    Args:
+        vectorizer: 向量化器
+    
+    Returns:
+        参考词表、已拟合或哈希方式的向量化器返回True
+    """
+    if getattr(vectorizer, "batch_independent", False):
+        return True
+    from sklearn.feature_extraction.text import HashingVectorizer
+    return isinstance(vectorizer, HashingVectorizer)
+
+
+# 测试代码
+if __name__ == "__main__":
+    store = FeatureStore()
+    topic = {"title": "最小生成树", "content": "Prim算法  与\nKruskal算法"}
+    weighted = {**topic, "weight": 0.8}
+    print(f"知识点ID: {store.item_id(topic)}")
+    print(f"归一化文本: {store.normalized_text(topic)}")
+    print(f"副本共享特征: {store.normalized_text(weighted)}")
+    print(f"缓存统计: {store.stats()}")
@@ -8,9 +8,23 @@
 
 import os
 import re
-from typing import Dict, List, Any
+import io
+import zipfile
+import hashlib
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Any, Optional, Union
+from collections import Counter
 from datetime import datetime
 
+# xlsx文件中SpreadsheetML的命名空间
+XLSX_NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+
+# 匹配Markdown标题格式 (# 标题)
+HEADER_PATTERN = r'^(#{1,6})\s+(.+)$'
+
+# Myers差异算法的默认最大编辑距离
+MAX_DIFF_EDIT_DISTANCE = 2000
+
 
 def read_markdown(file_path: str) -> str:
     """读取Markdown文件内容
@@ -51,42 +65,174 @@ def write_markdown(file_path: str, content: str) -> bool:
         return False
 
 
-def compare_markdown(old_content: str, new_content: str) -> Dict[str, Any]:
+def compare_markdown(old_content: str, new_content: str,
+                     max_edit_distance: int = MAX_DIFF_EDIT_DISTANCE) -> Dict[str, Any]:
     """比较两个Markdown文本的差异
     
+    行级差异使用Myers算法计算最短编辑脚本，编辑距离超过max_edit_distance时
+    退化为按行计数的多重集合比较，避免差异很大的文本耗时过长。
+    同时按标题路径给出章节级差异。
+    
     Args:
         old_content: 旧内容
         new_content: 新内容
+        max_edit_distance: Myers算法的最大编辑距离
         
     Returns:
         包含差异信息的字典
     """
-    # 简单的行级别比较
     old_lines = old_content.split('\n')
     new_lines = new_content.split('\n')
     
+    # 每种行文本映射为一个整数，后续只比较整数
+    line_ids = {}
+    old_ids = [line_ids.setdefault(line, len(line_ids)) for line in old_lines]
+    new_ids = [line_ids.setdefault(line, len(line_ids)) for line in new_lines]
+    
     # 计算添加和删除的行数
-    added_lines = [line for line in new_lines if line not in old_lines]
-    removed_lines = [line for line in old_lines if line not in new_lines]
+    distance = _myers_distance(old_ids, new_ids, max_edit_distance)
+    if distance is not None:
+        common = (len(old_ids) + len(new_ids) - distance) // 2
+        removed_count = len(old_ids) - common
+        added_count = len(new_ids) - common
+        diff_method = "myers"
+    else:
+        old_counts, new_counts = Counter(old_ids), Counter(new_ids)
+        removed_count = sum((old_counts - new_counts).values())
+        added_count = sum((new_counts - old_counts).values())
+        diff_method = "multiset"
     
     # 计算标题级别的变化
     old_headers = extract_headers(old_content)
     new_headers = extract_headers(new_content)
+    old_header_set = set(old_headers)
+    new_header_set = set(new_headers)
+    
+    added_headers = [h for h in new_headers if h not in old_header_set]
+    removed_headers = [h for h in old_headers if h not in new_header_set]
     
-    added_headers = [h for h in new_headers if h not in old_headers]
-    removed_headers = [h for h in old_headers if h not in new_headers]
+    # 计算章节级别的变化
+    old_sections = _section_digests(old_content)
+    new_sections = _section_digests(new_content)
+    
+    added_sections = [path for path in new_sections if path not in old_sections]
+    removed_sections = [path for path in old_sections if path not in new_sections]
+    changed_sections = [path for path, digest in new_sections.items()
+                        if path in old_sections and old_sections[path] != digest]
     
     return {
         "timestamp": datetime.now().isoformat(),
-        "added_lines_count": len(added_lines),
-        "removed_lines_count": len(removed_lines),
+        "added_lines_count": added_count,
+        "removed_lines_count": removed_count,
         "added_headers": added_headers,
         "removed_headers": removed_headers,
-        "diff_summary": f"添加了{len(added_lines)}行，删除了{len(removed_lines)}行，"
-                       f"新增{len(added_headers)}个标题，移除{len(removed_headers)}个标题"
+        "added_sections": added_sections,
+        "removed_sections": removed_sections,
+        "changed_sections": changed_sections,
+        "diff_method": diff_method,
+        "diff_summary": f"添加了{added_count}行，删除了{removed_count}行，"
+                       f"新增{len(added_headers)}个标题，移除{len(removed_headers)}个标题，"
+                       f"修改了{len(changed_sections)}个章节"
     }
 
 
+def _myers_distance(old_ids: List[int], new_ids: List[int], max_distance: int) -> Optional[int]:
+    """使用Myers算法计算两个序列的最短编辑距离（插入和删除的总数）
+    
+    Args:
+        old_ids: 旧序列
+        new_ids: 新序列
+        max_distance: 最大编辑距离
+        
+    Returns:
+        编辑距离，超过max_distance时返回None
+    """
+    # 去掉相同的前缀和后缀，只比较中间变化的部分
+    start = 0
+    limit = min(len(old_ids), len(new_ids))
+    while start < limit and old_ids[start] == new_ids[start]:
+        start += 1
+    old_end, new_end = len(old_ids), len(new_ids)
+    while old_end > start and new_end > start and old_ids[old_end - 1] == new_ids[new_end - 1]:
+        old_end -= 1
+        new_end -= 1
+    
+    a = old_ids[start:old_end]
+    b = new_ids[start:new_end]
+    n, m = len(a), len(b)
+    if not n or not m:
+        return n + m if n + m <= max_distance else None
+    
+    # v[offset + k]为第k条对角线上当前到达的最远x坐标
+    max_d = min(max_distance, n + m)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    
+    for d in range(max_d + 1):
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            
+            # 沿对角线跳过相同的行
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            
+            if x >= n and y >= m:
+                return d
+    
+    return None
+
+
+def _section_digests(markdown_text: str) -> Dict[str, str]:
+    """计算每个章节正文的哈希，章节以标题路径为键
+    
+    Args:
+        markdown_text: Markdown文本
+        
+    Returns:
+        标题路径到正文哈希的有序字典，路径形如"第1章 绪论 > 1.1 数据结构的基本概念"，
+        重复的路径按出现次序追加"[2]"、"[3]"等后缀
+    """
+    digests = {}
+    stack = []
+    current = None
+    hasher = None
+    
+    for line in markdown_text.split('\n'):
+        match = re.match(HEADER_PATTERN, line)
+        if not match:
+            if hasher is not None:
+                hasher.update(line.encode('utf-8'))
+                hasher.update(b'\n')
+            continue
+        
+        if current is not None:
+            digests[current] = hasher.hexdigest()
+        
+        # 维护从根标题到当前标题的路径
+        level = len(match.group(1))
+        while stack and stack[-1][0] >= level:
+            stack.pop()
+        stack.append((level, match.group(2).strip()))
+        
+        path = " > ".join(title for _, title in stack)
+        current, occurrence = path, 1
+        while current in digests:
+            occurrence += 1
+            current = f"{path} [{occurrence}]"
+        hasher = hashlib.blake2b(digest_size=16)
+    
+    if current is not None:
+        digests[current] = hasher.hexdigest()
+    
+    return digests
+
+
 def extract_headers(markdown_text: str) -> List[str]:
     """从Markdown文本中提取标题
     
@@ -96,12 +242,10 @@ def extract_headers(markdown_text: str) -> List[str]:
     Returns:
         标题列表
     """
-    # 匹配Markdown标题格式 (# 标题)
-    header_pattern = r'^(#{1,6})\s+(.+)$'
     headers = []
     
     for line in markdown_text.split('\n'):
-        match = re.match(header_pattern, line)
+        match = re.match(HEADER_PATTERN, line)
         if match:
             level = len(match.group(1))  # #的数量表示标题级别
             title = match.group(2).strip()
@@ -164,6 +308,65 @@ def parse_markdown_structure(markdown_text: str) -> Dict[str, Any]:
     return structure
 
 
+def read_xlsx_rows(source: Union[str, bytes]) -> Dict[str, List[List[Optional[str]]]]:
+    """读取xlsx文件中所有工作表的单元格文本，不依赖第三方库
+    
+    Args:
+        source: xlsx文件路径或文件内容
+        
+    Returns:
+        工作表文件名到行列表的映射，每行为按列位置排列的单元格文本，空单元格为None
+    """
+    if isinstance(source, bytes):
+        data = source
+    else:
+        with open(source, 'rb') as f:
+            data = f.read()
+    sheets = {}
+    
+    with zipfile.ZipFile(io.BytesIO(data)) as workbook:
+        names = workbook.namelist()
+        
+        # 读取共享字符串表
+        shared_strings = []
+        if "xl/sharedStrings.xml" in names:
+            root = ET.fromstring(workbook.read("xl/sharedStrings.xml"))
+            for item in root.iter(f"{XLSX_NAMESPACE}si"):
+                shared_strings.append("".join(t.text or "" for t in item.iter(f"{XLSX_NAMESPACE}t")))
+        
+        for name in sorted(n for n in names if re.match(r'^xl/worksheets/sheet\d+\.xml$', n)):
+            root = ET.fromstring(workbook.read(name))
+            rows = []
+            for row in root.iter(f"{XLSX_NAMESPACE}row"):
+                values = {}
+                for cell in row.iter(f"{XLSX_NAMESPACE}c"):
+                    # 根据单元格引用(如"C3")计算列号
+                    letters = re.match(r'[A-Z]+', cell.get("r", "A"))
+                    column = 0
+                    for ch in letters.group(0) if letters else "A":
+                        column = column * 26 + ord(ch) - ord('A') + 1
+                    
+                    cell_type = cell.get("t")
+                    value = cell.find(f"{XLSX_NAMESPACE}v")
+                    if cell_type == "inlineStr":
+                        text = "".join(t.text or "" for t in cell.iter(f"{XLSX_NAMESPACE}t"))
+                    elif value is None or value.text is None:
+                        continue
+                    elif cell_type == "s":
+                        text = shared_strings[int(value.text)]
+                    else:
+                        text = value.text
+                    
+                    if text.strip():
+                        values[column - 1] = text.strip()
+                
+                if values:
+                    rows.append([values.get(i) for i in range(max(values) + 1)])
+            sheets[name] = rows
+    
+    return sheets
+
+
 # 测试代码
 if __name__ == "__main__":
     # 测试读写功能
@@ -0,0 +1,470 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+知识点数据模块
+提供紧凑的知识点表示：使用__slots__的KnowledgeItem和按列存储的KnowledgeBatch，
+以及与原有字典格式互相转换的适配函数
+"""
+
+import os
+import sys
+import math
+import time
+from array import array
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# 作为字段存储的字典键，其余键保存在extra中
+ITEM_FIELDS = ("title", "content", "url", "source", "weight")
+
+
+def timestamp_us() -> int:
+    """获取当前时间的微秒时间戳
+    
+    Returns:
+        自1970-01-01起的微秒数
+    """
+    return time.time_ns() // 1000
+
+
+def _parse_timestamp(value: Any) -> Optional[int]:
+    """将字典格式中的ISO时间字符串或数字时间戳转换为微秒时间戳
+    
+    Args:
+        value: ISO格式时间字符串、微秒时间戳或None
+    
+    Returns:
+        微秒时间戳，无法解析时返回None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    try:
+        moment = datetime.fromisoformat(value)
+        # 整数秒和微秒分开换算，避免浮点误差，与_format_timestamp互为逆运算
+        return int(moment.replace(microsecond=0).timestamp()) * 1_000_000 + moment.microsecond
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_timestamp(value: Optional[int]) -> Optional[str]:
+    """将微秒时间戳转换为与datetime.now().isoformat()相同格式的本地时间字符串
+    
+    Args:
+        value: 微秒时间戳
+    
+    Returns:
+        ISO格式时间字符串
+    """
+    if value is None:
+        return None
+    seconds, microseconds = divmod(value, 1_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=microseconds).isoformat()
+
+
+class KnowledgeItem(Mapping):
+    """使用__slots__的知识点
+    
+    实现只读的Mapping接口，原有按字典读取知识点的代码（get、[]、in、{**item}）无需修改；
+    来源字符串经过驻留，检索时间为整数微秒时间戳，没有额外元数据时不创建元数据字典。
+    读取metadata键时按原有格式临时生成包含retrieved_at和source的字典。
+    """
+    
+    __slots__ = ("title", "content", "url", "source", "weight", "retrieved_at", "metadata", "extra")
+    
+    def __init__(self, title: str = "", content: str = "", url: Optional[str] = None, source: Optional[str] = None,
+                 weight: Optional[float] = None, retrieved_at: Optional[int] = None,
+                 metadata: Optional[Dict[str, Any]] = None, extra: Optional[Dict[str, Any]] = None):
+        """初始化知识点
+        
+        Args:
+            title: 标题
+            content: 内容
+            url: 链接
+            source: 来源，会被驻留以便相同来源共享同一字符串
+            weight: 权重
+            retrieved_at: 检索时间的微秒时间戳
+            metadata: 除检索时间和来源外的其他元数据，None表示没有元数据
+            extra: 其他字段
+        """
+        self.title = title
+        self.content = content
+        self.url = url
+        self.source = sys.intern(source) if source is not None else None
+        self.weight = weight
+        self.retrieved_at = retrieved_at
+        self.metadata = metadata
+        self.extra = extra or None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], retrieved_at: Optional[int] = None) -> "KnowledgeItem":
+        """从字典格式的知识点创建，to_dict可以还原为相同的字典
+        
+        只有元数据中的检索时间能按原格式还原、来源与知识点来源相同时，才转换为整数时间戳并去掉来源副本；
+        无法解析或带时区的检索时间、不同的来源都原样保留在元数据中。
+        
+        Args:
+            data: 字典格式的知识点
+            retrieved_at: 检索时间的微秒时间戳，指定时与_attach_metadata相同，替换元数据中的检索时间和来源
+        
+        Returns:
+            知识点对象
+        """
+        if isinstance(data, KnowledgeItem):
+            return data
+        
+        metadata = data.get("metadata")
+        source = data.get("source") or "llm_generated"
+        if retrieved_at is not None:
+            metadata = {key: value for key, value in (metadata or {}).items() if key not in ("retrieved_at", "source")}
+        elif metadata is not None:
+            metadata = dict(metadata)
+            stamp = _parse_timestamp(metadata.get("retrieved_at"))
+            if (stamp is not None and _format_timestamp(stamp) == metadata["retrieved_at"]
+                    and metadata.get("source") == source):
+                retrieved_at = stamp
+                del metadata["retrieved_at"], metadata["source"]
+        # 检索时间和来源会在读取时重新生成，只剩这两项时不保存元数据字典
+        if retrieved_at is not None and not metadata:
+            metadata = None
+        
+        extra = {key: value for key, value in data.items() if key not in ITEM_FIELDS and key != "metadata"}
+        return cls(
+            title=data.get("title"),
+            content=data.get("content"),
+            url=data.get("url"),
+            source=data.get("source"),
+            weight=data.get("weight"),
+            retrieved_at=retrieved_at,
+            metadata=None if metadata is None else {
+                key: sys.intern(value) if isinstance(value, str) else value for key, value in metadata.items()
+            },
+            extra=extra
+        )
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为原有的字典格式
+        
+        Returns:
+            字典格式的知识点，检索时间为ISO格式字符串
+        """
+        return dict(self.items())
+    
+    def copy(self) -> "KnowledgeItem":
+        """浅拷贝
+        
+        Returns:
+            字段相同的新知识点
+        """
+        return KnowledgeItem(self.title, self.content, self.url, self.source, self.weight,
+                             self.retrieved_at, self.metadata, self.extra)
+    
+    def with_weight(self, weight: float) -> "KnowledgeItem":
+        """创建带有权重的副本，字符串和元数据与原知识点共享
+        
+        Args:
+            weight: 权重
+        
+        Returns:
+            新知识点
+        """
+        item = self.copy()
+        item.weight = weight
+        return item
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        # 各智能体频繁读取字段，字段直接读取属性，不经过异常
+        if key in ITEM_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return super().get(key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        if key in ITEM_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if key == "metadata":
+            if self.retrieved_at is None and self.metadata is None:
+                raise KeyError(key)
+            metadata = dict(self.metadata or {})
+            if self.retrieved_at is not None:
+                metadata["retrieved_at"] = _format_timestamp(self.retrieved_at)
+                metadata["source"] = self.source or "llm_generated"
+            return metadata
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+    
+    def __setitem__(self, key: str, value: Any):
+        if key in ITEM_FIELDS:
+            setattr(self, key, sys.intern(value) if key == "source" and value is not None else value)
+        elif key == "metadata":
+            replaced = KnowledgeItem.from_dict({"source": self.source, "metadata": value})
+            self.retrieved_at, self.metadata = replaced.retrieved_at, replaced.metadata
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+    
+    def __iter__(self) -> Iterator[str]:
+        for key in ITEM_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.retrieved_at is not None or self.metadata is not None:
+            yield "metadata"
+        if self.extra:
+            yield from self.extra
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+    
+    def __repr__(self) -> str:
+        return f"KnowledgeItem({self.to_dict()!r})"
+
+
+class KnowledgeBatch:
+    """按列存储的一批知识点
+    
+    标题、内容和链接各为一个列表，来源存为来源表中的整数编号，检索时间和权重存为数值数组，
+    每个知识点只占用各列中的一个位置，而不是一个字典。按下标或迭代读取时生成KnowledgeItem。
+    """
+    
+    def __init__(self):
+        """初始化空的批次"""
+        self.titles: List[str] = []
+        self.contents: List[str] = []
+        self.urls: List[Optional[str]] = []
+        # 来源表，source_ids中的-1表示没有来源
+        self.sources: List[str] = []
+        self._source_ids: Dict[str, int] = {}
+        self.source_ids = array('i')
+        # 检索时间的微秒时间戳，-1表示没有
+        self.retrieved_at = array('q')
+        # 权重，nan表示没有
+        self.weights = array('d')
+        self.metadata: List[Optional[Dict[str, Any]]] = []
+        self.extra: List[Optional[Dict[str, Any]]] = []
+    
+    @classmethod
+    def from_records(cls, records: Iterable[Union[Dict[str, Any], KnowledgeItem]]) -> "KnowledgeBatch":
+        """从字典或KnowledgeItem序列创建
+        
+        Args:
+            records: 知识点序列
+        
+        Returns:
+            知识点批次
+        """
+        batch = cls()
+        batch.extend(records)
+        return batch
+    
+    def append(self, record: Union[Dict[str, Any], KnowledgeItem]):
+        """追加一个知识点
+        
+        Args:
+            record: 字典格式的知识点或KnowledgeItem
+        """
+        item = KnowledgeItem.from_dict(record)
+        self.titles.append(item.title)
+        self.contents.append(item.content)
+        self.urls.append(item.url)
+        self.source_ids.append(self._source_id(item.source))
+        self.retrieved_at.append(item.retrieved_at if item.retrieved_at is not None else -1)
+        self.weights.append(item.weight if item.weight is not None else math.nan)
+        self.metadata.append(item.metadata)
+        self.extra.append(item.extra)
+    
+    def extend(self, records: Iterable[Union[Dict[str, Any], KnowledgeItem]]):
+        """追加多个知识点
+        
+        Args:
+            records: 知识点序列
+        """
+        for record in records:
+            self.append(record)
+    
+    def take(self, indices: Iterable[int]) -> "KnowledgeBatch":
+        """按下标选取知识点组成新的批次
+        
+        Args:
+            indices: 下标序列
+        
+        Returns:
+            新的知识点批次，按列复制，共享字符串和来源表
+        """
+        indices = list(indices)
+        batch = KnowledgeBatch()
+        batch.titles = [self.titles[i] for i in indices]
+        batch.contents = [self.contents[i] for i in indices]
+        batch.urls = [self.urls[i] for i in indices]
+        batch.sources = list(self.sources)
+        batch._source_ids = dict(self._source_ids)
+        batch.source_ids = array('i', (self.source_ids[i] for i in indices))
+        batch.retrieved_at = array('q', (self.retrieved_at[i] for i in indices))
+        batch.weights = array('d', (self.weights[i] for i in indices))
+        batch.metadata = [self.metadata[i] for i in indices]
+        batch.extra = [self.extra[i] for i in indices]
+        return batch
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """转换为原有的字典格式列表
+        
+        Returns:
+            字典格式的知识点列表
+        """
+        return [item.to_dict() for item in self]
+    
+    def _source_id(self, source: Optional[str]) -> int:
+        """获取来源在来源表中的编号，不存在时加入来源表
+        
+        Args:
+            source: 来源
+        
+        Returns:
+            来源编号，没有来源时为-1
+        """
+        if source is None:
+            return -1
+        index = self._source_ids.get(source)
+        if index is None:
+            index = len(self.sources)
+            self.sources.append(source)
+            self._source_ids[source] = index
+        return index
+    
+    def __getitem__(self, index: int) -> KnowledgeItem:
+        source_id = self.source_ids[index]
+        retrieved_at = self.retrieved_at[index]
+        weight = self.weights[index]
+        return KnowledgeItem(
+            title=self.titles[index],
+            content=self.contents[index],
+            url=self.urls[index],
+            source=self.sources[source_id] if source_id >= 0 else None,
+            weight=None if math.isnan(weight) else weight,
+            retrieved_at=retrieved_at if retrieved_at >= 0 else None,
+            metadata=self.metadata[index],
+            extra=self.extra[index]
+        )
+    
+    def __iter__(self) -> Iterator[KnowledgeItem]:
+        for i in range(len(self)):
+            yield self[i]
+    
+    def __len__(self) -> int:
+        return len(self.titles)
+
+
+def as_item(record: Union[Dict[str, Any], KnowledgeItem]) -> KnowledgeItem:
+    """将字典格式的知识点转换为KnowledgeItem，已是KnowledgeItem时直接返回
+    
+    Args:
+        record: 知识点
+    
+    Returns:
+        知识点对象
+    """
+    return KnowledgeItem.from_dict(record)
+
+
+def take(records: Union[List[Any], KnowledgeBatch], indices: Iterable[int]) -> Union[List[Any], KnowledgeBatch]:
+    """按下标选取知识点，保持输入的表示方式，KnowledgeBatch按列选取而不逐条生成KnowledgeItem
+    
+    Args:
+        records: 知识点列表或KnowledgeBatch
+        indices: 下标序列
+    
+    Returns:
+        与输入类型相同的知识点集合
+    """
+    if isinstance(records, KnowledgeBatch):
+        return records.take(indices)
+    return [records[i] for i in indices]
+
+
+def with_weight(topic: Union[Dict[str, Any], KnowledgeItem], weight: float) -> Union[Dict[str, Any], KnowledgeItem]:
+    """创建带有权重的知识点副本，保持输入的表示方式
+    
+    Args:
+        topic: 字典格式的知识点或KnowledgeItem
+        weight: 权重
+    
+    Returns:
+        与输入类型相同的新知识点
+    """
+    if isinstance(topic, KnowledgeItem):
+        return topic.with_weight(weight)
+    return {**topic, "weight": weight}
+
+
+# 测试代码
+if __name__ == "__main__":
+    import tracemalloc
+    
+    record = {
+        "title": "最小生成树",
+        "content": "Prim算法与Kruskal算法",
+        "source": "llm_generated",
+        "metadata": {"retrieved_at": datetime.now().isoformat(), "source": "llm_generated"}
+    }
+    item = KnowledgeItem.from_dict(record)
+    print(f"知识点: {item!r}")
+    print(f"与字典格式相同: {item == record}")
+    
+    # 往返转换检查：转换为KnowledgeItem再转换回字典，结果应与原字典完全相同
+    samples = [
+        record,
+        {"title": "栈", "source": "x", "metadata": {"source": "x"}},
+        {"title": "队列", "content": "", "metadata": {"retrieved_at": "昨天", "source": "llm_generated"}},
+        {"title": "堆", "metadata": {"retrieved_at": "2024-05-01T08:00:00+08:00", "source": "llm_generated"}},
+        {"title": "图", "metadata": {"retrieved_at": datetime.now().isoformat()}},
+        {"title": "树", "source": "bing", "metadata": {"retrieved_at": datetime.now().isoformat(), "source": "x"}},
+        {"title": "散列表", "weight": 1, "url": "https://example.com", "query": "散列", "metadata": {}},
+    ]
+    for sample in samples:
+        restored = KnowledgeItem.from_dict(sample).to_dict()
+        restored_type = all(type(restored[key]) is type(sample[key]) for key in sample)
+        print(f"往返转换{'一致' if restored == sample and restored_type else '不一致'}: {sample}")
+    
+    # 内存对比：标题和内容字符串在各表示方式间共享，只统计每个知识点的额外开销
+    n = 1_000_000
+    titles = [f"知识点{i}" for i in range(n)]
+    contents = [f"内容{i}" for i in range(n)]
+    stamp = timestamp_us()
+    
+    def measure(build):
+        tracemalloc.start()
+        data = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del data
+        return size / n
+    
+    dict_bytes = measure(lambda: [
+        {"title": t, "content": c, "source": "llm_generated",
+         "metadata": {"retrieved_at": _format_timestamp(stamp), "source": "llm_generated"}}
+        for t, c in zip(titles, contents)
+    ])
+    item_bytes = measure(lambda: [
+        KnowledgeItem(t, c, source="llm_generated", retrieved_at=stamp) for t, c in zip(titles, contents)
+    ])
+    
+    def build_batch():
+        batch = KnowledgeBatch()
+        for t, c in zip(titles, contents):
+            batch.append(KnowledgeItem(t, c, source="llm_generated", retrieved_at=stamp))
+        return batch
+    batch_bytes = measure(build_batch)
+    print(f"每个知识点的内存: 字典{dict_bytes:.0f}字节，KnowledgeItem{item_bytes:.0f}字节，KnowledgeBatch{batch_bytes:.0f}字节")
@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown索引模块
+逐行扫描Markdown文件，记录每个标题及其章节正文的字节位置，支持按章节随机读取
+"""
+
+import os
+import re
+import sys
+import json
+from typing import List, Dict, Any, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import get_logger
+from utils.file_handler import HEADER_PATTERN
+
+logger = get_logger(__name__)
+
+# 索引格式版本，解析规则变化时递增以废弃旧索引
+INDEX_VERSION = 1
+
+# 围栏代码块的起止标记，代码块内的#不视为标题
+FENCE_PATTERN = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+
+
+def build_markdown_index(file_path: str) -> List[Dict[str, Any]]:
+    """逐行扫描Markdown文件，建立标题索引
+    
+    文件按二进制逐行读取，内存占用只与标题数量有关，与文件大小无关。
+    
+    Args:
+        file_path: Markdown文件路径
+    
+    Returns:
+        按出现顺序排列的标题列表，每个标题包含level、title、parent（上级标题序号，无上级为-1）、
+        offset（标题行起始字节）、body_start（正文起始字节）、body_end（正文结束字节，
+        即下一个标题的起始位置）和end（章节结束字节，包含所有下级标题）
+    """
+    nodes = []
+    stack = []
+    fence = None
+    position = 0
+    
+    with open(file_path, 'rb') as f:
+        for raw_line in f:
+            line_start = position
+            position += len(raw_line)
+            line = raw_line.decode('utf-8', errors='replace').rstrip('\r\n')
+            
+            # 跳过围栏代码块
+            fence_match = FENCE_PATTERN.match(line)
+            if fence is not None:
+                marker = fence_match.group(1) if fence_match else ""
+                if marker and marker[0] == fence[0] and len(marker) >= len(fence) and not line.strip().strip(marker[0]):
+                    fence = None
+                continue
+            if fence_match:
+                fence = fence_match.group(1)
+                continue
+            
+            match = re.match(HEADER_PATTERN, line)
+            if not match:
+                continue
+            
+            level = len(match.group(1))
+            if nodes:
+                nodes[-1]["body_end"] = line_start
+            
+            # 同级及更低级的标题到此结束
+            while stack and nodes[stack[-1]]["level"] >= level:
+                nodes[stack.pop()]["end"] = line_start
+            
+            nodes.append({
+                "level": level,
+                "title": match.group(2).strip(),
+                "parent": stack[-1] if stack else -1,
+                "offset": line_start,
+                "body_start": position,
+                "body_end": None,
+                "end": None
+            })
+            stack.append(len(nodes) - 1)
+    
+    if nodes:
+        nodes[-1]["body_end"] = position
+    for index in stack:
+        nodes[index]["end"] = position
+    
+    return nodes
+
+
+class MarkdownIndex:
+    """Markdown文件的标题索引，支持不读取全文直接读取某个章节"""
+    
+    def __init__(self, file_path: str, index_path: Optional[str] = None):
+        """初始化索引，文件未修改时直接加载已保存的索引
+        
+        Args:
+            file_path: Markdown文件路径
+            index_path: 索引文件路径，默认为"<文件路径>.mdindex.json"
+        """
+        self.file_path = file_path
+        self.index_path = index_path or f"{file_path}.mdindex.json"
+        
+        self.nodes = self._load()
+        if self.nodes is None:
+            self.nodes = build_markdown_index(file_path)
+            self._save()
+        
+        # 标题路径到标题序号的映射，重复的路径按出现次序追加"[2]"、"[3]"等后缀
+        self.paths = {}
+        for index in range(len(self.nodes)):
+            path = self._path(index)
+            key, occurrence = path, 1
+            while key in self.paths:
+                occurrence += 1
+                key = f"{path} [{occurrence}]"
+            self.paths[key] = index
+        
+        logger.info(f"Markdown索引加载完成: {file_path}，共{len(self.nodes)}个标题")
+    
+    def headers(self) -> List[str]:
+        """获取所有标题，格式与extract_headers相同
+        
+        Returns:
+            标题列表
+        """
+        return [f"{'#' * node['level']} {node['title']}" for node in self.nodes]
+    
+    def children(self, index: int = -1) -> List[int]:
+        """获取某个标题的直接下级标题
+        
+        Args:
+            index: 标题序号，-1表示顶层
+        
+        Returns:
+            下级标题序号列表
+        """
+        return [i for i, node in enumerate(self.nodes) if node["parent"] == index]
+    
+    def find(self, path: str) -> Optional[int]:
+        """按标题路径查找标题
+        
+        Args:
+            path: 标题路径，形如"数据结构目录 > 第1章 绪论 > 1.1 数据结构的基本概念"
+        
+        Returns:
+            标题序号，不存在时返回None
+        """
+        return self.paths.get(path)
+    
+    def read_section(self, section: Any, include_subsections: bool = True) -> str:
+        """读取一个章节的内容，只读取该章节所在的字节范围
+        
+        Args:
+            section: 标题序号或标题路径
+            include_subsections: 是否包含下级标题及其内容，False时只返回标题下的正文
+        
+        Returns:
+            章节内容（不含标题行），章节不存在时返回空字符串
+        """
+        index = self.find(section) if isinstance(section, str) else section
+        if index is None or not 0 <= index < len(self.nodes):
+            return ""
+        
+        node = self.nodes[index]
+        end = node["end"] if include_subsections else node["body_end"]
+        try:
+            with open(self.file_path, 'rb') as f:
+                f.seek(node["body_start"])
+                return f.read(end - node["body_start"]).decode('utf-8', errors='replace')
+        except Exception as e:
+            logger.error(f"读取章节失败: {e}")
+            return ""
+    
+    def _path(self, index: int) -> str:
+        """获取从顶层标题到该标题的路径
+        
+        Args:
+            index: 标题序号
+        
+        Returns:
+            以" > "连接的标题路径
+        """
+        titles = []
+        while index != -1:
+            titles.append(self.nodes[index]["title"])
+            index = self.nodes[index]["parent"]
+        return " > ".join(reversed(titles))
+    
+    def _signature(self) -> Optional[List[Any]]:
+        """根据文件的修改时间和大小生成签名
+        
+        Returns:
+            签名列表，文件不存在时返回None
+        """
+        if not os.path.exists(self.file_path):
+            return None
+        stat = os.stat(self.file_path)
+        return [INDEX_VERSION, stat.st_size, stat.st_mtime_ns]
+    
+    def _load(self) -> Optional[List[Dict[str, Any]]]:
+        """加载已保存的索引，索引不存在或文件已修改时返回None
+        
+        Returns:
+            标题列表
+        """
+        if not os.path.exists(self.index_path):
+            return None
+        
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            if data.get("signature") != self._signature():
+                logger.info(f"文件已修改，重新建立Markdown索引: {self.file_path}")
+                return None
+            return data["nodes"]
+        except Exception as e:
+            logger.error(f"加载Markdown索引失败: {e}")
+            return None
+    
+    def _save(self):
+        """保存索引"""
+        try:
+            with open(self.index_path, 'w', encoding='utf-8') as f:
+                json.dump({"signature": self._signature(), "nodes": self.nodes}, f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"保存Markdown索引失败: {e}")
+
+
+# 测试代码
+if __name__ == "__main__":
+    index = MarkdownIndex("data/data_struct.md")
+    print(f"标题数量: {len(index.headers())}")
+    chapter = index.find("数据结构目录 > 第1章 绪论")
+    print(f"第1章内容:\n{index.read_section(chapter)}")
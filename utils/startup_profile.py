@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+启动耗时分析模块
+记录各模块的导入耗时和各组件的初始化耗时，用于排查冷启动慢的问题
+"""
+
+import sys
+import time
+import builtins
+import importlib.util
+from contextlib import contextmanager
+from typing import List, Tuple, Optional
+
+
+class StartupProfiler:
+    """启动耗时分析器
+    
+    启用后替换内置的__import__，记录每个模块首次导入的累计耗时和自身耗时
+    （累计耗时减去其导入的子模块耗时）；stage用于记录组件初始化等阶段的耗时。
+    """
+    
+    def __init__(self):
+        """初始化分析器，默认不启用"""
+        self.enabled = False
+        self.imports = []
+        self.stages = []
+        self._original_import = None
+        self._depth = 0
+        self._child_time = [0.0]
+        self._start = time.perf_counter()
+    
+    def enable(self):
+        """开始记录模块导入耗时"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._start = time.perf_counter()
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+    
+    def disable(self):
+        """停止记录模块导入耗时"""
+        if not self.enabled:
+            return
+        builtins.__import__ = self._original_import
+        self.enabled = False
+    
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        """记录首次导入耗时的__import__替代函数"""
+        full_name = name
+        if level:
+            try:
+                full_name = importlib.util.resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        
+        # 已导入的模块直接返回，不计时
+        if full_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+        
+        record = [full_name, self._depth, 0.0, 0.0]
+        self.imports.append(record)
+        self._depth += 1
+        self._child_time.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self._depth -= 1
+            children = self._child_time.pop()
+            self._child_time[-1] += elapsed
+            record[2] = elapsed
+            record[3] = elapsed - children
+    
+    @contextmanager
+    def stage(self, name: str):
+        """记录一个阶段的耗时
+        
+        Args:
+            name: 阶段名称，如组件初始化
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, time.perf_counter() - start))
+    
+    def report(self, max_depth: int = 1, min_ms: float = 1.0) -> str:
+        """生成耗时报告
+        
+        Args:
+            max_depth: 导入耗时报告中显示的最大嵌套层级，0表示只显示直接导入的模块
+            min_ms: 只显示耗时不小于该毫秒数的导入
+        
+        Returns:
+            报告文本
+        """
+        lines = ["启动耗时报告", "", "模块导入耗时（毫秒）:", f"{'累计':>10} {'自身':>10}  模块"]
+        for name, depth, total, own in self.imports:
+            if depth <= max_depth and total * 1000 >= min_ms:
+                lines.append(f"{total * 1000:10.1f} {own * 1000:10.1f}  {'  ' * depth}{name}")
+        
+        top_level = sum(total for _, depth, total, _ in self.imports if depth == 0)
+        lines.append(f"{top_level * 1000:10.1f} {'':>10}  导入合计")
+        
+        lines.extend(["", "初始化耗时（毫秒）:"])
+        for name, elapsed in self.stages:
+            lines.append(f"{elapsed * 1000:10.1f}  {name}")
+        
+        lines.append("")
+        lines.append(f"自启用以来总耗时: {(time.perf_counter() - self._start) * 1000:.1f}毫秒")
+        return "\n".join(lines)
+    
+    def slowest_imports(self, count: int = 10) -> List[Tuple[str, float]]:
+        """获取自身耗时最长的模块
+        
+        Args:
+            count: 返回的模块数量
+        
+        Returns:
+            (模块名, 自身耗时秒数)列表
+        """
+        ranked = sorted(self.imports, key=lambda record: record[3], reverse=True)
+        return [(name, own) for name, _, _, own in ranked[:count]]
+
+
+# 进程内共享的分析器
+startup_profiler = StartupProfiler()
+
+
+def enable_if_requested(argv: Optional[List[str]] = None) -> StartupProfiler:
+    """命令行参数中包含--startup-profile时启用分析器
+    
+    需要在导入其他项目模块之前调用，才能记录它们的导入耗时
+    
+    Args:
+        argv: 命令行参数，默认为sys.argv
+    
+    Returns:
+        共享的分析器
+    """
+    if "--startup-profile" in (argv if argv is not None else sys.argv):
+        startup_profiler.enable()
+    return startup_profiler
+
+
+# 测试代码
+if __name__ == "__main__":
+    profiler = StartupProfiler()
+    profiler.enable()
+    import json
+    import sqlite3
+    with profiler.stage("测试阶段"):
+        time.sleep(0.01)
+    profiler.disable()
+    print(profiler.report(min_ms=0.0))